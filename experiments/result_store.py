@@ -0,0 +1,54 @@
+import os
+import uuid
+from typing import Dict, List, Set
+
+import numpy as np
+
+
+class ResultStore:
+    """A directory of NPZ shards holding one record per seed, in columns.
+
+    Each shard is written atomically, so a campaign that is interrupted
+    keeps every record flushed before the interruption and nothing partial.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _shard_paths(self) -> List[str]:
+        return sorted(
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.startswith("shard-") and name.endswith(".npz")
+        )
+
+    def completed_seeds(self) -> Set[int]:
+        """The seeds with a record already stored."""
+        seeds = set()
+        for path in self._shard_paths():
+            with np.load(path) as shard:
+                seeds.update(int(seed) for seed in shard["seed"])
+        return seeds
+
+    def write_shard(self, records: List[Dict[str, float]]):
+        """Stores records, each a dict of scalars with the same keys including seed."""
+        if not records:
+            return
+        columns = {key: np.array([record[key] for record in records]) for key in records[0]}
+        name = f"shard-{int(columns['seed'][0])}-{uuid.uuid4().hex[:8]}"
+        temporary_path = os.path.join(self.directory, "partial-" + name + ".npz")
+        np.savez(temporary_path, **columns)
+        os.replace(temporary_path, os.path.join(self.directory, name + ".npz"))
+
+    def load(self) -> Dict[str, np.ndarray]:
+        """Reads every stored record into columns, sorted by seed."""
+        shards = []
+        for path in self._shard_paths():
+            with np.load(path) as shard:
+                shards.append({key: shard[key] for key in shard.files})
+        if not shards:
+            return dict()
+        columns = {key: np.concatenate([shard[key] for shard in shards]) for key in shards[0]}
+        order = np.argsort(columns["seed"], kind="stable")
+        return {key: column[order] for key, column in columns.items()}
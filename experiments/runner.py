@@ -0,0 +1,182 @@
+import dataclasses
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Type
+
+import cirq
+import numpy as np
+
+from experiments.result_store import ResultStore
+from simulation.fidelity import fidelity_against_ideal
+
+
+@dataclass
+class ExperimentSpec:
+    """Describes a campaign of random circuits, each compiled and simulated with noise.
+
+    Attributes:
+        num_qutrits: The number of qutrits in each input circuit.
+        circuit_depth: The number of moments in each input circuit.
+        op_density: The probability at each moment a qutrit has a gate acting on it.
+        gate_domain: The gates to draw from, mapped to the number of qutrits they act on.
+        noise_model: The noise model to simulate compiled circuits with.
+        seeds: One seed per circuit, which also keys its record.
+        architecture: A pytket architecture to place and route onto,
+            or None to simulate input circuits as they are.
+        pure_ideal: Whether to simulate the reference as a state vector.
+        dtype: The precision of the noisy density matrix simulation.
+    """
+
+    num_qutrits: int
+    circuit_depth: int
+    op_density: float
+    gate_domain: Dict["cirq.Gate", int]
+    noise_model: "cirq.NoiseModel"
+    seeds: Sequence[int]
+    architecture: Optional[Any] = None
+    pure_ideal: bool = True
+    dtype: Type[np.complexfloating] = np.complex128
+
+
+def _compilation_context(spec: ExperimentSpec):
+    """Builds the context to compile every circuit of a routed campaign with."""
+    if spec.architecture is None:
+        return None
+    # Only routed campaigns need pytket
+    from transformations.pytket_transforms import CompilationContext
+
+    return CompilationContext(spec.architecture)
+
+
+# The campaign each worker process runs seeds of, and its compilation context,
+# received once when the worker starts rather than with every seed
+_worker_spec: Optional[ExperimentSpec] = None
+_worker_context = None
+
+
+def _init_worker(spec: ExperimentSpec, architecture_dict: Optional[dict]):
+    global _worker_spec, _worker_context
+    if architecture_dict is not None:
+        from pytket.architecture import Architecture
+
+        spec = dataclasses.replace(spec, architecture=Architecture.from_dict(architecture_dict))
+    _worker_spec = spec
+    _worker_context = _compilation_context(spec)
+
+
+def _run_worker_experiment(seed: int) -> Dict[str, float]:
+    return run_experiment(_worker_spec, seed, context=_worker_context)
+
+
+def run_experiment(spec: ExperimentSpec, seed: int, context=None) -> Dict[str, float]:
+    """Generates, compiles and simulates the circuit of one seed, returning its record.
+
+    Args:
+        spec: The campaign the seed belongs to.
+        seed: The seed of the random circuit.
+        context: The CompilationContext for the campaign's architecture,
+            built for this seed alone if not given.
+    """
+    start = time.perf_counter()
+    qutrits = [cirq.NamedQid(str(i), dimension=3) for i in range(spec.num_qutrits)]
+    circuit = cirq.testing.random_circuit(
+        qubits=qutrits,
+        n_moments=spec.circuit_depth,
+        op_density=spec.op_density,
+        gate_domain=spec.gate_domain,
+        random_state=seed,
+    )
+
+    if spec.architecture is None:
+        ideal_circuit, noisy_circuit = circuit, circuit
+    else:
+        if context is None:
+            context = _compilation_context(spec)
+        _, noisy_circuit, _, final_map = context.place_and_route_with_maps(circuit)
+        # Routing swaps states between device qutrits, so the reference is laid out
+        # where each state ends up rather than where it was placed
+        ideal_circuit = circuit.transform_qubits(final_map.__getitem__)
+
+    fidelity = fidelity_against_ideal(
+        ideal_circuit,
+        noisy_circuit,
+        spec.noise_model,
+        pure_ideal=spec.pure_ideal,
+        dtype=spec.dtype,
+    )
+    return {
+        "seed": seed,
+        "fidelity": fidelity,
+        "num_moments": len(ideal_circuit),
+        "num_operations": len(list(ideal_circuit.all_operations())),
+        "num_routed_moments": len(noisy_circuit),
+        "num_routed_operations": len(list(noisy_circuit.all_operations())),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def run_experiments(
+    spec: ExperimentSpec,
+    store: ResultStore,
+    processes: Optional[int] = None,
+    records_per_shard: int = 100,
+    mp_context: Optional[multiprocessing.context.BaseContext] = None,
+) -> Dict[str, np.ndarray]:
+    """Runs every seed of a campaign without a stored record, and returns all records.
+
+    Finished records are streamed to the store in shards, so rerunning an
+    interrupted campaign only loses the records not yet flushed.
+
+    Args:
+        spec: The campaign to run.
+        store: Where records are kept between runs.
+        processes: The number of worker processes to spread seeds over.
+            Defaults to the number of CPUs, and runs in-process if 1.
+        records_per_shard: The number of finished records to buffer before writing.
+        mp_context: The multiprocessing context to start worker processes with,
+            or None for the default start method.
+    """
+    completed = store.completed_seeds()
+    pending = [seed for seed in spec.seeds if seed not in completed]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    records = []
+
+    def finish(record):
+        records.append(record)
+        if len(records) >= records_per_shard:
+            store.write_shard(records)
+            records.clear()
+
+    try:
+        if processes == 1:
+            context = _compilation_context(spec) if pending else None
+            for seed in pending:
+                finish(run_experiment(spec, seed, context=context))
+        else:
+            # Architectures cannot be pickled, so each worker rebuilds it from its
+            # serialised form
+            architecture_dict = None
+            if spec.architecture is not None:
+                architecture_dict = spec.architecture.to_dict()
+                spec = dataclasses.replace(spec, architecture=None)
+            executor = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(spec, architecture_dict),
+            )
+            try:
+                futures = [executor.submit(_run_worker_experiment, seed) for seed in pending]
+                for future in as_completed(futures):
+                    finish(future.result())
+            finally:
+                executor.shutdown(cancel_futures=True)
+    finally:
+        # Whatever finished before an interruption is kept
+        store.write_shard(records)
+    return store.load()
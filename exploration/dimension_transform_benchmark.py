@@ -0,0 +1,49 @@
+import gc
+import time
+
+import cirq
+from transformations.dimension_transform import qubit_to_qutrit, qutrit_to_qubit
+
+# Throughput of the dimension transformers, as run around every place_and_route call,
+# on a circuit of one million operations over a grid of qubits
+num_rows = 10
+num_cols = 10
+num_operations = 1_000_000
+qubits = cirq.GridQubit.rect(num_rows, num_cols)
+single_qubit_gates = [cirq.X, cirq.H, cirq.T]
+two_qubit_gates = [cirq.CNOT, cirq.CZ]
+
+moments = []
+operation_count = 0
+while operation_count < num_operations:
+    layer = len(moments)
+    if layer % 2 == 0:
+        gate = single_qubit_gates[layer // 2 % len(single_qubit_gates)]
+        moment = cirq.Moment(gate(q) for q in qubits)
+    else:
+        gate = two_qubit_gates[layer // 2 % len(two_qubit_gates)]
+        # Pairs neighbours along rows, shifted by one column every other two-qubit layer
+        offset = layer // 2 % 2
+        moment = cirq.Moment(
+            gate(cirq.GridQubit(row, col), cirq.GridQubit(row, col + 1))
+            for row in range(num_rows)
+            for col in range(offset, num_cols - 1, 2)
+        )
+    moments.append(moment)
+    operation_count += len(moment)
+circuit = cirq.Circuit(moments)
+print(f"{operation_count} operations in {len(circuit)} moments")
+
+for transformer, input_circuit in [
+    (qubit_to_qutrit, circuit),
+    (qutrit_to_qubit, qubit_to_qutrit(circuit)),
+]:
+    # Collections triggered by building the input would otherwise be timed
+    gc.collect()
+    start = time.perf_counter()
+    output_circuit = transformer(input_circuit)
+    duration = time.perf_counter() - start
+    print(
+        f"{transformer.__name__}: {duration:.2f}s, "
+        f"{operation_count / duration / 1e6:.2f}M operations per second"
+    )
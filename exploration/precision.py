@@ -0,0 +1,100 @@
+import time
+
+import cirq
+import numpy as np
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from noise_models.hardware_aware import HardwareAwareSymmetricNoise
+from simulation.fidelity import fidelity_against_ideal
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from ops.ternary_gates import (
+    QutritPlusGate,
+    OneControlledPlusGate,
+    TwoControlledPlusGate,
+    QutritMinusGate,
+    OneControlledMinusGate,
+    TwoControlledMinusGate,
+)
+
+# Compares single and double precision noisy simulation on the same benchmark
+# circuits as noise_demo.py, at a size where both finish in seconds
+num_qutrits = 6
+circuit_depth = 6
+op_density = 0.3
+num_circuits = 10
+noise_simulable_gate_domain = {
+    SingleQubitGateToQutritGate(cirq.X): 1,
+    SingleQubitGateToQutritGate(cirq.Y): 1,
+    SingleQubitGateToQutritGate(cirq.Z): 1,
+    SingleQubitGateToQutritGate(cirq.H): 1,
+    SingleQubitGateToQutritGate(cirq.S): 1,
+    SingleQubitGateToQutritGate(cirq.T): 1,
+    TwoQubitGateToQutritGate(cirq.CNOT): 2,
+    TwoQubitGateToQutritGate(cirq.CZ): 2,
+    TwoQubitGateToQutritGate(cirq.SWAP): 2,
+    TwoQubitGateToQutritGate(cirq.ISWAP): 2,
+    QutritPlusGate: 1,
+    OneControlledPlusGate: 2,
+    TwoControlledPlusGate: 2,
+    QutritMinusGate: 1,
+    OneControlledMinusGate: 2,
+    TwoControlledMinusGate: 2,
+}
+qutrits = [cirq.NamedQid(str(i), dimension=3) for i in range(num_qutrits)]
+prng = np.random.RandomState(0)
+
+
+def hardware_aware_noise(dtype):
+    # Same error rates for both precisions, by reseeding
+    rates = np.random.RandomState(1)
+    single_qutrit_error_dict = {q: rates.uniform(0, 0.001 / 3) for q in qutrits}
+    two_qutrit_error_dict = {q: dict() for q in qutrits}
+    for qa in qutrits:
+        for qb in qutrits:
+            edge_error = rates.uniform(0, 0.01 / 15)
+            two_qutrit_error_dict[qa][qb] = edge_error
+            two_qutrit_error_dict[qb][qa] = edge_error
+    return HardwareAwareSymmetricNoise(
+        single_qutrit_hardware_error_rates=single_qutrit_error_dict,
+        two_qutrit_hardware_error_rates=two_qutrit_error_dict,
+        dtype=dtype,
+    )
+
+
+def gokhale_noise(dtype):
+    p_1 = 0.001
+    p_2 = 0.01
+    return GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=[1 - p_1] + 8 * [p_1 / 8],
+        two_qutrit_error_weights=[1 - p_2] + 80 * [p_2 / 80],
+        dtype=dtype,
+    )
+
+
+for noise_name, make_noise in [
+    ("hardware aware", hardware_aware_noise),
+    ("gokhale", gokhale_noise),
+]:
+    differences = []
+    durations = {np.complex64: 0.0, np.complex128: 0.0}
+    for _ in range(num_circuits):
+        circuit = cirq.testing.random_circuit(
+            qubits=qutrits,
+            n_moments=circuit_depth,
+            op_density=op_density,
+            gate_domain=noise_simulable_gate_domain,
+            random_state=prng,
+        )
+        fidelities = dict()
+        for dtype in durations:
+            start = time.perf_counter()
+            fidelities[dtype] = fidelity_against_ideal(
+                circuit, circuit, make_noise(dtype), qubit_order=qutrits, dtype=dtype
+            )
+            durations[dtype] += time.perf_counter() - start
+        differences.append(abs(fidelities[np.complex64] - fidelities[np.complex128]))
+
+    print(f"{noise_name} noise over {num_circuits} circuits:")
+    print(f"  max |F_complex64 - F_complex128| = {max(differences):.2e}")
+    print(f"  mean |F_complex64 - F_complex128| = {np.mean(differences):.2e}")
+    print(f"  complex64 time: {durations[np.complex64]:.2f}s")
+    print(f"  complex128 time: {durations[np.complex128]:.2f}s")
@@ -1,4 +1,5 @@
 import cirq
+import numpy as np
 import pytket
 from pytket_cirq_extension.cirq_to_tket import cirq_to_tk
 from pytket_cirq_extension.tket_to_cirq import tk_to_cirq
@@ -22,7 +23,8 @@ from ops.ternary_gates import (
 )
 from transformations.dimension_transform import qutrit_to_qubit, qubit_to_qutrit
 from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
-
+from simulation.checkpoints import CheckpointStore, simulate_with_checkpoints
+from simulation.fidelity import ideal_state_vector, pure_state_fidelity
 
 # Make unconstrained input circuit
 input_qutrits = [cirq.NamedQid(str(i), dimension=3) for i in range(10)]
@@ -89,52 +91,42 @@ noise_model = GokhaleNoiseModelOnQutrits(
     lambda_long=300.0 / 10000.0,
 )
 
-non_noisy_simulator = cirq.DensityMatrixSimulator()
-noisy_simulator = cirq.DensityMatrixSimulator(noise=noise_model)
+# Noisy runs resume from any checkpoint of a shared prefix, e.g. after a crash
+checkpoint_store = CheckpointStore(".checkpoints")
 
+# Ideal references are pure, so are simulated as state vectors
+# over the same qudits as the noisy runs
+qubit_order = sorted(placed_circ.all_qubits() | out_circ.all_qubits())
 
-all_to_all_ideal = non_noisy_simulator.simulate(placed_circ)
+all_to_all_ideal = ideal_state_vector(placed_circ, qubit_order)
 # all_to_all_distribution = non_noisy_simulator.run(in_circ, repetitions=reps)
 
-all_to_all_noisy_ideal = noisy_simulator.simulate(placed_circ)
+all_to_all_noisy_ideal = simulate_with_checkpoints(
+    placed_circ,
+    noise_model,
+    checkpoint_store,
+    qubit_order,
+    checkpoint_moments=range(0, len(placed_circ), 10),
+)
 # all_to_all_noisy_distribution = noisy_simulator.run(in_circ, repetitions=reps)
 
-routed_ideal = non_noisy_simulator.simulate(out_circ)
+routed_ideal = ideal_state_vector(out_circ, qubit_order)
 # routed_distribution = non_noisy_simulator.run(out_circ, repetitions=reps)
 
-routed_noisy = noisy_simulator.simulate(out_circ)
+routed_noisy = simulate_with_checkpoints(
+    out_circ,
+    noise_model,
+    checkpoint_store,
+    qubit_order,
+    checkpoint_moments=range(0, len(out_circ), 10),
+)
 # routed_noisy_distribution = noisy_simulator.run(out_circ, repetitions=reps)
 
 
-print(
-    cirq.qis.fidelity(
-        all_to_all_ideal.final_density_matrix,
-        all_to_all_ideal.final_density_matrix,
-        (len(all_to_all_ideal.final_density_matrix),),
-    )
-)
-
-print(
-    cirq.qis.fidelity(
-        all_to_all_ideal.final_density_matrix,
-        all_to_all_noisy_ideal.final_density_matrix,
-        (len(all_to_all_ideal.final_density_matrix),),
-    )
-)
+print(np.abs(np.vdot(all_to_all_ideal, all_to_all_ideal)) ** 2)
 
+print(pure_state_fidelity(all_to_all_ideal, all_to_all_noisy_ideal))
 
-print(
-    cirq.qis.fidelity(
-        all_to_all_ideal.final_density_matrix,
-        routed_ideal.final_density_matrix,
-        (len(all_to_all_ideal.final_density_matrix),),
-    )
-)
+print(np.abs(np.vdot(all_to_all_ideal, routed_ideal)) ** 2)
 
-print(
-    cirq.qis.fidelity(
-        all_to_all_ideal.final_density_matrix,
-        routed_noisy.final_density_matrix,
-        (len(all_to_all_ideal.final_density_matrix),),
-    )
-)
+print(pure_state_fidelity(all_to_all_ideal, routed_noisy))
@@ -1,6 +1,7 @@
 import cirq
 import numpy as np
 from noise_models.hardware_aware import HardwareAwareSymmetricNoise
+from simulation.fidelity import fidelity_against_ideal
 from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
 from ops.ternary_gates import (
     QutritPlusGate,
@@ -64,17 +65,7 @@ noise_model = HardwareAwareSymmetricNoise(
     lambda_long=300.0 / 10000.0,
 )
 
-ideal_simulator = cirq.DensityMatrixSimulator()
-noisy_simulator = cirq.DensityMatrixSimulator(noise=noise_model)
-
-ideal_result = ideal_simulator.simulate(circuit)
-noisy_result = noisy_simulator.simulate(circuit)
-
 print(
     "Resulting fidelity: ",
-    cirq.qis.fidelity(
-        ideal_result.final_density_matrix,
-        noisy_result.final_density_matrix,
-        (len(ideal_result.final_density_matrix),),
-    ),
+    fidelity_against_ideal(circuit, circuit, noise_model),
 )
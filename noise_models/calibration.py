@@ -0,0 +1,211 @@
+import csv
+import json
+import os
+from typing import Dict, Optional, Sequence
+
+import cirq
+import numpy as np
+
+
+class HardwareCalibration:
+    """A snapshot of hardware error rates over a device's qutrits,
+    stored as arrays indexed by qutrit ordinal.
+
+    Two-qutrit error rates are held in an n x n matrix, where edges without
+    a calibrated rate are NaN. If only one direction of an edge is given,
+    the rate is assumed symmetric.
+    """
+
+    def __init__(
+        self,
+        single_qutrit_error_rates: np.ndarray,
+        two_qutrit_error_rates: np.ndarray,
+        t1: Optional[np.ndarray] = None,
+        qutrits: Optional[Sequence["cirq.Qid"]] = None,
+    ):
+        """Initializes the calibration.
+
+        Args:
+            single_qutrit_error_rates: A length n array of probabilities
+                to incur any single qutrit Pauli error on each qutrit.
+            two_qutrit_error_rates: An n x n array of probabilities
+                to incur any two-qutrit Pauli error on each directed edge,
+                NaN where there is no edge.
+            t1: An optional length n array of coherence times T1,
+                which must be given and positive for every qutrit.
+            qutrits: The qutrits each ordinal refers to.
+                Defaults to n LineQids of dimension 3.
+        """
+        num_qutrits = len(single_qutrit_error_rates)
+        assert two_qutrit_error_rates.shape == (num_qutrits, num_qutrits)
+        assert t1 is None or len(t1) == num_qutrits
+        if t1 is not None:
+            invalid = np.flatnonzero(~(np.asarray(t1) > 0))
+            if len(invalid):
+                # NaN coherence times would otherwise only surface as NaN Kraus operators
+                raise ValueError(f"Missing or non-positive T1 for qutrits {invalid.tolist()}")
+        if qutrits is None:
+            qutrits = cirq.LineQid.range(num_qutrits, dimension=3)
+        assert len(qutrits) == num_qutrits
+
+        # If asymmetric rates are not given, assume symmetric error rates.
+        # Memory-mapped snapshots are left as they are unless they need filling in.
+        missing = np.isnan(two_qutrit_error_rates)
+        if np.any(missing & ~missing.T):
+            two_qutrit_error_rates = np.where(
+                missing, two_qutrit_error_rates.T, two_qutrit_error_rates
+            )
+
+        self.single_qutrit_error_rates = single_qutrit_error_rates
+        self.two_qutrit_error_rates = two_qutrit_error_rates
+        self.t1 = t1
+        self.qutrits = tuple(qutrits)
+        self.qutrit_indices: Dict["cirq.Qid", int] = {q: i for i, q in enumerate(self.qutrits)}
+
+    def __len__(self):
+        return len(self.qutrits)
+
+    def single_qutrit_error_rate(self, index: int) -> float:
+        error_rate = self.single_qutrit_error_rates[index]
+        if np.isnan(error_rate):
+            raise KeyError(f"No single qutrit error rate for qutrit {index}")
+        return float(error_rate)
+
+    def two_qutrit_error_rate(self, index_a: int, index_b: int) -> float:
+        error_rate = self.two_qutrit_error_rates[index_a, index_b]
+        if np.isnan(error_rate):
+            raise KeyError(f"No two-qutrit error rate for edge ({index_a}, {index_b})")
+        return float(error_rate)
+
+    @classmethod
+    def from_dicts(
+        cls,
+        single_qutrit_error_rates,  # type: Dict[cirq.Qid][np.float64]
+        two_qutrit_error_rates,  # type: Dict[cirq.Qid][Dict[cirq.Qid][np.float64]]
+        t1=None,  # type: Optional[Dict[cirq.Qid][np.float64]]
+    ) -> "HardwareCalibration":
+        """Builds a calibration from error rates in nested dicts indexed by qutrit."""
+        indices = {q: i for i, q in enumerate(single_qutrit_error_rates.keys())}
+        for qa, rates in two_qutrit_error_rates.items():
+            for q in (qa, *rates.keys()):
+                indices.setdefault(q, len(indices))
+        qutrits = list(indices.keys())
+
+        single = np.full(len(qutrits), np.nan)
+        for q, error_rate in single_qutrit_error_rates.items():
+            single[indices[q]] = error_rate
+        two = np.full((len(qutrits), len(qutrits)), np.nan)
+        for qa, rates in two_qutrit_error_rates.items():
+            for qb, error_rate in rates.items():
+                two[indices[qa], indices[qb]] = error_rate
+        t1_array = None
+        if t1 is not None:
+            t1_array = np.array([t1[q] for q in qutrits], dtype=np.float64)
+        return cls(single, two, t1=t1_array, qutrits=qutrits)
+
+    @classmethod
+    def from_json(cls, path, qutrits=None) -> "HardwareCalibration":
+        """Loads a calibration from a JSON snapshot of the form
+
+        {"single_qutrit_error_rates": [p_0, ...],
+         "two_qutrit_error_rates": [[a, b, p_ab], ...],
+         "t1": [t1_0, ...]}  (optional)
+        """
+        with open(path) as f:
+            snapshot = json.load(f)
+        single = np.array(snapshot["single_qutrit_error_rates"], dtype=np.float64)
+        two = np.full((len(single), len(single)), np.nan)
+        for a, b, error_rate in snapshot["two_qutrit_error_rates"]:
+            two[a, b] = error_rate
+        t1 = snapshot.get("t1")
+        if t1 is not None:
+            t1 = np.array(t1, dtype=np.float64)
+        return cls(single, two, t1=t1, qutrits=qutrits)
+
+    @classmethod
+    def from_csv(cls, path, qutrits=None) -> "HardwareCalibration":
+        """Loads a calibration from a CSV snapshot with header kind,a,b,value,
+        where kind is one of single, two or t1, and b is only given for two.
+        """
+        rows = []
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                rows.append((row["kind"], int(row["a"]), row["b"], float(row["value"])))
+        num_qutrits = 1 + max(max(a, int(b)) if kind == "two" else a for kind, a, b, value in rows)
+
+        single = np.full(num_qutrits, np.nan)
+        two = np.full((num_qutrits, num_qutrits), np.nan)
+        t1 = np.full(num_qutrits, np.nan)
+        for kind, a, b, value in rows:
+            if kind == "single":
+                single[a] = value
+            elif kind == "two":
+                two[a, int(b)] = value
+            elif kind == "t1":
+                t1[a] = value
+            else:
+                raise ValueError(f"Unknown calibration entry kind: {kind}")
+        if np.all(np.isnan(t1)):
+            t1 = None
+        return cls(single, two, t1=t1, qutrits=qutrits)
+
+    @classmethod
+    def from_npz(cls, path, qutrits=None, mmap_mode: Optional[str] = "r") -> "HardwareCalibration":
+        """Loads a calibration from an NPZ archive, or from a directory of NPY files
+        with the same names, which are memory-mapped with the given mode.
+
+        Arrays are named single_qutrit_error_rates, two_qutrit_error_rates and,
+        optionally, t1. Arrays inside an NPZ archive are always read into memory,
+        so large snapshots should be saved with save_npy_directory instead.
+        """
+        if os.path.isdir(path):
+
+            def load_array(name):
+                array_path = os.path.join(path, name + ".npy")
+                if not os.path.exists(array_path):
+                    return None
+                return np.load(array_path, mmap_mode=mmap_mode)
+
+        else:
+            with np.load(path) as archive:
+                arrays = {name: archive[name] for name in archive.files}
+
+            def load_array(name):
+                return arrays.get(name)
+
+        return cls(
+            load_array("single_qutrit_error_rates"),
+            load_array("two_qutrit_error_rates"),
+            t1=load_array("t1"),
+            qutrits=qutrits,
+        )
+
+    @classmethod
+    def load(cls, path, qutrits=None) -> "HardwareCalibration":
+        """Loads a calibration snapshot, choosing the format by file extension."""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".json":
+            return cls.from_json(path, qutrits=qutrits)
+        if extension == ".csv":
+            return cls.from_csv(path, qutrits=qutrits)
+        if extension == ".npz" or os.path.isdir(path):
+            return cls.from_npz(path, qutrits=qutrits)
+        raise ValueError(f"Unsupported calibration snapshot format: {path}")
+
+    def _arrays(self):
+        arrays = {
+            "single_qutrit_error_rates": self.single_qutrit_error_rates,
+            "two_qutrit_error_rates": self.two_qutrit_error_rates,
+        }
+        if self.t1 is not None:
+            arrays["t1"] = self.t1
+        return arrays
+
+    def save_npz(self, path):
+        np.savez(path, **self._arrays())
+
+    def save_npy_directory(self, path):
+        """Saves each array as an NPY file in the given directory, to be memory-mapped on load."""
+        os.makedirs(path, exist_ok=True)
+        for name, array in self._arrays().items():
+            np.save(os.path.join(path, name + ".npy"), array)
@@ -1,6 +1,6 @@
 import cirq
 import numpy as np
-from typing import Sequence
+from typing import Dict, Iterable, Optional, Sequence
 
 
 class GokhaleNoiseModelOnQubits(cirq.NoiseModel):
@@ -41,6 +41,26 @@ class GokhaleNoiseModelOnQubits(cirq.NoiseModel):
         self.idle_long = cirq.ops.AmplitudeDampingChannel(gamma_long)
         self.p1 = p1
         self.p2 = p2
+        self.gate_error_short = cirq.depolarize(p=0.001, n_qubits=1)
+        self.gate_error_long = cirq.depolarize(p=0.001, n_qubits=2)
+
+    def noisy_moments(
+        self, moments: "Iterable[cirq.Moment]", system_qubits: Sequence["cirq.Qid"]
+    ) -> Sequence["cirq.OP_TREE"]:
+        """Substitutes every noiseless moment of a circuit with equivalent ones with noise added.
+
+        Idle moments depend only on the system qubits, so each is built on first use
+        and shared between all moments of the same duration.
+
+        Args:
+            moments: The input moments to apply noise to.
+            system_qubits: The full list of qudits in the system.
+        Returns:
+            A list with, for each input moment, a collection of moments
+            equivalent to noisily executing it.
+        """
+        idle_moments: Dict[int, Optional["cirq.Moment"]] = dict()
+        return [self._noisy_moment(moment, system_qubits, idle_moments) for moment in moments]
 
     def noisy_moment(
         self, moment: "cirq.Moment", system_qubits: Sequence["cirq.Qid"]
@@ -53,40 +73,48 @@ class GokhaleNoiseModelOnQubits(cirq.NoiseModel):
         Returns:
             A collection of moments equivalent to noisily executing the input.
         """
+        return self._noisy_moment(moment, system_qubits, dict())
 
+    def _idle_moment(
+        self, duration: int, system_qubits: Sequence["cirq.Qid"]
+    ) -> Optional["cirq.Moment"]:
+        # As idle errors, apply amplitude dampening over all qubits
+        # roughly corresponding to the duration of a moment, where
+        # two-qubit gates are assumed to dominate in duration
+        if duration == 1:
+            return cirq.Moment(self.idle_short(qid) for qid in system_qubits)
+        if duration == 2:
+            return cirq.Moment(self.idle_long(qid) for qid in system_qubits)
+        return None
+
+    def _noisy_moment(
+        self,
+        moment: "cirq.Moment",
+        system_qubits: Sequence["cirq.Qid"],
+        idle_moments: Dict[int, Optional["cirq.Moment"]],
+    ) -> "cirq.OP_TREE":
         # Apply no noise if nothing is physically happening
         if self.is_virtual_moment(moment):
             return moment
 
-        effective_noise_moments = [moment]
-        ops = moment.operations
-        gate_moment = cirq.Moment()
+        gate_errors = []
         max_op_dim = 0
 
         # To simulate gate errors, add a probabilistic Pauli error
         # as depolarizing noise for each physical gate applied
-        for op in ops:
+        for op in moment.operations:
             op_dim = len(op.qubits)
             max_op_dim = max(max_op_dim, op_dim)
-            if len(op.qubits) == 1:
-                gate_moment = gate_moment.with_operation(
-                    cirq.depolarize(p=0.001, n_qubits=1).on(*op.qubits)
-                )
-            elif len(op.qubits) == 2:
-                gate_moment = gate_moment.with_operations(
-                    cirq.depolarize(p=0.001, n_qubits=2).on(*op.qubits)
-                )
-
-        effective_noise_moments.append(gate_moment)
+            if op_dim == 1:
+                gate_errors.append(self.gate_error_short.on(*op.qubits))
+            elif op_dim == 2:
+                gate_errors.append(self.gate_error_long.on(*op.qubits))
 
-        # As idle errors, apply amplitude dampening over all qubits
-        # roughly corresponding to the duration of this moment,
-        # where two-qubit gates are assumed to dominate in duration
-        if max_op_dim == 1:
-            idle_moment = cirq.Moment(self.idle_short(qubit) for qubit in system_qubits)
-            effective_noise_moments.append(idle_moment)
-        elif max_op_dim == 2:
-            idle_moment = cirq.Moment(self.idle_long(qubit) for qubit in system_qubits)
-            effective_noise_moments.append(idle_moment)
+        # Each moment is built once from its full list of operations
+        effective_noise_moments = [moment, cirq.Moment(gate_errors)]
+        if max_op_dim not in idle_moments:
+            idle_moments[max_op_dim] = self._idle_moment(max_op_dim, system_qubits)
+        if idle_moments[max_op_dim] is not None:
+            effective_noise_moments.append(idle_moments[max_op_dim])
 
         return effective_noise_moments
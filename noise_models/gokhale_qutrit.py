@@ -1,4 +1,4 @@
-from typing import Sequence
+from typing import Dict, Iterable, Optional, Sequence
 
 import cirq
 import numpy as np
@@ -26,6 +26,7 @@ class GokhaleNoiseModelOnQutrits(cirq.NoiseModel):
         two_qutrit_error_weights: Sequence[float],
         lambda_short=100.0 / 10000.0,
         lambda_long=None,
+        dtype=np.complex128,
     ):
         """Initializes noise model.
 
@@ -41,6 +42,8 @@ class GokhaleNoiseModelOnQutrits(cirq.NoiseModel):
             lambda_long: The ratio between two-qutrit
                 gate duration and coherence time T1.
                 Defaults to 3 * lambda_short if not given.
+            dtype: The precision of every noise channel's operators,
+                such as np.complex64 for single-precision simulation.
         """
         self.single_qutrit_error_weights = single_qutrit_error_weights
         self.two_qutrit_error_weights = two_qutrit_error_weights
@@ -79,8 +82,38 @@ class GokhaleNoiseModelOnQutrits(cirq.NoiseModel):
             np.array([[0, 0, gamma_2_long**0.5], [0, 0, 0], [0, 0, 0]]),
         ]
 
-        self.idle_short = QutritKrausChannel(short_idle_channel_operators)
-        self.idle_long = QutritKrausChannel(long_idle_channel_operators)
+        self.idle_short = QutritKrausChannel(short_idle_channel_operators, dtype=dtype)
+        self.idle_long = QutritKrausChannel(long_idle_channel_operators, dtype=dtype)
+
+        # Gate errors are independent of location, so one channel of each size suffices
+        self.single_qutrit_gate_error = QutritMixtureChannel(
+            error_weights=self.single_qutrit_error_weights,
+            errors=single_qutrit_pauli_operators,
+            dtype=dtype,
+        )
+        self.two_qutrit_gate_error = QutritMixtureChannel(
+            error_weights=self.two_qutrit_error_weights,
+            errors=two_qutrit_pauli_operators,
+            dtype=dtype,
+        )
+
+    def noisy_moments(
+        self, moments: "Iterable[cirq.Moment]", system_qubits: Sequence["cirq.Qid"]
+    ) -> Sequence["cirq.OP_TREE"]:
+        """Substitutes every noiseless moment of a circuit with equivalent ones with noise added.
+
+        Idle moments depend only on the system qutrits, so each is built on first use
+        and shared between all moments of the same duration.
+
+        Args:
+            moments: The input moments to apply noise to.
+            system_qubits: The full list of qudits in the system.
+        Returns:
+            A list with, for each input moment, a collection of moments
+            equivalent to noisily executing it.
+        """
+        idle_moments: Dict[int, Optional["cirq.Moment"]] = dict()
+        return [self._noisy_moment(moment, system_qubits, idle_moments) for moment in moments]
 
     def noisy_moment(
         self, moment: "cirq.Moment", system_qubits: Sequence["cirq.Qid"]
@@ -93,46 +126,48 @@ class GokhaleNoiseModelOnQutrits(cirq.NoiseModel):
         Returns:
             A collection of moments equivalent to noisily executing the input.
         """
-
+        return self._noisy_moment(moment, system_qubits, dict())
+
+    def _idle_moment(
+        self, duration: int, system_qubits: Sequence["cirq.Qid"]
+    ) -> Optional["cirq.Moment"]:
+        # As idle errors, apply amplitude dampening over all qutrits
+        # roughly corresponding to the duration of a moment, where
+        # two-qutrit gates are assumed to dominate in duration
+        if duration == 1:
+            return cirq.Moment(self.idle_short(qid) for qid in system_qubits)
+        if duration == 2:
+            return cirq.Moment(self.idle_long(qid) for qid in system_qubits)
+        return None
+
+    def _noisy_moment(
+        self,
+        moment: "cirq.Moment",
+        system_qubits: Sequence["cirq.Qid"],
+        idle_moments: Dict[int, Optional["cirq.Moment"]],
+    ) -> "cirq.OP_TREE":
         # Apply no noise if nothing is physically happening
         if self.is_virtual_moment(moment):
             return moment
 
-        effective_noise_moments = [moment]
-        ops = moment.operations
-        gate_moment = cirq.Moment()
+        gate_errors = []
         max_op_dim = 0
 
         # To simulate gate errors, add a probabilistic Pauli error
         # as depolarizing noise for each physical gate applied
-        for op in ops:
+        for op in moment.operations:
             op_dim = len(op.qubits)
             max_op_dim = max(max_op_dim, op_dim)
             if op_dim == 1:
-                gate_moment = gate_moment.with_operation(
-                    QutritMixtureChannel(
-                        error_weights=self.single_qutrit_error_weights,
-                        errors=single_qutrit_pauli_operators,
-                    ).on(*op.qubits)
-                )
+                gate_errors.append(self.single_qutrit_gate_error.on(*op.qubits))
             elif op_dim == 2:
-                gate_moment = gate_moment.with_operations(
-                    QutritMixtureChannel(
-                        error_weights=self.two_qutrit_error_weights,
-                        errors=two_qutrit_pauli_operators,
-                    ).on(*op.qubits)
-                )
-
-        effective_noise_moments.append(gate_moment)
-
-        # As idle errors, apply amplitude dampening over all qubits
-        # roughly corresponding to the duration of this moment, where
-        # the presence of two-qubit gates are assumed to dominate in duration
-        if max_op_dim == 1:
-            idle_moment = cirq.Moment(self.idle_short(qid) for qid in system_qubits)
-            effective_noise_moments.append(idle_moment)
-        elif max_op_dim == 2:
-            idle_moment = cirq.Moment(self.idle_long(qid) for qid in system_qubits)
-            effective_noise_moments.append(idle_moment)
+                gate_errors.append(self.two_qutrit_gate_error.on(*op.qubits))
+
+        # Each moment is built once from its full list of operations
+        effective_noise_moments = [moment, cirq.Moment(gate_errors)]
+        if max_op_dim not in idle_moments:
+            idle_moments[max_op_dim] = self._idle_moment(max_op_dim, system_qubits)
+        if idle_moments[max_op_dim] is not None:
+            effective_noise_moments.append(idle_moments[max_op_dim])
 
         return effective_noise_moments
@@ -1,6 +1,7 @@
 import cirq
 import numpy as np
-from typing import Dict, Sequence
+from typing import Dict, Iterable, Optional, Sequence
+from noise_models.calibration import HardwareCalibration
 from ops.channels import (
     QutritKrausChannel,
     SingleQutritDepolarizingChannel,
@@ -8,19 +9,51 @@ from ops.channels import (
 )
 
 
+def idle_channel(lambda_ratio, dtype=np.complex128) -> QutritKrausChannel:
+    """Amplitude dampening over a qutrit idling for the given ratio of T1.
+
+    Args:
+        lambda_ratio: The idle duration divided by T1.
+        dtype: The precision to store the Kraus operators in.
+    """
+    # Decay rate is e^(energy level * dt / T1)
+    gamma_1 = 1 - np.exp(-1 * lambda_ratio)
+    gamma_2 = 1 - np.exp(-2 * lambda_ratio)
+
+    # Assumption: decay is directly from |1> to |0> and from |2> to |0>,
+    # but decay from |2> to |1> is negligible
+    idle_channel_operators = [
+        np.array(
+            [
+                [1, 0, 0],
+                [0, (1 - gamma_1) ** 0.5, 0],
+                [0, 0, (1 - gamma_2) ** 0.5],
+            ]
+        ),
+        np.array([[0, gamma_1**0.5, 0], [0, 0, 0], [0, 0, 0]]),
+        np.array([[0, 0, gamma_2**0.5], [0, 0, 0], [0, 0, 0]]),
+    ]
+    return QutritKrausChannel(idle_channel_operators, dtype=dtype)
+
+
 class HardwareAwareSymmetricNoise(cirq.NoiseModel):
     """
     A noise model parameterized on hardware specific single-qudit and two-qudit gate error rates,
     which are distributed into equal likelihoods of occurring as any Pauli error.
-    Note that idle dampening errors are still assumed here to be identical.
+    Note that idle dampening errors are assumed here to be identical,
+    unless per-qutrit T1 times and gate durations are given.
     """
 
     def __init__(
         self,
-        single_qutrit_hardware_error_rates,  # type: Dict[cirq.Qid][np.float64]
-        two_qutrit_hardware_error_rates,  # type: Dict[cirq.Qid][Dict[cirq.Qid][np.float64]]
+        single_qutrit_hardware_error_rates=None,  # type: Dict[cirq.Qid][np.float64]
+        two_qutrit_hardware_error_rates=None,  # type: Dict[cirq.Qid][Dict[cirq.Qid][np.float64]]
         lambda_short=100.0 / 10000.0,
         lambda_long=None,
+        calibration: Optional[HardwareCalibration] = None,
+        single_qutrit_gate_duration=None,
+        two_qutrit_gate_duration=None,
+        dtype=np.complex128,
     ):
         """Initializes the noise model.
 
@@ -36,50 +69,93 @@ class HardwareAwareSymmetricNoise(cirq.NoiseModel):
             lambda_long: The ratio between two-qutrit
                 gate duration and coherence time T1.
                 Defaults to 3 * lambda_short if not given.
+            calibration: Array-backed error rates to use in place of the dicts.
+            single_qutrit_gate_duration: Duration of single qutrit gates, in the
+                same units as the calibration's T1. If given along with T1,
+                idle errors are per qutrit instead of from lambda_short.
+            two_qutrit_gate_duration: Duration of two-qutrit gates. Defaults to
+                3 * single_qutrit_gate_duration if not given.
+            dtype: The precision of every noise channel's operators,
+                such as np.complex64 for single-precision simulation.
         """
-
-        self.single_qutrit_error_rates = single_qutrit_hardware_error_rates
-        self.two_qutrit_error_rates = two_qutrit_hardware_error_rates
+        if calibration is None:
+            calibration = HardwareCalibration.from_dicts(
+                single_qutrit_hardware_error_rates, two_qutrit_hardware_error_rates
+            )
+        self.calibration = calibration
+        self.dtype = dtype
 
         if lambda_long is None:
             lambda_long = lambda_short * 3
 
-        # Decay rate is e^(energy level * dt / T1)
-        gamma_1_short = 1 - np.exp(-1 * lambda_short)
-        gamma_1_long = 1 - np.exp(-1 * lambda_long)
-        gamma_2_short = 1 - np.exp(-2 * lambda_short)
-        gamma_2_long = 1 - np.exp(-2 * lambda_long)
-
-        for qa in two_qutrit_hardware_error_rates.keys():
-            for qb in two_qutrit_hardware_error_rates[qa].keys():
-                if not qa in two_qutrit_hardware_error_rates[qb]:
-                    # If asymmetric rates are not given, assume symmetric error rates
-                    self.two_qutrit_error_rates[qb][qa] = two_qutrit_hardware_error_rates[qa][qb]
-
-        short_idle_channel_operators = [
-            np.array(
-                [
-                    [1, 0, 0],
-                    [0, (1 - gamma_1_short) ** 0.5, 0],
-                    [0, 0, (1 - gamma_2_short) ** 0.5],
-                ]
-            ),
-            np.array([[0, gamma_1_short**0.5, 0], [0, 0, 0], [0, 0, 0]]),
-            np.array([[0, 0, gamma_2_short**0.5], [0, 0, 0], [0, 0, 0]]),
-        ]
-        long_idle_channel_operators = [
-            np.array(
-                [
-                    [1, 0, 0],
-                    [0, (1 - gamma_1_long) ** 0.5, 0],
-                    [0, 0, (1 - gamma_2_long) ** 0.5],
-                ]
-            ),
-            np.array([[0, gamma_1_long**0.5, 0], [0, 0, 0], [0, 0, 0]]),
-            np.array([[0, 0, gamma_2_long**0.5], [0, 0, 0], [0, 0, 0]]),
-        ]
-        self.idle_short = QutritKrausChannel(short_idle_channel_operators)
-        self.idle_long = QutritKrausChannel(long_idle_channel_operators)
+        self.idle_short = idle_channel(lambda_short, dtype)
+        self.idle_long = idle_channel(lambda_long, dtype)
+
+        # With per-qutrit coherence times, idle channels are instead per qutrit
+        self.idle_short_by_qutrit = None
+        self.idle_long_by_qutrit = None
+        if calibration.t1 is not None and single_qutrit_gate_duration is not None:
+            if two_qutrit_gate_duration is None:
+                two_qutrit_gate_duration = single_qutrit_gate_duration * 3
+            t1 = np.asarray(calibration.t1)
+            self.idle_short_by_qutrit = [
+                idle_channel(lambda_ratio, dtype)
+                for lambda_ratio in single_qutrit_gate_duration / t1
+            ]
+            self.idle_long_by_qutrit = [
+                idle_channel(lambda_ratio, dtype) for lambda_ratio in two_qutrit_gate_duration / t1
+            ]
+
+        # Each gate error channel is built once, on first use, per qutrit and per
+        # directed edge, sharing instances between locations with identical error rates
+        self._single_qutrit_channels = dict()
+        self._two_qutrit_channels = dict()
+        self._channels_by_rate = dict()
+
+    def single_qutrit_channel(self, index: int) -> SingleQutritDepolarizingChannel:
+        """Returns the gate error channel of the qutrit with the given ordinal."""
+        channel = self._single_qutrit_channels.get(index)
+        if channel is None:
+            error_rate = self.calibration.single_qutrit_error_rate(index)
+            key = (1, error_rate)
+            if key not in self._channels_by_rate:
+                self._channels_by_rate[key] = SingleQutritDepolarizingChannel(
+                    prob=error_rate, dtype=self.dtype
+                )
+            channel = self._single_qutrit_channels[index] = self._channels_by_rate[key]
+        return channel
+
+    def two_qutrit_channel(self, index_a: int, index_b: int) -> TwoQutritDepolarizingChannel:
+        """Returns the gate error channel of the directed edge between the given ordinals."""
+        channel = self._two_qutrit_channels.get((index_a, index_b))
+        if channel is None:
+            error_rate = self.calibration.two_qutrit_error_rate(index_a, index_b)
+            key = (2, error_rate)
+            if key not in self._channels_by_rate:
+                self._channels_by_rate[key] = TwoQutritDepolarizingChannel(
+                    prob=error_rate, dtype=self.dtype
+                )
+            channel = self._channels_by_rate[key]
+            self._two_qutrit_channels[(index_a, index_b)] = channel
+        return channel
+
+    def noisy_moments(
+        self, moments: "Iterable[cirq.Moment]", system_qubits: Sequence["cirq.Qid"]
+    ) -> Sequence["cirq.OP_TREE"]:
+        """Substitutes every noiseless moment of a circuit with equivalent ones with noise added.
+
+        Idle moments depend only on the system qutrits, so each is built on first use
+        and shared between all moments of the same duration.
+
+        Args:
+            moments: The input moments to apply noise to.
+            system_qubits: The full list of qudits in the system.
+        Returns:
+            A list with, for each input moment, a collection of moments
+            equivalent to noisily executing it.
+        """
+        idle_moments: Dict[int, Optional["cirq.Moment"]] = dict()
+        return [self._noisy_moment(moment, system_qubits, idle_moments) for moment in moments]
 
     def noisy_moment(
         self, moment: "cirq.Moment", system_qubits: Sequence["cirq.Qid"]
@@ -92,43 +168,57 @@ class HardwareAwareSymmetricNoise(cirq.NoiseModel):
         Returns:
             A collection of moments equivalent to noisily executing the input.
         """
-
+        return self._noisy_moment(moment, system_qubits, dict())
+
+    def _idle_moment(
+        self, duration: int, system_qubits: Sequence["cirq.Qid"]
+    ) -> Optional["cirq.Moment"]:
+        # As idle errors, apply amplitude dampening over all qutrits
+        # roughly corresponding to the duration of a moment, where
+        # two-qutrit gates are assumed to dominate in duration
+        if duration == 1:
+            idle, idle_by_qutrit = self.idle_short, self.idle_short_by_qutrit
+        elif duration == 2:
+            idle, idle_by_qutrit = self.idle_long, self.idle_long_by_qutrit
+        else:
+            return None
+        if idle_by_qutrit is None:
+            return cirq.Moment(idle(qid) for qid in system_qubits)
+        indices = self.calibration.qutrit_indices
+        return cirq.Moment(idle_by_qutrit[indices[qid]](qid) for qid in system_qubits)
+
+    def _noisy_moment(
+        self,
+        moment: "cirq.Moment",
+        system_qubits: Sequence["cirq.Qid"],
+        idle_moments: Dict[int, Optional["cirq.Moment"]],
+    ) -> "cirq.OP_TREE":
         # Apply no noise if nothing is physically happening
         if self.is_virtual_moment(moment):
             return moment
 
-        effective_noise_moments = [moment]
-        ops = moment.operations
-        gate_moment = cirq.Moment()
+        gate_errors = []
         max_op_dim = 0
+        indices = self.calibration.qutrit_indices
 
         # To simulate gate errors, add a ternary Pauli error as
         # depolarizing noise for each physical gate applied,
         # based on which qutrit(s) it is being applied to
-        for op in ops:
+        for op in moment.operations:
             op_dim = len(op.qubits)
             max_op_dim = max(max_op_dim, op_dim)
             if op_dim == 1:
-                error_rate = self.single_qutrit_error_rates[op.qubits[0]]
-                gate_moment = gate_moment.with_operation(
-                    SingleQutritDepolarizingChannel(prob=error_rate).on(*op.qubits)
-                )
+                channel = self.single_qutrit_channel(indices[op.qubits[0]])
+                gate_errors.append(channel.on(*op.qubits))
             elif op_dim == 2:
-                error_rate = self.two_qutrit_error_rates[op.qubits[0]][op.qubits[1]]
-                gate_moment = gate_moment.with_operations(
-                    TwoQutritDepolarizingChannel(prob=error_rate).on(*op.qubits)
-                )
-
-        effective_noise_moments.append(gate_moment)
-
-        # As idle errors, apply amplitude dampening over all qubits
-        # roughly corresponding to the duration of this moment,
-        # where two-qubit gates are assumed to dominate in duration
-        if max_op_dim == 1:
-            idle_moment = cirq.Moment(self.idle_short(qid) for qid in system_qubits)
-            effective_noise_moments.append(idle_moment)
-        elif max_op_dim == 2:
-            idle_moment = cirq.Moment(self.idle_long(qid) for qid in system_qubits)
-            effective_noise_moments.append(idle_moment)
+                channel = self.two_qutrit_channel(indices[op.qubits[0]], indices[op.qubits[1]])
+                gate_errors.append(channel.on(*op.qubits))
+
+        # Each moment is built once from its full list of operations
+        effective_noise_moments = [moment, cirq.Moment(gate_errors)]
+        if max_op_dim not in idle_moments:
+            idle_moments[max_op_dim] = self._idle_moment(max_op_dim, system_qubits)
+        if idle_moments[max_op_dim] is not None:
+            effective_noise_moments.append(idle_moments[max_op_dim])
 
         return effective_noise_moments
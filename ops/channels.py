@@ -1,8 +1,24 @@
 import cirq
 import numpy as np
-from ops.pauli_operators import single_qutrit_pauli_operators, two_qutrit_pauli_operators
+from ops.pauli_operators import (
+    single_qutrit_pauli_operators,
+    two_qutrit_pauli_operators,
+    weyl_heisenberg_indices,
+)
 
 
+def _act_on_density_matrix(gate, args, qubits):
+    """Routes density matrix simulation through the gate's own _apply_channel_.
+
+    GateOperation does not forward _apply_channel_ to its gate, so without
+    this cirq.DensityMatrixSimulator falls back to generic Kraus application.
+    """
+    if isinstance(args, cirq.ActOnDensityMatrixArgs):
+        return args._act_on_fallback_(gate, qubits)
+    return NotImplemented
+
+
+@cirq.value_equality
 class QutritMixtureChannel(cirq.Gate):  # Can't inherit from SingleQubitGate
     """
     A channel comprised of a mixture of unitaries over qutrits, and corresponding probabilities.
@@ -10,12 +26,23 @@ class QutritMixtureChannel(cirq.Gate):  # Can't inherit from SingleQubitGate
     Used in place of depolarization.
     """
 
-    def __init__(self, error_weights, errors):
+    def __init__(self, error_weights, errors, dtype=np.complex128):
+        """Initializes the channel.
+
+        Args:
+            error_weights: The probability of each error.
+            errors: The unitary errors, all of the same shape.
+            dtype: The precision to store the errors in, such as np.complex64
+                to match a single-precision simulation.
+        """
         assert np.isclose(sum(error_weights), 1.0)
+        errors = [np.asarray(error, dtype=dtype) for error in errors]
+        self.dtype = dtype
         op_shape = errors[0].shape
         for error in errors:
             assert error.shape == op_shape
-        self.mixture = tuple(zip(error_weights, errors))
+        self.error_weights = tuple(error_weights)
+        self.mixture = tuple(zip(self.error_weights, errors))
         if op_shape == (3, 3):
             assert len(error_weights) == 9
             self.qid_shape = (3,)  # One-qutrit mixture
@@ -23,12 +50,86 @@ class QutritMixtureChannel(cirq.Gate):  # Can't inherit from SingleQubitGate
             assert len(error_weights) == 81
             self.qid_shape = (3, 3)  # Two-qutrit mixture
 
+        # Operators are compared by value, packed once so hashing stays cheap
+        self._errors_key = np.stack(errors).astype(np.complex128).tobytes()
+        self._pauli_terms = self._group_pauli_terms(errors)
+
+    def _group_pauli_terms(self, errors):
+        """If every error is a ternary Pauli X3^a Z3^b, groups the mixture by shift a.
+
+        Conjugating by X3^a Z3^b rolls both indices of rho by a and multiplies
+        entry (i, j) by w^(b (i - j)), so each shift needs one roll and one
+        elementwise multiply by the weighted sum of its phases.
+        Returns None for mixtures containing any other unitary.
+        """
+        num_qutrits = len(self.qid_shape)
+        omega = np.exp(-2j * np.pi / 3)
+        indices = np.indices((3,) * (2 * num_qutrits))
+        index_differences = indices[:num_qutrits] - indices[num_qutrits:]
+
+        coefficients_by_shift = dict()
+        for weight, error in zip(self.error_weights, errors):
+            weyl_indices = weyl_heisenberg_indices(error)
+            if weyl_indices is None:
+                return None
+            if weight == 0:
+                continue
+            shifts, phases = weyl_indices
+            exponent = np.tensordot(phases, index_differences, axes=1)
+            coefficients_by_shift.setdefault(shifts, 0)
+            coefficients_by_shift[shifts] = coefficients_by_shift[shifts] + weight * omega**exponent
+        return tuple(
+            (shifts, coefficients.astype(self.dtype))
+            for shifts, coefficients in coefficients_by_shift.items()
+        )
+
+    @property
+    def pauli_terms(self):
+        """The mixture grouped by Pauli shift, as (shifts, coefficients) pairs with
+        coefficients indexed (left..., right...), or None if any error is not a Pauli.
+        """
+        return self._pauli_terms
+
     def _qid_shape_(self):
         return self.qid_shape
 
     def _mixture_(self):
         return self.mixture
 
+    def _apply_channel_(self, args: "cirq.ApplyChannelArgs"):
+        if self._pauli_terms is None:
+            return NotImplemented
+
+        tensor = args.target_tensor
+        target_axes = tuple(args.left_axes) + tuple(args.right_axes)
+        # Coefficients are indexed (left..., right...), reorder to match the tensor's axes
+        axis_order = np.argsort(target_axes)
+        broadcast_shape = [1] * tensor.ndim
+        for axis in target_axes:
+            broadcast_shape[axis] = 3
+
+        out = args.out_buffer
+        for term_index, (shifts, coefficients) in enumerate(self._pauli_terms):
+            # Coefficients are tiny, so are cast to the state's precision rather than upcasting it
+            coefficients = coefficients.astype(tensor.dtype, copy=False)
+            coefficients = coefficients.transpose(axis_order).reshape(broadcast_shape)
+            if any(shifts):
+                shifted = np.roll(tensor, shift=shifts + shifts, axis=target_axes)
+            else:
+                shifted = tensor
+            if term_index == 0:
+                np.multiply(shifted, coefficients, out=out)
+            else:
+                np.multiply(shifted, coefficients, out=args.auxiliary_buffer0)
+                out += args.auxiliary_buffer0
+        return out
+
+    def _act_on_(self, args: "cirq.OperationTarget", qubits):
+        return _act_on_density_matrix(self, args, qubits)
+
+    def _value_equality_values_(self):
+        return self.error_weights, self._errors_key
+
     def _circuit_diagram_info_(self, args) -> str:
         return (
             f"QutritMixtureChannel"  # would get too long if we printed out all probabilities here
@@ -37,6 +138,7 @@ class QutritMixtureChannel(cirq.Gate):  # Can't inherit from SingleQubitGate
 
 # Kraus operators over qudits are not supported through KrausChannel interface, see
 # https://github.com/quantumlib/Cirq/blob/v0.14.0/cirq-core/cirq/ops/kraus_channel.py#L37
+@cirq.value_equality
 class QutritKrausChannel(cirq.Gate):
     """A channel defined with regards to a complete set
     of Kraus operators over a mode of decay.
@@ -44,28 +146,145 @@ class QutritKrausChannel(cirq.Gate):
     Used in place of amplitude dampening.
     """
 
-    def __init__(self, kraus_ops):
+    def __init__(self, kraus_ops, dtype=np.complex128):
+        """Initializes the channel.
+
+        Args:
+            kraus_ops: The 3x3 Kraus operators of the channel.
+            dtype: The precision to store the operators in.
+        """
         for op in kraus_ops:
             assert op.shape == (3, 3)
+        kraus_ops = [np.asarray(op, dtype=dtype) for op in kraus_ops]
+        self.dtype = dtype
         self.kraus_operators = kraus_ops
 
+        self._kraus_key = np.stack(kraus_ops).astype(np.complex128).tobytes()
+        self._decay_structure = self._find_decay_structure(kraus_ops, dtype)
+
+    @staticmethod
+    def _find_decay_structure(kraus_ops, dtype):
+        """Splits the Kraus operators into diagonal damping and single-entry jumps.
+
+        A diagonal operator D scales entry (i, j) of rho by D_ii * conj(D_jj),
+        and a jump a|r><c| only adds |a|^2 * rho_cc onto rho_rr.
+        Returns None if any operator is neither diagonal nor a single entry.
+        """
+        damping = np.zeros((3, 3), dtype=dtype)
+        jumps = []
+        for op in kraus_ops:
+            nonzero_rows, nonzero_cols = np.nonzero(op)
+            if np.all(nonzero_rows == nonzero_cols):
+                diagonal = np.diagonal(op)
+                damping += np.outer(diagonal, np.conj(diagonal))
+            elif len(nonzero_rows) == 1:
+                row, col = nonzero_rows[0], nonzero_cols[0]
+                jumps.append((row, col, np.abs(op[row, col]) ** 2))
+            else:
+                return None
+        return damping, tuple(jumps)
+
+    @property
+    def decay_structure(self):
+        """The summed damping matrix and the (row, col, rate) of each jump,
+        or None if any Kraus operator is neither diagonal nor a single entry.
+        """
+        return self._decay_structure
+
     def _qid_shape_(self):
         return (3,)
 
     def _kraus_(self):
         return self.kraus_operators
 
+    def _apply_channel_(self, args: "cirq.ApplyChannelArgs"):
+        if self._decay_structure is None:
+            return NotImplemented
+        damping, jumps = self._decay_structure
+
+        tensor = args.target_tensor
+        left_axis, right_axis = args.left_axes[0], args.right_axes[0]
+        broadcast_shape = [1] * tensor.ndim
+        broadcast_shape[left_axis] = 3
+        broadcast_shape[right_axis] = 3
+        if left_axis > right_axis:
+            damping = damping.T
+        damping = damping.astype(tensor.dtype, copy=False)
+
+        out = args.out_buffer
+        np.multiply(tensor, damping.reshape(broadcast_shape), out=out)
+        for row, col, rate in jumps:
+            source = [slice(None)] * tensor.ndim
+            source[left_axis] = col
+            source[right_axis] = col
+            target = [slice(None)] * tensor.ndim
+            target[left_axis] = row
+            target[right_axis] = row
+            out[tuple(target)] += rate * tensor[tuple(source)]
+        return out
+
+    def _act_on_(self, args: "cirq.OperationTarget", qubits):
+        return _act_on_density_matrix(self, args, qubits)
+
+    def _value_equality_values_(self):
+        return self._kraus_key
+
     def _circuit_diagram_info_(self, args) -> str:
         return f"QutritKrausChannel"
 
 
+def _apply_depolarizing_channel(args: "cirq.ApplyChannelArgs", prob, qid_shape):
+    """Applies symmetric depolarization over the target axes of a density matrix tensor.
+
+    Averaging over all d^2 Pauli conjugations gives Tr_A(rho) (x) I_A, so the channel
+    (1 - p) rho + p / (d^2 - 1) * sum_{P != I} P rho P^dag reduces to
+    (1 - p - p / (d^2 - 1)) rho + p * d / (d^2 - 1) * Tr_A(rho) (x) I_A.
+    """
+    d = int(np.prod(qid_shape))
+    rho_weight = 1 - prob - prob / (d**2 - 1)
+    trace_weight = prob * d / (d**2 - 1)
+
+    # Partial trace over the targets as a single einsum, by repeating each target's subscript
+    tensor = args.target_tensor
+    subscripts = list(range(tensor.ndim))
+    for left_axis, right_axis in zip(args.left_axes, args.right_axes):
+        subscripts[right_axis] = subscripts[left_axis]
+    target_axes = set(args.left_axes) | set(args.right_axes)
+    kept_subscripts = [subscripts[axis] for axis in range(tensor.ndim) if axis not in target_axes]
+    partial_trace = np.einsum(tensor, subscripts, kept_subscripts)
+    partial_trace *= trace_weight
+
+    out = args.out_buffer
+    np.multiply(tensor, rho_weight, out=out)
+    # Tensoring with the identity only touches the diagonal of the targets
+    for index in np.ndindex(*qid_shape):
+        diagonal = [slice(None)] * tensor.ndim
+        for left_axis, right_axis, level in zip(args.left_axes, args.right_axes, index):
+            diagonal[left_axis] = level
+            diagonal[right_axis] = level
+        out[tuple(diagonal)] += partial_trace
+    return out
+
+
 class SingleQutritDepolarizingChannel(QutritMixtureChannel):
-    def __init__(self, prob):
+    def __init__(self, prob, dtype=np.complex128):
+        self.prob = prob
         operator_weights = [1 - prob] + 8 * [prob / 8]
-        super().__init__(error_weights=operator_weights, errors=single_qutrit_pauli_operators)
+        super().__init__(
+            error_weights=operator_weights, errors=single_qutrit_pauli_operators, dtype=dtype
+        )
+
+    def _apply_channel_(self, args: "cirq.ApplyChannelArgs"):
+        return _apply_depolarizing_channel(args, self.prob, self.qid_shape)
 
 
 class TwoQutritDepolarizingChannel(QutritMixtureChannel):
-    def __init__(self, prob):
+    def __init__(self, prob, dtype=np.complex128):
+        self.prob = prob
         operator_weights = [1 - prob] + 80 * [prob / 80]
-        super().__init__(error_weights=operator_weights, errors=two_qutrit_pauli_operators)
+        super().__init__(
+            error_weights=operator_weights, errors=two_qutrit_pauli_operators, dtype=dtype
+        )
+
+    def _apply_channel_(self, args: "cirq.ApplyChannelArgs"):
+        return _apply_depolarizing_channel(args, self.prob, self.qid_shape)
@@ -0,0 +1,28 @@
+import weakref
+from typing import Tuple
+
+import cirq
+
+# Shared wrapper instances in both dimensions, keyed on wrapper type and base gate.
+# Entries only live as long as some circuit still holds the wrapper.
+_interned_wrappers: "weakref.WeakValueDictionary[Tuple[type, cirq.Gate], cirq.Gate]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def intern_wrapper(wrapper_type: type, gate: "cirq.Gate") -> "cirq.Gate":
+    """Returns the shared wrapper_type(gate), constructing it if none is alive.
+
+    Args:
+        wrapper_type: The wrapper class, taking the base gate as its only argument.
+        gate: The base gate to wrap. Unhashable gates are wrapped afresh every time.
+    """
+    key = (wrapper_type, gate)
+    try:
+        wrapper = _interned_wrappers.get(key)
+    except TypeError:
+        return wrapper_type(gate)
+    if wrapper is None:
+        wrapper = wrapper_type(gate)
+        _interned_wrappers[key] = wrapper
+    return wrapper
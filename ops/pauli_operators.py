@@ -122,3 +122,40 @@ two_qutrit_pauli_operators = [
     np.kron(X3 @ X3 @ Z3 @ Z3, X3 @ X3 @ Z3),
     np.kron(X3 @ X3 @ Z3 @ Z3, X3 @ X3 @ Z3 @ Z3),
 ]
+
+
+def weyl_heisenberg_indices(operator):
+    """Identifies an operator as a (phased) tensor product of ternary Paulis.
+
+    Returns the shifts a and phases b such that the operator is proportional to
+    the tensor product of X3^a_k @ Z3^b_k over its qutrits k, or None if the
+    operator is not of that form. Global phase is ignored, as it cancels under conjugation.
+    """
+    num_qutrits = int(round(np.log(operator.shape[0]) / np.log(3)))
+    qid_shape = (3,) * num_qutrits
+
+    # X3^a maps |0...0> to |a>, and Z3^b leaves |0...0> alone
+    shift_index = int(np.argmax(np.abs(operator[:, 0])))
+    shifts = np.unravel_index(shift_index, qid_shape)
+    reference = operator[shift_index, 0]
+    if np.isclose(reference, 0):
+        return None
+
+    # Z3^b contributes e^(-2 pi i b / 3) on each |1> component
+    phases = []
+    for k in range(num_qutrits):
+        basis = [0] * num_qutrits
+        basis[k] = 1
+        column = np.ravel_multi_index(basis, qid_shape)
+        row = np.ravel_multi_index([(s + b) % 3 for s, b in zip(shifts, basis)], qid_shape)
+        angle = np.angle(operator[row, column] / reference)
+        phases.append(int(np.round(angle / (-2 * np.pi / 3))) % 3)
+
+    candidate = np.eye(1)
+    for a, b in zip(shifts, phases):
+        candidate = np.kron(
+            candidate, np.linalg.matrix_power(X3, int(a)) @ np.linalg.matrix_power(Z3, b)
+        )
+    if not np.allclose(operator, reference * candidate):
+        return None
+    return tuple(int(a) for a in shifts), tuple(phases)
@@ -1,8 +1,28 @@
 import cirq
 import numpy as np
 
+# Permutation entries are exact in single precision, so are stored as complex64
+# and promoted by numpy only where the state being acted on is complex128
+_plus_unitary = np.array([[0, 0, 1], [1, 0, 0], [0, 1, 0]], dtype=np.complex64)
+_plus_unitary.setflags(write=False)
+_minus_unitary = np.array([[0, 1, 0], [0, 0, 1], [1, 0, 0]], dtype=np.complex64)
+_minus_unitary.setflags(write=False)
+
+
+def _apply_cyclic_shift(args: "cirq.ApplyUnitaryArgs", shift):
+    """Applies |n> -> |n+shift % 3> on the target axis as a permutation of slices."""
+    axis = args.axes[0]
+    for level in range(3):
+        source = [slice(None)] * args.target_tensor.ndim
+        source[axis] = level
+        target = [slice(None)] * args.target_tensor.ndim
+        target[axis] = (level + shift) % 3
+        args.available_buffer[tuple(target)] = args.target_tensor[tuple(source)]
+    return args.available_buffer
+
 
 # with example from https://github.com/quantumlib/Cirq/blob/master/docs/qudits.ipynb
+@cirq.value_equality
 class QutritPlusGateClass(cirq.Gate):
     """A one-qutrit gate that implements the following action:
 
@@ -13,14 +33,23 @@ class QutritPlusGateClass(cirq.Gate):
         return (3,)
 
     def _unitary_(self):
-        return np.array([[0, 0, 1], [1, 0, 0], [0, 1, 0]])
+        return _plus_unitary
+
+    def _apply_unitary_(self, args: "cirq.ApplyUnitaryArgs"):
+        return _apply_cyclic_shift(args, 1)
 
     def _circuit_diagram_info_(self, args):
         return "[+1]"
 
+    def _value_equality_values_(self):
+        return ()
+
 
 QutritPlusGate = QutritPlusGateClass()
 
+# Controlled variants need no fast path of their own: cirq.ControlledGate applies
+# the sub gate's _apply_unitary_ to only the slice matching the control value
+
 OneControlledPlusGate = cirq.ControlledGate(
     sub_gate=QutritPlusGate, num_controls=1, control_values=[1], control_qid_shape=(3,)
 )
@@ -30,6 +59,7 @@ TwoControlledPlusGate = cirq.ControlledGate(
 )
 
 
+@cirq.value_equality
 class QutritMinusGateClass(cirq.Gate):
     """A one-qutrit gate that implements the following action:
 
@@ -40,11 +70,17 @@ class QutritMinusGateClass(cirq.Gate):
         return (3,)
 
     def _unitary_(self):
-        return np.array([[0, 1, 0], [0, 0, 1], [1, 0, 0]])
+        return _minus_unitary
+
+    def _apply_unitary_(self, args: "cirq.ApplyUnitaryArgs"):
+        return _apply_cyclic_shift(args, -1)
 
     def _circuit_diagram_info_(self, args):
         return "[-1]"
 
+    def _value_equality_values_(self):
+        return ()
+
 
 QutritMinusGate = QutritMinusGateClass()
 
@@ -57,6 +93,7 @@ TwoControlledMinusGate = cirq.ControlledGate(
 )
 
 
+@cirq.value_equality
 class QutritSwap(cirq.Gate):
     """A two-qutrit gate that implements the following action:
 
@@ -81,9 +118,18 @@ class QutritSwap(cirq.Gate):
                 [0, 0, 1, 0, 0, 0, 0, 0, 0],
                 [0, 0, 0, 0, 0, 1, 0, 0, 0],
                 [0, 0, 0, 0, 0, 0, 0, 0, 1],
-            ]
+            ],
+            dtype=np.complex64,
         )
 
+    def _apply_unitary_(self, args: "cirq.ApplyUnitaryArgs"):
+        a, b = args.axes
+        args.available_buffer[...] = np.swapaxes(args.target_tensor, a, b)
+        return args.available_buffer
+
+    def _value_equality_values_(self):
+        return ()
+
 
 if __name__ == "__main__":
     cirq.X(cirq.LineQubit(1))
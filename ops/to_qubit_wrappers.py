@@ -1,8 +1,16 @@
 import cirq
 import numpy as np
 from typing import Tuple
+from ops.interning import intern_wrapper
 
+# Dummy action shared by every wrapper: Identity
+_single_qubit_identity = np.eye(2, dtype=np.complex128)
+_single_qubit_identity.setflags(write=False)
+_two_qubit_identity = np.eye(4, dtype=np.complex128)
+_two_qubit_identity.setflags(write=False)
 
+
+@cirq.value_equality
 class SingleQutritGateToQubitGate(cirq.Gate):
     """Wraps a single-qutrit gate in a single-qubit gate
     with dummy action, for the sole purposes of getting to routing.
@@ -11,19 +19,31 @@ class SingleQutritGateToQubitGate(cirq.Gate):
     """
 
     def __init__(self, gate):
-        self.base_gate = gate
+        self._base_gate = gate
+
+    @classmethod
+    def interned(cls, gate):
+        """Returns the shared wrapper of the given gate, constructing it on first use."""
+        return intern_wrapper(cls, gate)
+
+    @property
+    def base_gate(self):
+        return self._base_gate
 
     def _qid_shape_(self) -> Tuple[int, ...]:
         return (2,)
 
     def _unitary_(self):
-        # Dummy action: Identity
-        return np.eye(2, dtype=np.complex128)
+        return _single_qubit_identity
+
+    def _value_equality_values_(self):
+        return self.base_gate
 
     def _circuit_diagram_info_(self, args):
         return "{}(3)".format(str(self.base_gate))
 
 
+@cirq.value_equality
 class TwoQutritGateToQubitGate(cirq.Gate):
     """ "Wraps a single-qutrit gate in a single-qubit gate
     with dummy action, for the sole purposes of getting to routing.
@@ -32,7 +52,16 @@ class TwoQutritGateToQubitGate(cirq.Gate):
     """
 
     def __init__(self, gate):
-        self.base_gate = gate
+        self._base_gate = gate
+
+    @classmethod
+    def interned(cls, gate):
+        """Returns the shared wrapper of the given gate, constructing it on first use."""
+        return intern_wrapper(cls, gate)
+
+    @property
+    def base_gate(self):
+        return self._base_gate
 
     def _qid_shape_(self) -> Tuple[int, ...]:
         return (
@@ -41,8 +70,10 @@ class TwoQutritGateToQubitGate(cirq.Gate):
         )
 
     def _unitary_(self):
-        # Dummy action: Identity
-        return np.eye(4, dtype=np.complex128)
+        return _two_qubit_identity
+
+    def _value_equality_values_(self):
+        return self.base_gate
 
     def _circuit_diagram_info_(self, args):
         def wrap_wire_symbol(symbol):
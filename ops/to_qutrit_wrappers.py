@@ -1,8 +1,31 @@
 import cirq
 import numpy as np
 from typing import Tuple
+from ops.interning import intern_wrapper
 
 
+def _apply_to_qubit_subspace(base_gate, args: "cirq.ApplyUnitaryArgs"):
+    """Applies a qubit gate to only the {|0>, |1>} slices of the target axes.
+
+    Every state with a target in |2> is left untouched, so the base gate
+    acts on a 2x...x2 view of the tensor rather than the padded unitary.
+    """
+    qubit_subspace = [slice(None)] * args.target_tensor.ndim
+    for axis in args.axes:
+        qubit_subspace[axis] = slice(0, 2)
+    qubit_subspace = tuple(qubit_subspace)
+
+    target_view = args.target_tensor[qubit_subspace]
+    result = cirq.apply_unitary(
+        base_gate,
+        cirq.ApplyUnitaryArgs(target_view, args.available_buffer[qubit_subspace], args.axes),
+    )
+    if result is not target_view:
+        target_view[...] = result
+    return args.target_tensor
+
+
+@cirq.value_equality
 class SingleQubitGateToQutritGate(cirq.Gate):
     """Wraps a single-qubit gate in a single-qutrit gate
     that applies the same action on the first two levels
@@ -12,7 +35,7 @@ class SingleQubitGateToQutritGate(cirq.Gate):
     """
 
     def __init__(self, gate):
-        self.base_gate = gate
+        self._base_gate = gate
         assert cirq.num_qubits(gate) == 1
         qb_unitary = cirq.unitary(gate)
 
@@ -22,6 +45,16 @@ class SingleQubitGateToQutritGate(cirq.Gate):
         # No effect to |2> state
         qt_unitary[2][2] = 1
         self.qt_unitary = qt_unitary
+        self.qt_unitary.setflags(write=False)
+
+    @classmethod
+    def interned(cls, gate):
+        """Returns the shared wrapper of the given gate, constructing it on first use."""
+        return intern_wrapper(cls, gate)
+
+    @property
+    def base_gate(self):
+        return self._base_gate
 
     def _qid_shape_(self) -> Tuple[int, ...]:
         return (3,)
@@ -29,10 +62,17 @@ class SingleQubitGateToQutritGate(cirq.Gate):
     def _unitary_(self):
         return self.qt_unitary
 
+    def _apply_unitary_(self, args: "cirq.ApplyUnitaryArgs"):
+        return _apply_to_qubit_subspace(self.base_gate, args)
+
+    def _value_equality_values_(self):
+        return self.base_gate
+
     def _circuit_diagram_info_(self, args):
         return "{}(01)".format(str(self.base_gate))
 
 
+@cirq.value_equality
 class TwoQubitGateToQutritGate(cirq.Gate):
     """Wraps a two-qubit gate in a two-qutrit gate
     that applies the same action on the first two levels
@@ -43,7 +83,7 @@ class TwoQubitGateToQutritGate(cirq.Gate):
     """
 
     def __init__(self, gate):
-        self.base_gate = gate
+        self._base_gate = gate
         assert cirq.num_qubits(gate) == 2
         qb_unitary = cirq.unitary(gate)
 
@@ -56,6 +96,16 @@ class TwoQubitGateToQutritGate(cirq.Gate):
         qt_unitary[3:5, 3:5] = qb_unitary[2:4, 2:4]  # {|10>, |11>}{<10|, <11|}
 
         self.qt_unitary = qt_unitary
+        self.qt_unitary.setflags(write=False)
+
+    @classmethod
+    def interned(cls, gate):
+        """Returns the shared wrapper of the given gate, constructing it on first use."""
+        return intern_wrapper(cls, gate)
+
+    @property
+    def base_gate(self):
+        return self._base_gate
 
     def _qid_shape_(self) -> Tuple[int, ...]:
         return (
@@ -66,6 +116,12 @@ class TwoQubitGateToQutritGate(cirq.Gate):
     def _unitary_(self):
         return self.qt_unitary
 
+    def _apply_unitary_(self, args: "cirq.ApplyUnitaryArgs"):
+        return _apply_to_qubit_subspace(self.base_gate, args)
+
+    def _value_equality_values_(self):
+        return self.base_gate
+
     def _circuit_diagram_info_(self, args):
         def wrap_wire_symbol(symbol):
             if symbol == "@":
@@ -15,8 +15,9 @@
 # [ Modified May 2nd, 2022 by Ray Zhang ]
 
 
-from typing import List, Dict, FrozenSet, cast, Any, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union, Any
 import cmath
+import functools
 from cirq.devices import LineQubit, GridQubit
 import cirq.ops
 from pytket.circuit import Circuit, OpType, Qubit, Bit
@@ -26,10 +27,122 @@ from pytket_cirq_extension.conversion_mappings import (
     cirq_pauli,
     _constant_gates,
     _cirq2ops_mapping,
+    _custom_gate_def,
 )
-from pytket.circuit import CustomGateDef, CustomGate
 from ops.to_qubit_wrappers import SingleQutritGateToQubitGate, TwoQutritGateToQubitGate
 
+# Gates of these types at exponent 1 are converted as the constant gate, whatever their global shift
+_normalised_gates = {
+    (cirq_common.HPowGate, 1): cirq_common.H,
+    (cirq_common.CNotPowGate, 1): cirq_common.CNOT,
+    (cirq_pauli._PauliX, 1): cirq_pauli.X,
+    (cirq_pauli._PauliY, 1): cirq_pauli.Y,
+    (cirq_pauli._PauliZ, 1): cirq_pauli.Z,
+}
+# Constant gates are looked up by value, rather than compared against each in turn
+_constant_optypes = {gate: _cirq2ops_mapping[gate] for gate in _constant_gates}
+# Gates with their own tket parameters, including their subclasses
+_parameterised_gates: Dict[type, Tuple[OpType, Callable[[Any], List[Any]]]] = {
+    cirq.ops.PhasedXPowGate: (OpType.PhasedX, lambda gate: [gate.exponent, gate.phase_exponent]),
+    cirq.ops.FSimGate: (OpType.FSim, lambda gate: [gate.theta / pi, gate.phi / pi]),
+    cirq.ops.PhasedISwapPowGate: (
+        OpType.PhasedISWAP,
+        lambda gate: [gate.phase_exponent, gate.exponent],
+    ),
+}
+
+
+def _add_global_phase(tkcirc: Circuit, gate: "cirq.Gate", qb_lst: List[Qubit]):
+    tkcirc.add_phase(cmath.phase(gate.coefficient) / pi)
+
+
+def _add_measurement(tkcirc: Circuit, gate: "cirq.Gate", qb_lst: List[Qubit]):
+    uid = Bit(gate.key)
+    tkcirc.add_bit(uid)
+    tkcirc.Measure(*qb_lst, uid)
+
+
+def _add_custom_gate(tkcirc: Circuit, gate: "cirq.Gate", qb_lst: List[Qubit]):
+    tkcirc.add_custom_gate(_custom_gate_def(gate), [], qb_lst)
+
+
+def _add_parallel_gate(tkcirc: Circuit, gate: "cirq.Gate", qb_lst: List[Qubit]):
+    if gate.num_copies != len(qb_lst):
+        raise NotImplementedError("ParallelGate parameters defined incorrectly.")
+    optype, params = _optype_and_params(gate.sub_gate)
+    for qb in qb_lst:
+        tkcirc.add_gate(optype, params, [qb])
+
+
+# Gates added to the tket circuit by their own function, rather than as an optype
+_direct_conversions = {
+    cirq.ops.global_phase_op.GlobalPhaseGate: _add_global_phase,
+    cirq_common.MeasurementGate: _add_measurement,
+    SingleQutritGateToQubitGate: _add_custom_gate,
+    TwoQutritGateToQubitGate: _add_custom_gate,
+    cirq.ops.ParallelGate: _add_parallel_gate,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _direct_conversion(gatetype: type) -> Optional[Callable]:
+    for cls in gatetype.__mro__:
+        if cls in _direct_conversions:
+            return _direct_conversions[cls]
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _parameterised_conversion(gatetype: type) -> Optional[Tuple[OpType, Callable]]:
+    for cls in gatetype.__mro__:
+        if cls in _parameterised_gates:
+            return _parameterised_gates[cls]
+    # Otherwise rotations of exactly a mapped type, parameterised by their exponent
+    optype = _cirq2ops_mapping.get(gatetype)
+    if optype is None:
+        return None
+    return optype, lambda gate: [gate.exponent]
+
+
+def _optype_and_params(gate: "cirq.Gate") -> Tuple[OpType, List[Union[float, Basic, Symbol]]]:
+    """Finds the tket optype and parameters of a gate added with add_gate.
+
+    :raises NotImplementedError: If the gate has no tket equivalent
+    """
+    try:
+        optype = _constant_optypes.get(gate)
+    except TypeError:
+        # Unhashable gates cannot be constants
+        optype = None
+    if optype is not None:
+        return optype, []
+    conversion = _parameterised_conversion(type(gate))
+    if conversion is not None:
+        optype, get_params = conversion
+        try:
+            return optype, get_params(gate)
+        except AttributeError:
+            pass
+    raise NotImplementedError("Operation not supported by tket: " + str(gate))
+
+
+def tk_qubit(qb: "cirq.Qid") -> Qubit:
+    """Returns the tket qubit that cirq_to_tk converts a Cirq qubit to.
+
+    :param qb: The Cirq qubit
+
+    :raises NotImplementedError: If the qubit's type cannot be converted
+
+    :return: The tket qubit
+    """
+    if isinstance(qb, LineQubit):
+        return Qubit("q", qb.x)
+    if isinstance(qb, GridQubit):
+        return Qubit("g", qb.row, qb.col)
+    if isinstance(qb, cirq.ops.NamedQubit):
+        return Qubit(qb.name)
+    raise NotImplementedError("Cannot convert qubits of type " + str(type(qb)))
+
 
 def cirq_to_tk(circuit: cirq.circuits.Circuit) -> Circuit:
     """Converts a Cirq :py:class:`Circuit` to a tket :py:class:`Circuit` object.
@@ -44,14 +157,7 @@ def cirq_to_tk(circuit: cirq.circuits.Circuit) -> Circuit:
     tkcirc = Circuit()
     qmap = {}
     for qb in circuit.all_qubits():
-        if isinstance(qb, LineQubit):
-            uid = Qubit("q", qb.x)
-        elif isinstance(qb, GridQubit):
-            uid = Qubit("g", qb.row, qb.col)
-        elif isinstance(qb, cirq.ops.NamedQubit):
-            uid = Qubit(qb.name)
-        else:
-            raise NotImplementedError("Cannot convert qubits of type " + str(type(qb)))
+        uid = tk_qubit(qb)
         tkcirc.add_qubit(uid)
         qmap.update({qb: uid})
     for moment in circuit:
@@ -60,75 +166,11 @@ def cirq_to_tk(circuit: cirq.circuits.Circuit) -> Circuit:
             gatetype = type(gate)
             qb_lst = [qmap[q] for q in op.qubits]
 
-            if isinstance(gate, cirq.ops.global_phase_op.GlobalPhaseGate):
-                tkcirc.add_phase(cmath.phase(gate.coefficient) / pi)
-                continue
-            if isinstance(gate, cirq_common.HPowGate) and gate.exponent == 1:
-                gate = cirq_common.H
-            elif (
-                gatetype == cirq_common.CNotPowGate
-                and cast(cirq_common.CNotPowGate, gate).exponent == 1
-            ):
-                gate = cirq_common.CNOT
-            elif gatetype == cirq_pauli._PauliX and cast(cirq_pauli._PauliX, gate).exponent == 1:
-                gate = cirq_pauli.X
-            elif gatetype == cirq_pauli._PauliY and cast(cirq_pauli._PauliY, gate).exponent == 1:
-                gate = cirq_pauli.Y
-            elif gatetype == cirq_pauli._PauliZ and cast(cirq_pauli._PauliZ, gate).exponent == 1:
-                gate = cirq_pauli.Z
-
-            apply_in_parallel = False
-            if isinstance(gate, cirq.ops.ParallelGate):
-                if gate.num_copies != len(qb_lst):
-                    raise NotImplementedError("ParallelGate parameters defined incorrectly.")
-                gate = gate.sub_gate
-                gatetype = type(gate)
-                apply_in_parallel = True
-
-            if gate in _constant_gates:
-                try:
-                    optype = _cirq2ops_mapping[gate]
-                except KeyError as error:
-                    raise NotImplementedError(
-                        "Operation not supported by tket: " + str(op.gate)
-                    ) from error
-                params: List[Union[float, Basic, Symbol]] = []
-            elif isinstance(gate, cirq_common.MeasurementGate):
-                uid = Bit(gate.key)
-                tkcirc.add_bit(uid)
-                tkcirc.Measure(*qb_lst, uid)
-                continue
-            elif isinstance(gate, cirq.ops.PhasedXPowGate):
-                optype = OpType.PhasedX
-                pe = gate.phase_exponent
-                params = [gate.exponent, pe]
-            elif isinstance(gate, cirq.ops.FSimGate):
-                optype = OpType.FSim
-                params = [gate.theta / pi, gate.phi / pi]
-            elif isinstance(gate, cirq.ops.PhasedISwapPowGate):
-                optype = OpType.PhasedISWAP
-                params = [gate.phase_exponent, gate.exponent]
-            elif isinstance(gate, SingleQutritGateToQubitGate):
-                dummy_sub_circ = Circuit()
-                gate_def = CustomGateDef.define(str(gate.base_gate), dummy_sub_circ, [])
-                tkcirc.add_custom_gate(gate_def, [], qb_lst)
-                continue
-            elif isinstance(gate, TwoQutritGateToQubitGate):
-                dummy_sub_circ = Circuit()
-                gate_def = CustomGateDef.define(str(gate.base_gate), dummy_sub_circ, [])
-                tkcirc.add_custom_gate(gate_def, [], qb_lst)
+            convert = _direct_conversion(gatetype)
+            if convert is not None:
+                convert(tkcirc, gate, qb_lst)
                 continue
-            else:
-                try:
-                    optype = _cirq2ops_mapping[gatetype]
-                    params = [cast(Any, gate).exponent]
-                except (KeyError, AttributeError) as error:
-                    raise NotImplementedError(
-                        "Operation not supported by tket: " + str(op.gate)
-                    ) from error
-            if apply_in_parallel:
-                for qb in qb_lst:
-                    tkcirc.add_gate(optype, params, [qb])
-            else:
-                tkcirc.add_gate(optype, params, qb_lst)
+            gate = _normalised_gates.get((gatetype, getattr(gate, "exponent", None)), gate)
+            optype, params = _optype_and_params(gate)
+            tkcirc.add_gate(optype, params, qb_lst)
     return tkcirc
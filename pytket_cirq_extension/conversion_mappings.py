@@ -11,10 +11,14 @@
 # [ Modified May 2nd, 2022 by Ray Zhang ]
 
 
+import hashlib
+import re
+import weakref
+from collections import OrderedDict
 from typing import Dict
 import cirq.ops
 import cirq_google
-from pytket.circuit import OpType
+from pytket.circuit import Circuit, CustomGateDef, OpType
 
 # For translating cirq circuits to tket circuits
 cirq_common = cirq.ops.common_gates
@@ -81,3 +85,53 @@ _rotation_types = (
     cirq.ops.parity_gates.XXPowGate,
     cirq.ops.parity_gates.YYPowGate,
 )
+
+# Wrapped qutrit gates have no tket equivalent, so each distinct one is registered
+# under a name derived from its base gate, and restored from that name. Definitions
+# are cached for as long as the wrapper gate lives. A tket circuit holds only names,
+# so the gates they restore to are held strongly, up to the most recently used few.
+_custom_gate_defs: "weakref.WeakKeyDictionary[cirq.Gate, CustomGateDef]" = (
+    weakref.WeakKeyDictionary()
+)
+_custom_gates_by_name: "OrderedDict[str, cirq.Gate]" = OrderedDict()
+_max_custom_gates = 4096
+
+_object_address = re.compile(r" object at 0x[0-9a-fA-F]+")
+
+
+def _custom_gate_name(gate: "cirq.Gate") -> str:
+    """Names the custom tket gate of a wrapped qutrit gate after its base gate,
+    with a digest of its repr and arity, so the name is the same in every process.
+
+    Object addresses in default reprs differ between processes, so are dropped first.
+    """
+    key = f"{cirq.num_qubits(gate)}:{_object_address.sub('', repr(gate.base_gate))}"
+    label = re.sub(r"\W+", "_", _object_address.sub("", str(gate.base_gate))).strip("_")
+    return f"{label}_{hashlib.sha256(key.encode()).hexdigest()[:12]}"
+
+
+def _custom_gate_def(gate: "cirq.Gate") -> CustomGateDef:
+    """Returns the custom tket gate standing in for a wrapped qutrit gate,
+    defined as the identity like the wrapper itself.
+    """
+    try:
+        gate_def = _custom_gate_defs.get(gate)
+    except TypeError:
+        # Unhashable gates are defined afresh every time
+        gate_def = None
+    if gate_def is None:
+        name = _custom_gate_name(gate)
+        registered = _custom_gates_by_name.get(name)
+        if registered is not None and registered != gate:
+            raise ValueError(f"Custom gate name {name} is taken by {registered!r}, not {gate!r}")
+        gate_def = CustomGateDef.define(name, Circuit(cirq.num_qubits(gate)), [])
+        try:
+            _custom_gate_defs[gate] = gate_def
+        except TypeError:
+            pass
+
+    _custom_gates_by_name[gate_def.name] = gate
+    _custom_gates_by_name.move_to_end(gate_def.name)
+    if len(_custom_gates_by_name) > _max_custom_gates:
+        _custom_gates_by_name.popitem(last=False)
+    return gate_def
@@ -17,34 +17,32 @@
 
 import cmath
 from logging import warning
+from typing import Dict, List
 from cirq.devices import LineQubit, GridQubit
 import cirq.ops
-from pytket.circuit import Circuit, OpType
+from pytket.circuit import Circuit, OpType, Qubit
 from sympy import pi
-from pytket_cirq_extension.conversion_mappings import _ops2cirq_mapping
+from pytket_cirq_extension.conversion_mappings import _custom_gates_by_name, _ops2cirq_mapping
 
 
-def tk_to_cirq(tkcirc: Circuit, copy_all_qubits: bool = False) -> cirq.circuits.Circuit:
-    """Converts a tket :py:class:`Circuit` object to a Cirq :py:class:`Circuit`.
+def cirq_qubit_map(qubits: List[Qubit]) -> Dict[Qubit, "cirq.Qid"]:
+    """Maps tket qubits to the Cirq qubits that tk_to_cirq converts them to.
 
-    :param tkcirc: The input tket :py:class:`Circuit`
+    :param qubits: The tket qubits of one circuit
 
-    :return: The Cirq :py:class:`Circuit` corresponding to the input circuit
-    """
-    if copy_all_qubits:
-        tkcirc = tkcirc.copy()
-        for q in tkcirc.qubits:
-            tkcirc.add_gate(OpType.noop, [q])
+    :raises NotImplementedError: If the qubits' registers cannot be converted
 
+    :return: The Cirq qubit of each tket qubit
+    """
     qmap = {}
     line_name = None
     grid_name = None
     # Since Cirq can only support registers of up to 2 dimensions, we explicitly
     # check for 3-dimensional registers whose third dimension is trivial.
     # SquareGrid architectures are of this form.
-    indices = [qb.index for qb in tkcirc.qubits]
+    indices = [qb.index for qb in qubits]
     is_flat_3d = all(idx[2] == 0 for idx in indices if len(idx) == 3)
-    for qb in tkcirc.qubits:
+    for qb in qubits:
         if len(qb.index) == 0:
             qmap.update({qb: cirq.ops.NamedQubit(qb.reg_name)})
         elif len(qb.index) == 1:
@@ -59,10 +57,50 @@ def tk_to_cirq(tkcirc: Circuit, copy_all_qubits: bool = False) -> cirq.circuits.
             qmap.update({qb: GridQubit(qb.index[0], qb.index[1])})
         else:
             raise NotImplementedError("Cirq can only support registers of dimension <=2")
-    oplst = []
+    return qmap
+
+
+def tk_to_cirq(tkcirc: Circuit, copy_all_qubits: bool = False) -> cirq.circuits.Circuit:
+    """Converts a tket :py:class:`Circuit` object to a Cirq :py:class:`Circuit`.
+
+    :param tkcirc: The input tket :py:class:`Circuit`
+
+    :return: The Cirq :py:class:`Circuit` corresponding to the input circuit
+    """
+    if copy_all_qubits:
+        tkcirc = tkcirc.copy()
+        for q in tkcirc.qubits:
+            tkcirc.add_gate(OpType.noop, [q])
+
+    qmap = cirq_qubit_map(tkcirc.qubits)
+    # Each op goes in the moment after the last one acting on any of its qubits, as with
+    # earliest insertion, but found from a running depth per qubit in tket's command order
+    moments: List[List[cirq.Operation]] = []
+    depth_of: Dict["cirq.Qid", int] = dict()
+
+    def append(cirqop: cirq.Operation):
+        depth = max((depth_of.get(q, 0) for q in cirqop.qubits), default=0)
+        if depth == len(moments):
+            moments.append([])
+        moments[depth].append(cirqop)
+        for q in cirqop.qubits:
+            depth_of[q] = depth + 1
+
     for command in tkcirc:
         op = command.op
         optype = op.type
+        if optype == OpType.CustomGate:
+            try:
+                gate = _custom_gates_by_name[op.gate.name]
+            except KeyError as error:
+                raise NotImplementedError(
+                    "Cannot convert unregistered custom gate to Cirq gate: "
+                    + op.gate.name
+                    + ". Custom gates are only known to the process that converted them"
+                    + " with cirq_to_tk, until enough newer ones have been converted."
+                ) from error
+            append(gate(*[qmap[qbit] for qbit in command.args]))
+            continue
         try:
             gatetype = _ops2cirq_mapping[optype]
         except KeyError as error:
@@ -86,7 +124,7 @@ def tk_to_cirq(tkcirc: Circuit, copy_all_qubits: bool = False) -> cirq.circuits.
                 cirqop = gatetype(phase_exponent=params[0], exponent=params[1])(*qids)
             else:
                 cirqop = gatetype(exponent=params[0])(*qids)
-        oplst.append(cirqop)
+        append(cirqop)
     try:
 
         coeff = cmath.exp(float(tkcirc.phase) * cmath.pi * 1j)
@@ -95,7 +133,7 @@ def tk_to_cirq(tkcirc: Circuit, copy_all_qubits: bool = False) -> cirq.circuits.
         if coeff.imag < 1e-8:
             coeff = coeff.real
         if coeff != 1.0:
-            oplst.append(cirq.global_phase_operation(coeff))
+            append(cirq.global_phase_operation(coeff))
     except ValueError:
         warning("Global phase is dependent on a symbolic parameter, so cannot adjust for " "phase")
-    return cirq.circuits.Circuit(*oplst)
+    return cirq.circuits.Circuit(cirq.Moment(ops) for ops in moments)
@@ -5,9 +5,17 @@ from ops.to_qutrit_wrappers import (
     SingleQubitGateToQutritGate,
     TwoQubitGateToQutritGate,
 )
+from ops.ternary_gates import (
+    QutritPlusGate,
+    OneControlledPlusGate,
+    TwoControlledPlusGate,
+    QutritMinusGate,
+    OneControlledMinusGate,
+    TwoControlledMinusGate,
+)
 from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
-from transformations.pytket_transforms import place_and_route
-
+from transformations.pytket_transforms import place_and_route_with_maps
+from simulation.fidelity import fidelity_against_ideal
 
 # Make unconstrained input circuit
 input_qutrits = [cirq.NamedQid(str(i), dimension=3) for i in range(8)]
@@ -24,12 +32,12 @@ routable_gate_domain = {
     TwoQubitGateToQutritGate(cirq.CZ): 2,
     TwoQubitGateToQutritGate(cirq.SWAP): 2,
     TwoQubitGateToQutritGate(cirq.ISWAP): 2,
-    # QutritPlusGate: 1,
-    # OneControlledPlusGate: 2,
-    # TwoControlledPlusGate: 2,
-    # QutritMinusGate: 1,
-    # OneControlledMinusGate: 2,
-    # TwoControlledMinusGate: 2,
+    QutritPlusGate: 1,
+    OneControlledPlusGate: 2,
+    TwoControlledPlusGate: 2,
+    QutritMinusGate: 1,
+    OneControlledMinusGate: 2,
+    TwoControlledMinusGate: 2,
     # cirq.CZPowGate: 2,  # Somehow causing problems rn
     # cirq.TOFFOLI: 3,  # Not supported by tket
 }
@@ -42,12 +50,16 @@ in_circ = cirq.testing.random_circuit(
 print("Generated circuit:", in_circ)
 
 tk_dev = pytket.architecture.SquareGrid(3, 4)
-placed_circ, out_circ = place_and_route(in_circ, tk_dev)
+placed_circ, out_circ, initial_map, final_map = place_and_route_with_maps(in_circ, tk_dev)
 
 print("Placed circuit:", placed_circ)
 
 print("Routed circuit:", out_circ)
 
+# Routing swaps states between device qutrits, so the reference is laid out
+# where each state ends up rather than where it was placed
+ideal_circ = in_circ.transform_qubits(final_map.__getitem__)
+
 p_1 = 0.001 / 3
 p_2 = 0.01 / 15
 noise_model = GokhaleNoiseModelOnQutrits(
@@ -57,18 +69,7 @@ noise_model = GokhaleNoiseModelOnQutrits(
     lambda_long=300.0 / 10000.0,
 )
 
-ideal_simulator = cirq.DensityMatrixSimulator()
-noisy_simulator = cirq.DensityMatrixSimulator(noise=noise_model)
-
-all_to_all_ideal = ideal_simulator.simulate(placed_circ)
-
-routed_noisy = noisy_simulator.simulate(out_circ)
-
 print(
     "Resulting fidelity: ",
-    cirq.qis.fidelity(
-        all_to_all_ideal.final_density_matrix,
-        routed_noisy.final_density_matrix,
-        (len(all_to_all_ideal.final_density_matrix),),
-    ),
+    fidelity_against_ideal(ideal_circ, out_circ, noise_model),
 )
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import uuid
+from typing import Dict, Iterable, List, Optional, Type
+
+import cirq
+import numpy as np
+
+
+class CheckpointStore:
+    """A directory of density matrices saved partway through simulations,
+    as NPY files memory-mapped on load and named by the key of the circuit prefix.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".npy")
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def load(self, key: str) -> np.ndarray:
+        return np.load(self._path(key), mmap_mode="r")
+
+    def save(self, key: str, density_matrix: np.ndarray):
+        """Writes a checkpoint atomically, so a crash mid-write leaves no checkpoint behind."""
+        temporary_path = os.path.join(self.directory, f"partial-{uuid.uuid4().hex[:8]}.npy")
+        checkpoint = np.lib.format.open_memmap(
+            temporary_path, mode="w+", dtype=density_matrix.dtype, shape=density_matrix.shape
+        )
+        checkpoint[...] = density_matrix
+        checkpoint.flush()
+        del checkpoint
+        os.replace(temporary_path, self._path(key))
+
+
+def _operation_fingerprint(op: "cirq.Operation", gate_fingerprints: Dict[int, bytes]) -> bytes:
+    """Identifies an operation by its qids and the Kraus operators of its gate."""
+    gate = op.gate if op.gate is not None else op
+    fingerprint = gate_fingerprints.get(id(gate))
+    if fingerprint is None:
+        gate_type = type(gate)
+        fingerprint = f"{gate_type.__module__}.{gate_type.__qualname__}".encode()
+        if cirq.has_kraus(gate):
+            kraus_operators = np.stack(cirq.kraus(gate)).astype(np.complex128)
+            fingerprint += hashlib.sha256(kraus_operators.tobytes()).digest()
+        else:
+            fingerprint += repr(gate).encode()
+        gate_fingerprints[id(gate)] = fingerprint
+    return fingerprint + repr(op.qubits).encode()
+
+
+def prefix_keys(
+    noisy_moments: Iterable["cirq.OP_TREE"],
+    qudits: List["cirq.Qid"],
+    dtype: Type[np.complexfloating],
+) -> List[str]:
+    """Hashes each prefix of a circuit with noise already inserted.
+
+    Args:
+        noisy_moments: For each input moment, the operations simulating it with noise.
+        qudits: The ordering of qudits in the simulation.
+        dtype: The precision of the simulation.
+
+    Returns:
+        For each input moment, the key of the state right after it.
+    """
+    structure = hashlib.sha256(repr((qudits, np.dtype(dtype).name)).encode())
+    gate_fingerprints: Dict[int, bytes] = dict()
+    keys = []
+    for noisy_moment in noisy_moments:
+        for op in cirq.flatten_to_ops(noisy_moment):
+            structure.update(_operation_fingerprint(op, gate_fingerprints))
+        # Moment boundaries are part of the structure
+        structure.update(b"|")
+        keys.append(structure.hexdigest())
+    return keys
+
+
+def simulate_with_checkpoints(
+    circuit: cirq.AbstractCircuit,
+    noise: "cirq.NOISE_MODEL_LIKE",
+    store: CheckpointStore,
+    qubit_order: "cirq.QubitOrderOrList" = cirq.QubitOrder.DEFAULT,
+    checkpoint_moments: Iterable[int] = (),
+    dtype: Type[np.complexfloating] = np.complex128,
+) -> np.ndarray:
+    """Simulates a noisy circuit, resuming from the latest checkpoint of any shared prefix.
+
+    Checkpoints are keyed by a structural hash of the circuit prefix with noise
+    inserted, so any circuit and noise model giving the same noisy prefix over the
+    same qudits can resume from it, including a rerun after a crash.
+
+    Args:
+        circuit: The noiseless circuit to simulate.
+        noise: The noise model to simulate with.
+        store: Where checkpoints are kept.
+        qubit_order: Determines the ordering of qudits in the density matrix.
+        checkpoint_moments: The indices of the moments after which to save the
+            density matrix, such as range(0, len(circuit), 10) for a long run.
+        dtype: The precision of the simulation.
+
+    Returns:
+        The final density matrix.
+    """
+    qudits = list(cirq.QubitOrder.as_qubit_order(qubit_order).order_for(circuit.all_qubits()))
+    noise = cirq.NoiseModel.from_noise_model_like(noise)
+    noisy_moments = [cirq.Circuit(moment) for moment in noise.noisy_moments(circuit, qudits)]
+    keys = prefix_keys(noisy_moments, qudits, dtype)
+    checkpoint_moments = set(checkpoint_moments)
+
+    simulator = cirq.DensityMatrixSimulator(dtype=dtype)
+    start = 0
+    density_matrix: Optional[np.ndarray] = None
+    for index in reversed(range(len(keys))):
+        if keys[index] in store:
+            start = index + 1
+            density_matrix = np.array(store.load(keys[index]), dtype=dtype)
+            break
+    if density_matrix is None:
+        density_matrix = simulator.simulate(cirq.Circuit(), qubit_order=qudits).final_density_matrix
+
+    # Moments are simulated in runs between checkpoints, from the latest saved one
+    run_ends = sorted(index for index in checkpoint_moments if start <= index < len(keys))
+    run_ends.append(len(keys) - 1)
+    for end in run_ends:
+        if end < start:
+            continue
+        remainder = cirq.Circuit()
+        for noisy_moment in noisy_moments[start : end + 1]:
+            remainder += noisy_moment
+        density_matrix = simulator.simulate(
+            remainder, qubit_order=qudits, initial_state=density_matrix
+        ).final_density_matrix
+        if end in checkpoint_moments and keys[end] not in store:
+            store.save(keys[end], density_matrix)
+        start = end + 1
+    return density_matrix
@@ -0,0 +1,199 @@
+import itertools
+from typing import Dict, FrozenSet, Optional, Tuple, Type
+
+import cirq
+import numpy as np
+
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+
+
+class _SubspaceChannel(cirq.Gate):
+    """An operation restricted to the levels its demoted qudits can occupy."""
+
+    def __init__(self, qid_shape, kraus_operators, mixture=None):
+        self.qid_shape = qid_shape
+        self.kraus_operators = kraus_operators
+        self.mixture = mixture
+
+    def _qid_shape_(self):
+        return self.qid_shape
+
+    def _has_mixture_(self):
+        return self.mixture is not None
+
+    def _mixture_(self):
+        if self.mixture is None:
+            return NotImplemented
+        return self.mixture
+
+    def _kraus_(self):
+        return self.kraus_operators
+
+    def _circuit_diagram_info_(self, args):
+        return ("Subspace",) * len(self.qid_shape)
+
+
+def _kept_indices(qid_shape: Tuple[int, ...], mask: Tuple[bool, ...]) -> np.ndarray:
+    """Flat indices of the basis states where every demoted qudit is in |0> or |1>."""
+    levels = [range(2) if demoted else range(dim) for dim, demoted in zip(qid_shape, mask)]
+    return np.array(
+        [np.ravel_multi_index(index, qid_shape) for index in itertools.product(*levels)]
+    )
+
+
+def _cached(cache: dict, op: "cirq.Operation", mask: Tuple[bool, ...], compute):
+    """Memoizes per-gate results, recomputing for gates that cannot be hashed."""
+    try:
+        key = (op.gate, mask)
+        if op.gate is not None and key in cache:
+            return cache[key]
+    except TypeError:
+        return compute()
+    result = compute()
+    if op.gate is not None:
+        cache[key] = result
+    return result
+
+
+def _leaking_targets(op: "cirq.Operation", mask: Tuple[bool, ...]) -> Tuple[bool, ...]:
+    """For each demoted target, whether the operation can move it from {|0>, |1>} into |2>,
+    given that every demoted target starts in {|0>, |1>}.
+    """
+    if not cirq.has_kraus(op):
+        # Nothing is known about the action, so it may leak anywhere
+        return mask
+
+    qid_shape = cirq.qid_shape(op)
+    inputs = tuple(slice(0, 2) if demoted else slice(None) for demoted in mask)
+    leaking = [False] * len(mask)
+    for operator in cirq.kraus(op):
+        tensor = operator.reshape(qid_shape * 2)
+        for k, demoted in enumerate(mask):
+            if not demoted or leaking[k]:
+                continue
+            outputs = [slice(None)] * len(mask)
+            outputs[k] = slice(2, None)
+            if not np.allclose(tensor[tuple(outputs) + inputs], 0):
+                leaking[k] = True
+    return tuple(leaking)
+
+
+def never_leaked_qudits(
+    circuit: cirq.AbstractCircuit,
+    noise: Optional["cirq.NoiseModel"] = None,
+    qubit_order: "cirq.QubitOrderOrList" = cirq.QubitOrder.DEFAULT,
+) -> FrozenSet["cirq.Qid"]:
+    """Finds the qutrits that provably never populate |2> under a circuit and noise model.
+
+    Wrapped qubit gates and amplitude dampening never move population up into |2>,
+    while ternary gates and ternary Pauli errors with an X3 component do. A qutrit
+    only counts as never leaked if every operation on it, noise included, keeps it
+    in {|0>, |1>} whenever the other never-leaked qutrits are also in {|0>, |1>},
+    so the analysis is repeated until no more qutrits are ruled out.
+    """
+    qudits = cirq.QubitOrder.as_qubit_order(qubit_order).order_for(circuit.all_qubits())
+    moments = circuit if noise is None else noise.noisy_moments(circuit, qudits)
+    operations = list(cirq.flatten_to_ops(moments))
+
+    never_leaked = {q for q in qudits if q.dimension == 3}
+    leaking_by_gate: Dict[tuple, Tuple[bool, ...]] = dict()
+    changed = True
+    while changed:
+        changed = False
+        for op in operations:
+            mask = tuple(q in never_leaked for q in op.qubits)
+            if not any(mask):
+                continue
+            leaking = _cached(leaking_by_gate, op, mask, lambda: _leaking_targets(op, mask))
+            for q, leaks in zip(op.qubits, leaking):
+                if leaks:
+                    never_leaked.discard(q)
+                    changed = True
+    return frozenset(never_leaked)
+
+
+def as_qubit_dimension(qid: "cirq.Qid") -> "cirq.Qid":
+    """Returns a qid of the same type and location, but of dimension 2."""
+    if isinstance(qid, cirq.LineQid):
+        return cirq.LineQid(qid.x, dimension=2)
+    elif isinstance(qid, cirq.NamedQid):
+        return cirq.NamedQid(qid.name, dimension=2)
+    elif isinstance(qid, cirq.GridQid):
+        return cirq.GridQid(qid.row, qid.col, dimension=2)
+    raise TypeError(f"Cannot demote qids of type {type(qid)}")
+
+
+def demote_qudits(
+    circuit: cirq.AbstractCircuit, demoted: FrozenSet["cirq.Qid"]
+) -> Tuple[cirq.Circuit, Dict["cirq.Qid", "cirq.Qid"]]:
+    """Rewrites a circuit so the given never-leaked qutrits are simulated as qubits.
+
+    Every operation is restricted to the {|0>, |1>} levels of its demoted targets.
+    Wrapped qubit gates acting only on demoted qutrits are unwrapped back to their
+    base gates, and all other operations become dense restricted channels.
+
+    Returns:
+        The rewritten circuit and the map from original qids to the ones it acts on.
+    """
+    qid_map = {q: as_qubit_dimension(q) if q in demoted else q for q in circuit.all_qubits()}
+    restricted_by_gate: Dict[tuple, "cirq.Gate"] = dict()
+
+    def restrict(op):
+        mask = tuple(q in demoted for q in op.qubits)
+        new_qubits = [qid_map[q] for q in op.qubits]
+        if not any(mask):
+            return op
+        if all(mask) and isinstance(
+            op.gate, (SingleQubitGateToQutritGate, TwoQubitGateToQutritGate)
+        ):
+            return op.gate.base_gate.on(*new_qubits)
+
+        gate = _cached(restricted_by_gate, op, mask, lambda: _restricted_gate(op, mask))
+        return gate.on(*new_qubits)
+
+    return (
+        cirq.Circuit(cirq.Moment(restrict(op) for op in moment) for moment in circuit),
+        qid_map,
+    )
+
+
+def _restricted_gate(op: "cirq.Operation", mask: Tuple[bool, ...]) -> "cirq.Gate":
+    """Restricts an operation to the {|0>, |1>} levels of its demoted targets."""
+    qid_shape = cirq.qid_shape(op)
+    new_shape = tuple(2 if d else dim for dim, d in zip(qid_shape, mask))
+    kept = np.ix_(*[_kept_indices(qid_shape, mask)] * 2)
+    if cirq.has_unitary(op):
+        gate = cirq.MatrixGate(cirq.unitary(op)[kept], qid_shape=new_shape)
+    else:
+        mixture = None
+        if cirq.has_mixture(op):
+            mixture = tuple((p, u[kept]) for p, u in cirq.mixture(op))
+        kraus_operators = tuple(k[kept] for k in cirq.kraus(op))
+        gate = _SubspaceChannel(new_shape, kraus_operators, mixture)
+    return gate
+
+
+def simulate_mixed_dimension(
+    circuit: cirq.AbstractCircuit,
+    noise: Optional["cirq.NoiseModel"] = None,
+    qubit_order: "cirq.QubitOrderOrList" = cirq.QubitOrder.DEFAULT,
+    dtype: Type[np.complexfloating] = np.complex128,
+) -> Tuple["cirq.DensityMatrixTrialResult", Dict["cirq.Qid", "cirq.Qid"]]:
+    """Simulates a noisy circuit with never-leaked qutrits simulated in dimension 2.
+
+    Each demoted qutrit shrinks the density matrix by a factor of 2.25.
+
+    Returns:
+        The density matrix simulation result, and the map from original qids to
+        the ones simulated, in the same order as the given qubit_order.
+    """
+    qudits = cirq.QubitOrder.as_qubit_order(qubit_order).order_for(circuit.all_qubits())
+    moments = circuit if noise is None else noise.noisy_moments(circuit, qudits)
+    noisy_circuit = cirq.Circuit(moments)
+    demoted = never_leaked_qudits(noisy_circuit, qubit_order=qudits)
+    noisy_circuit, qid_map = demote_qudits(noisy_circuit, demoted)
+    qid_map = {q: qid_map.get(q, as_qubit_dimension(q) if q in demoted else q) for q in qudits}
+
+    simulator = cirq.DensityMatrixSimulator(dtype=dtype)
+    result = simulator.simulate(noisy_circuit, qubit_order=[qid_map[q] for q in qudits])
+    return result, qid_map
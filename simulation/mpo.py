@@ -0,0 +1,227 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import cirq
+import numpy as np
+
+
+@dataclass
+class MPOResult:
+    """Fidelity of a noisy circuit against an ideal one, simulated as tensor trains.
+
+    Attributes:
+        fidelity: <psi|rho|psi> / (<psi|psi> Tr(rho)), for the ideal state as a
+            matrix product state and the noisy density matrix as a matrix product operator.
+        truncation_error: The summed relative weight, in Frobenius norm,
+            of singular values discarded from the noisy density matrix.
+        ideal_truncation_error: The same for the ideal state.
+        max_bond_dimension: The largest bond dimension reached by the density matrix.
+    """
+
+    fidelity: float
+    truncation_error: float
+    ideal_truncation_error: float
+    max_bond_dimension: int
+
+
+class _TensorTrain:
+    """A chain of site tensors (left bond, physical, right bond) kept in mixed canonical form,
+    so that truncating singular values at the orthogonality center is optimal.
+
+    A state vector has physical dimension d, and a density matrix is vectorized
+    per site into (ket, bra) pairs of physical dimension d^2.
+    """
+
+    def __init__(self, physical_dims: Sequence[int], max_bond_dimension: int, cutoff: float):
+        self.sites = []
+        for dim in physical_dims:
+            site = np.zeros((1, dim, 1), dtype=np.complex128)
+            site[0, 0, 0] = 1
+            self.sites.append(site)
+        self.center = 0
+        self.max_bond_dimension = max_bond_dimension
+        self.cutoff = cutoff
+        self.truncation_error = 0.0
+        self.largest_bond = 1
+
+    def _move_center(self, target: int):
+        while self.center < target:
+            site = self.sites[self.center]
+            left, dim, _ = site.shape
+            q, r = np.linalg.qr(site.reshape(left * dim, -1))
+            self.sites[self.center] = q.reshape(left, dim, -1)
+            self.sites[self.center + 1] = np.tensordot(r, self.sites[self.center + 1], axes=1)
+            self.center += 1
+        while self.center > target:
+            site = self.sites[self.center]
+            _, dim, right = site.shape
+            q, r = np.linalg.qr(site.reshape(-1, dim * right).T)
+            self.sites[self.center] = q.T.reshape(-1, dim, right)
+            self.sites[self.center - 1] = np.tensordot(self.sites[self.center - 1], r.T, axes=1)
+            self.center -= 1
+
+    def apply_one(self, matrix: np.ndarray, site_index: int):
+        self._move_center(site_index)
+        self.sites[site_index] = np.einsum("ts,asb->atb", matrix, self.sites[site_index])
+
+    def apply_two(
+        self,
+        matrix: np.ndarray,
+        site_index: int,
+        out_dims: Optional[Tuple[int, int]] = None,
+    ):
+        """Applies a matrix over the physical indices of sites site_index and site_index + 1,
+        then splits them apart again with a truncated SVD.
+
+        The two sites keep their physical dimensions, unless out_dims gives new ones,
+        as when exchanging sites of different dimension.
+        """
+        self._move_center(site_index)
+        first, second = self.sites[site_index], self.sites[site_index + 1]
+        left, dim_a, _ = first.shape
+        _, dim_b, right = second.shape
+        theta = np.tensordot(first, second, axes=1).reshape(left, dim_a * dim_b, right)
+        theta = np.einsum("ts,asb->atb", matrix, theta)
+        if out_dims is not None:
+            dim_a, dim_b = out_dims
+
+        u, s, vh = np.linalg.svd(theta.reshape(left * dim_a, dim_b * right), full_matrices=False)
+        weights = s**2
+        total_weight = np.sum(weights)
+        keep = max(1, min(self.max_bond_dimension, int(np.sum(s > self.cutoff * s[0]))))
+        if total_weight > 0:
+            self.truncation_error += float(np.sum(weights[keep:]) / total_weight)
+        self.largest_bond = max(self.largest_bond, keep)
+
+        self.sites[site_index] = u[:, :keep].reshape(left, dim_a, keep)
+        self.sites[site_index + 1] = (s[:keep, None] * vh[:keep]).reshape(keep, dim_b, right)
+        self.center = site_index + 1
+
+
+def _superoperator(op: "cirq.Operation") -> np.ndarray:
+    """The action of an operation on a density matrix, over per-site (ket, bra) pairs."""
+    qid_shape = cirq.qid_shape(op)
+    num_qudits = len(qid_shape)
+    superoperator = 0
+    for k in cirq.kraus(op):
+        k = k.reshape(qid_shape * 2)
+        superoperator = superoperator + np.einsum(
+            k, list(range(2 * num_qudits)), np.conj(k), list(range(2 * num_qudits, 4 * num_qudits))
+        )
+    # Reorder (ket out..., ket in..., bra out..., bra in...) into per-site pairs
+    out_axes = [axis for k in range(num_qudits) for axis in (k, 2 * num_qudits + k)]
+    in_axes = [axis for k in range(num_qudits) for axis in (num_qudits + k, 3 * num_qudits + k)]
+    dim = int(np.prod(qid_shape)) ** 2
+    return np.transpose(superoperator, out_axes + in_axes).reshape(dim, dim)
+
+
+def _qutrit_swap(dim_a: int, dim_b: int) -> np.ndarray:
+    """Exchanges the physical indices of two neighbouring sites."""
+    swap = np.zeros((dim_b, dim_a, dim_a, dim_b))
+    for a in range(dim_a):
+        for b in range(dim_b):
+            swap[b, a, a, b] = 1
+    return swap.reshape(dim_a * dim_b, dim_a * dim_b)
+
+
+def _apply_operations(
+    train: _TensorTrain,
+    operations: Sequence["cirq.Operation"],
+    site_of: Dict["cirq.Qid", int],
+    matrix_of,
+):
+    """Applies operations to a tensor train, swapping distant sites next to each other."""
+    matrices: Dict[int, np.ndarray] = dict()
+    for op in operations:
+        gate = op.gate if op.gate is not None else op
+        matrix = matrices.get(id(gate))
+        if matrix is None:
+            matrix = matrices[id(gate)] = matrix_of(op)
+
+        sites = [site_of[q] for q in op.qubits]
+        if len(sites) == 1:
+            train.apply_one(matrix, sites[0])
+            continue
+        if len(sites) != 2:
+            raise ValueError(f"Only one and two-qutrit operations can be simulated: {op!r}")
+
+        # Move the second site next to the first, keeping the physical index order of the op.
+        # Sites may differ in dimension, so each swap reads the dimensions it exchanges.
+        first, second = sites
+        step = 1 if second > first else -1
+        for k in range(second, first + step, -step):
+            _swap_sites(train, min(k, k - step))
+        adjacent = first + step
+        if step == 1:
+            train.apply_two(matrix, first)
+        else:
+            # Sites are in reverse order, so the matrix's physical indices are swapped too
+            swap = _qutrit_swap(train.sites[adjacent].shape[1], train.sites[first].shape[1])
+            train.apply_two(swap.T @ matrix @ swap, adjacent)
+        for k in range(first + 2 * step, second + step, step):
+            _swap_sites(train, min(k, k - step))
+
+
+def _swap_sites(train: _TensorTrain, low: int):
+    """Exchanges the physical indices of sites low and low + 1."""
+    dim_a, dim_b = train.sites[low].shape[1], train.sites[low + 1].shape[1]
+    train.apply_two(_qutrit_swap(dim_a, dim_b), low, out_dims=(dim_b, dim_a))
+
+
+def mpo_fidelity_against_ideal(
+    ideal_circuit: cirq.AbstractCircuit,
+    noisy_circuit: cirq.AbstractCircuit,
+    noise: "cirq.NOISE_MODEL_LIKE",
+    qubit_order: Optional["cirq.QubitOrderOrList"] = None,
+    max_bond_dimension: int = 64,
+    cutoff: float = 1e-12,
+) -> MPOResult:
+    """Compares a noisy simulation of one circuit to the noiseless result of another,
+    with the density matrix as a matrix product operator of bounded bond dimension.
+
+    Qudits are laid out along a chain in qubit_order, so circuits routed onto a line,
+    or onto a grid with qudits ordered row by row, stay close to nearest-neighbour.
+    Operations between distant sites are applied by swapping them together and back.
+
+    Args:
+        ideal_circuit: The circuit whose noiseless result is the reference.
+        noisy_circuit: The circuit to simulate with noise.
+        noise: The noise model to simulate noisy_circuit with.
+        qubit_order: The order of qudits along the chain.
+            Defaults to all qudits of both circuits, sorted.
+        max_bond_dimension: The most singular values kept at each bond.
+        cutoff: Singular values below this fraction of the largest are discarded.
+    """
+    if qubit_order is None:
+        qubit_order = sorted(ideal_circuit.all_qubits() | noisy_circuit.all_qubits())
+    qudits = cirq.QubitOrder.as_qubit_order(qubit_order).order_for(
+        ideal_circuit.all_qubits() | noisy_circuit.all_qubits()
+    )
+    site_of = {q: i for i, q in enumerate(qudits)}
+    qid_shape = cirq.qid_shape(qudits)
+
+    ideal = _TensorTrain(qid_shape, max_bond_dimension, cutoff)
+    _apply_operations(ideal, list(ideal_circuit.all_operations()), site_of, cirq.unitary)
+
+    noise = cirq.NoiseModel.from_noise_model_like(noise)
+    noisy_operations = list(cirq.flatten_to_ops(noise.noisy_moments(noisy_circuit, qudits)))
+    noisy = _TensorTrain([dim**2 for dim in qid_shape], max_bond_dimension, cutoff)
+    _apply_operations(noisy, noisy_operations, site_of, _superoperator)
+
+    # Contract <psi|rho|psi>, Tr(rho) and <psi|psi> site by site
+    overlap = np.ones((1, 1, 1), dtype=np.complex128)
+    trace = np.ones((1,), dtype=np.complex128)
+    norm = np.ones((1, 1), dtype=np.complex128)
+    for psi, rho, dim in zip(ideal.sites, noisy.sites, qid_shape):
+        rho = rho.reshape(rho.shape[0], dim, dim, rho.shape[2])
+        overlap = np.einsum("ace,asb,csSd,eSf->bdf", overlap, np.conj(psi), rho, psi)
+        trace = np.einsum("c,cssd->d", trace, rho)
+        norm = np.einsum("ae,asb,esf->bf", norm, np.conj(psi), psi)
+    fidelity = overlap[0, 0, 0] / (trace[0] * norm[0, 0])
+
+    return MPOResult(
+        fidelity=float(np.real(fidelity)),
+        truncation_error=noisy.truncation_error,
+        ideal_truncation_error=ideal.truncation_error,
+        max_bond_dimension=noisy.largest_bond,
+    )
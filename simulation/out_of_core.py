@@ -0,0 +1,149 @@
+import itertools
+from typing import List, Sequence, Type
+
+import cirq
+import numpy as np
+
+# Blocks are kept well inside a typical page cache, so each is read from disk once per sweep
+DEFAULT_CHUNK_BYTES = 64 * 2**20
+
+
+def _fuse_operations(
+    operations: Sequence["cirq.Operation"], max_fused_qudits: int
+) -> List[List["cirq.Operation"]]:
+    """Groups consecutive operations acting on few enough qudits to share one sweep."""
+    groups: List[List["cirq.Operation"]] = []
+    group_qudits = set()
+    for op in operations:
+        qudits = group_qudits | set(op.qubits)
+        if groups and len(qudits) <= max_fused_qudits:
+            groups[-1].append(op)
+            group_qudits = qudits
+        else:
+            groups.append([op])
+            group_qudits = set(op.qubits)
+    return groups
+
+
+def _apply_in_block(
+    operations: Sequence["cirq.Operation"], block: np.ndarray, axis_of: dict
+) -> np.ndarray:
+    """Applies operations to a block of the density matrix holding all of their target axes."""
+    buffers = [np.empty_like(block) for _ in range(3)]
+    for op in operations:
+        left_axes = [axis_of[q][0] for q in op.qubits]
+        right_axes = [axis_of[q][1] for q in op.qubits]
+        # Gates are applied directly, as operations don't forward _apply_channel_
+        result = cirq.apply_channel(
+            op.gate if op.gate is not None else op,
+            cirq.ApplyChannelArgs(
+                target_tensor=block,
+                out_buffer=buffers[0],
+                auxiliary_buffer0=buffers[1],
+                auxiliary_buffer1=buffers[2],
+                left_axes=left_axes,
+                right_axes=right_axes,
+            ),
+        )
+        if result is not block:
+            # Recycle the previous block as a buffer
+            for i, buffer in enumerate(buffers):
+                if buffer is result:
+                    buffers[i] = block
+                    break
+            else:
+                buffers[0] = block
+            block = result
+    return block
+
+
+def _sweep(
+    tensor: np.ndarray,
+    operations: Sequence["cirq.Operation"],
+    qudit_axes: dict,
+    chunk_bytes: int,
+):
+    """Applies operations to a memory-mapped density matrix tensor, one block at a time.
+
+    Operations only mix entries sharing the same indices along their non-target axes,
+    so non-target axes are fixed, leading axes first, until a block fits in chunk_bytes.
+    Each block is then read into memory, evolved and written back in place.
+    """
+    target_axes = set()
+    for op in operations:
+        for q in op.qubits:
+            target_axes.update(qudit_axes[q])
+
+    fixed_axes = []
+    block_bytes = tensor.nbytes
+    for axis in range(tensor.ndim):
+        if block_bytes <= chunk_bytes:
+            break
+        if axis not in target_axes:
+            fixed_axes.append(axis)
+            block_bytes //= tensor.shape[axis]
+
+    # Where each qudit's axes end up once the fixed axes are indexed away
+    block_axis = dict()
+    for axis in range(tensor.ndim):
+        if axis not in fixed_axes:
+            block_axis[axis] = len(block_axis)
+    axis_of = {
+        q: tuple(block_axis[axis] for axis in qudit_axes[q]) for op in operations for q in op.qubits
+    }
+
+    for values in itertools.product(*(range(tensor.shape[axis]) for axis in fixed_axes)):
+        index = [slice(None)] * tensor.ndim
+        for axis, value in zip(fixed_axes, values):
+            index[axis] = value
+        index = tuple(index)
+        block = np.array(tensor[index])
+        tensor[index] = _apply_in_block(operations, block, axis_of)
+
+
+def simulate_out_of_core(
+    circuit: cirq.AbstractCircuit,
+    noise: "cirq.NOISE_MODEL_LIKE",
+    path: str,
+    qubit_order: "cirq.QubitOrderOrList" = cirq.QubitOrder.DEFAULT,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    max_fused_qudits: int = 4,
+    dtype: Type[np.complexfloating] = np.complex128,
+) -> np.memmap:
+    """Simulates a noisy circuit with the density matrix kept in a memory-mapped NPY file,
+    for systems whose density matrix does not fit in memory.
+
+    Every operation, including QutritMixtureChannel and QutritKrausChannel noise,
+    is applied through its usual channel protocol to blocks along its non-target
+    axes, so memory use is bounded by chunk_bytes rather than the density matrix.
+
+    Args:
+        circuit: The noiseless circuit to simulate.
+        noise: The noise model to simulate with.
+        path: The NPY file to hold the density matrix, which is overwritten.
+        qubit_order: Determines the ordering of qudits in the density matrix.
+        chunk_bytes: The most bytes of the density matrix to hold in memory at once,
+            which should fit comfortably within the page cache.
+        max_fused_qudits: Consecutive operations acting on at most this many
+            qudits between them are applied in the same sweep over the file.
+        dtype: The precision of the density matrix.
+
+    Returns:
+        The final density matrix, memory-mapped from path.
+    """
+    qudits = cirq.QubitOrder.as_qubit_order(qubit_order).order_for(circuit.all_qubits())
+    qid_shape = cirq.qid_shape(qudits)
+    num_qudits = len(qudits)
+    qudit_axes = {q: (i, i + num_qudits) for i, q in enumerate(qudits)}
+
+    tensor = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=qid_shape * 2)
+    tensor[(0,) * (2 * num_qudits)] = 1
+
+    noise = cirq.NoiseModel.from_noise_model_like(noise)
+    operations = list(cirq.flatten_to_ops(noise.noisy_moments(circuit, qudits)))
+    for group in _fuse_operations(operations, max_fused_qudits):
+        _sweep(tensor, group, qudit_axes, chunk_bytes)
+    tensor.flush()
+
+    dim = int(np.prod(qid_shape, dtype=np.int64))
+    return tensor.reshape(dim, dim)
@@ -0,0 +1,194 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import cirq
+import numpy as np
+
+from simulation.out_of_core import DEFAULT_CHUNK_BYTES, _fuse_operations, _sweep
+
+# The density matrix tensor each worker process attaches to,
+# and the phases of operations it applies, received once at startup
+_shared_tensor: Optional[np.ndarray] = None
+_shared_block: Optional[shared_memory.SharedMemory] = None
+_phases: List[tuple] = []
+_chunk_bytes: int = DEFAULT_CHUNK_BYTES
+
+
+def _attach_shared_tensor(
+    name: str, shape: Tuple[int, ...], dtype, phases: List[tuple], chunk_bytes: int
+):
+    global _shared_tensor, _shared_block, _phases, _chunk_bytes
+    _shared_block = shared_memory.SharedMemory(name=name)
+    _shared_tensor = np.ndarray(shape, dtype=dtype, buffer=_shared_block.buf)
+    _phases = phases
+    _chunk_bytes = chunk_bytes
+
+
+def _shard_axes(
+    tensor_shape: Tuple[int, ...], target_axes: set, processes: int
+) -> Tuple[List[int], Dict[int, int]]:
+    """Picks the leading non-target axes to shard over, enough for every process,
+    and maps each remaining axis to its position within a shard.
+    """
+    shard_axes = []
+    num_shards = 1
+    for axis in range(len(tensor_shape)):
+        if num_shards >= processes:
+            break
+        if axis not in target_axes:
+            shard_axes.append(axis)
+            num_shards *= tensor_shape[axis]
+    shard_axis_of = dict()
+    for axis in range(len(tensor_shape)):
+        if axis not in shard_axes:
+            shard_axis_of[axis] = len(shard_axis_of)
+    return shard_axes, shard_axis_of
+
+
+def _plan_phases(
+    groups: Sequence[Sequence["cirq.Operation"]],
+    qudit_axes: Dict["cirq.Qid", Tuple[int, int]],
+    tensor_shape: Tuple[int, ...],
+    processes: int,
+) -> List[tuple]:
+    """Splits fused groups into phases, each applied over one set of shards.
+
+    Groups leaving the shard axes untouched never mix entries of different shards,
+    so consecutive groups share a phase, with no synchronization between them,
+    for as long as enough other axes remain to give every process a shard.
+
+    Returns:
+        A list of (groups, shard_axes, shard_qudit_axes) per phase.
+    """
+    phases = []
+    phase_groups: List[Sequence["cirq.Operation"]] = []
+    phase_axes: set = set()
+    for group in groups:
+        group_axes = {axis for op in group for q in op.qubits for axis in qudit_axes[q]}
+        shard_axes, _ = _shard_axes(tensor_shape, phase_axes | group_axes, processes)
+        num_shards = int(np.prod([tensor_shape[axis] for axis in shard_axes]))
+        if phase_groups and num_shards < processes:
+            phases.append(phase_groups)
+            phase_groups, phase_axes = [], set()
+        phase_groups.append(group)
+        phase_axes |= group_axes
+    if phase_groups:
+        phases.append(phase_groups)
+
+    planned = []
+    for phase_groups in phases:
+        target_axes = {
+            axis
+            for group in phase_groups
+            for op in group
+            for q in op.qubits
+            for axis in qudit_axes[q]
+        }
+        shard_axes, shard_axis_of = _shard_axes(tensor_shape, target_axes, processes)
+        shard_qudit_axes = {
+            q: tuple(shard_axis_of[axis] for axis in qudit_axes[q])
+            for group in phase_groups
+            for op in group
+            for q in op.qubits
+        }
+        planned.append((phase_groups, shard_axes, shard_qudit_axes))
+    return planned
+
+
+def _apply_phase(phase_index: int, worker_index: int, num_workers: int):
+    """Applies every group of a phase to this worker's share of its shards."""
+    groups, shard_axes, shard_qudit_axes = _phases[phase_index]
+    shard_indices = itertools.product(*(range(_shared_tensor.shape[axis]) for axis in shard_axes))
+    for shard_index in itertools.islice(shard_indices, worker_index, None, num_workers):
+        index = [slice(None)] * _shared_tensor.ndim
+        for axis, value in zip(shard_axes, shard_index):
+            index[axis] = value
+        shard = _shared_tensor[tuple(index)]
+        for group in groups:
+            _sweep(shard, group, shard_qudit_axes, _chunk_bytes)
+
+
+def simulate_shared_memory(
+    circuit: cirq.AbstractCircuit,
+    noise: "cirq.NOISE_MODEL_LIKE",
+    qubit_order: "cirq.QubitOrderOrList" = cirq.QubitOrder.DEFAULT,
+    processes: Optional[int] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    max_fused_qudits: int = 4,
+    dtype: Type[np.complexfloating] = np.complex128,
+) -> np.ndarray:
+    """Simulates a noisy circuit with the density matrix shared between worker processes.
+
+    The density matrix tensor lives in shared memory, and each operation is applied
+    in parallel over shards along the leading qutrit axes it does not act on.
+    Shards are chosen per phase of consecutive operations, so operations on the leading
+    qutrits are sharded along the next ones instead, and no data has to be exchanged.
+    Workers receive every operation once at startup, and only synchronize between phases.
+
+    Args:
+        circuit: The noiseless circuit to simulate.
+        noise: The noise model to simulate with.
+        qubit_order: Determines the ordering of qudits in the density matrix.
+        processes: The number of worker processes. Defaults to the number of CPUs,
+            and runs in-process if 1.
+        chunk_bytes: The most bytes of a shard each worker holds a copy of at once.
+        max_fused_qudits: Consecutive operations acting on at most this many
+            qudits between them are applied together.
+        dtype: The precision of the density matrix.
+
+    Returns:
+        The final density matrix.
+    """
+    qudits = cirq.QubitOrder.as_qubit_order(qubit_order).order_for(circuit.all_qubits())
+    qid_shape = cirq.qid_shape(qudits)
+    num_qudits = len(qudits)
+    qudit_axes = {q: (i, i + num_qudits) for i, q in enumerate(qudits)}
+    tensor_shape = qid_shape * 2
+    dim = int(np.prod(qid_shape, dtype=np.int64))
+
+    noise = cirq.NoiseModel.from_noise_model_like(noise)
+    operations = list(cirq.flatten_to_ops(noise.noisy_moments(circuit, qudits)))
+    groups = _fuse_operations(operations, max_fused_qudits)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes == 1:
+        tensor = np.zeros(tensor_shape, dtype=dtype)
+        tensor[(0,) * len(tensor_shape)] = 1
+        for group in groups:
+            _sweep(tensor, group, qudit_axes, chunk_bytes)
+        return tensor.reshape(dim, dim)
+
+    block = shared_memory.SharedMemory(create=True, size=dim * dim * np.dtype(dtype).itemsize)
+    try:
+        tensor = np.ndarray(tensor_shape, dtype=dtype, buffer=block.buf)
+        tensor[...] = 0
+        tensor[(0,) * len(tensor_shape)] = 1
+
+        # Operations go to each worker once, and tasks only name a phase and a share of it
+        phases = _plan_phases(groups, qudit_axes, tensor_shape, processes)
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_attach_shared_tensor,
+            initargs=(block.name, tensor_shape, dtype, phases, chunk_bytes),
+        ) as executor:
+            for phase_index, (_, shard_axes, _) in enumerate(phases):
+                num_shards = int(np.prod([tensor_shape[axis] for axis in shard_axes]))
+                num_workers = min(processes, num_shards)
+                # All shares finish before the next phase
+                futures = [
+                    executor.submit(_apply_phase, phase_index, i, num_workers)
+                    for i in range(num_workers)
+                ]
+                for future in futures:
+                    future.result()
+
+        density_matrix = tensor.reshape(dim, dim).copy()
+        del tensor
+    finally:
+        block.close()
+        block.unlink()
+    return density_matrix
@@ -0,0 +1,269 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cirq
+import numpy as np
+
+from ops.pauli_operators import X3, Z3, weyl_heisenberg_indices
+
+# Tableau rows are ternary Paulis w^s W(x, z), with W(x, z) = tau^(x.z) X3^x Z3^z for
+# w = e^(-2 pi i / 3) and tau = w^2 its square root. Then W(u) W(v) = tau^[u, v] W(u + v)
+# for the symplectic form [u, v] = u_z.v_x - u_x.v_z, W(v)^p = W(p v), and every
+# Clifford maps W(v) to w^(c.v) W(S v) for a symplectic S and a phase vector c.
+_omega = np.exp(-2j * np.pi / 3)
+
+
+def _pauli_matrix(shifts: Sequence[int], phases: Sequence[int]) -> np.ndarray:
+    matrix = np.eye(1)
+    for a, b in zip(shifts, phases):
+        matrix = np.kron(
+            matrix, np.linalg.matrix_power(X3, int(a)) @ np.linalg.matrix_power(Z3, int(b))
+        )
+    return matrix
+
+
+def _symplectic_products(rows: np.ndarray, other: np.ndarray) -> np.ndarray:
+    """[u, v] for each row u against v, or each pair of rows, as (x..., z...) vectors."""
+    num_qutrits = rows.shape[-1] // 2
+    x, z = rows[..., :num_qutrits], rows[..., num_qutrits:]
+    other_x, other_z = other[..., :num_qutrits], other[..., num_qutrits:]
+    return np.sum(z * other_x - x * other_z, axis=-1) % 3
+
+
+def clifford_action(unitary: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Finds how a qutrit unitary acts on ternary Paulis by conjugation.
+
+    Args:
+        unitary: A unitary over one or more qutrits.
+
+    Returns:
+        The symplectic matrix S and phase vector c, both mod 3, such that the unitary
+        maps W(v) to w^(c.v) W(S v) for v = (x..., z...), or None if it is not a Clifford.
+    """
+    num_qutrits = int(round(np.log(unitary.shape[0]) / np.log(3)))
+    symplectic = np.zeros((2 * num_qutrits, 2 * num_qutrits), dtype=np.int64)
+    phases = np.zeros(2 * num_qutrits, dtype=np.int64)
+    # X3 and Z3 on each qutrit are W of the basis vectors, so their images fix S and c
+    for j in range(2 * num_qutrits):
+        basis = np.zeros(2 * num_qutrits, dtype=np.int64)
+        basis[j] = 1
+        pauli = _pauli_matrix(basis[:num_qutrits], basis[num_qutrits:])
+        conjugated = unitary @ pauli @ np.conj(unitary.T)
+        weyl_indices = weyl_heisenberg_indices(conjugated)
+        if weyl_indices is None:
+            return None
+        shifts, pauli_phases = weyl_indices
+
+        # X3^x Z3^z maps |0...0> to |x> with amplitude 1
+        ratio = conjugated[np.ravel_multi_index(shifts, (3,) * num_qutrits), 0]
+        exponent = int(np.round(np.angle(ratio) / np.angle(_omega))) % 3
+        if not np.isclose(ratio, _omega**exponent):
+            return None
+        # X3^x Z3^z = tau^(-x.z) W(x, z) = w^(-2 x.z) W(x, z)
+        phases[j] = (exponent - 2 * np.dot(shifts, pauli_phases)) % 3
+        symplectic[:, j] = shifts + pauli_phases
+    return symplectic, phases
+
+
+def pauli_twirl(kraus_operators: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Approximates a channel by the Pauli channel of its twirl over ternary Paulis.
+
+    Returns:
+        The probability of each Pauli W(v), and the vectors v = (x..., z...) as rows.
+    """
+    num_qutrits = int(round(np.log(kraus_operators[0].shape[0]) / np.log(3)))
+    dim = 3**num_qutrits
+    vectors = np.array(list(np.ndindex(*(3,) * (2 * num_qutrits))), dtype=np.int64)
+    probabilities = np.zeros(len(vectors))
+    for i, vector in enumerate(vectors):
+        pauli = _pauli_matrix(vector[:num_qutrits], vector[num_qutrits:])
+        probabilities[i] = sum(
+            np.abs(np.trace(np.conj(pauli.T) @ k)) ** 2 for k in kraus_operators
+        ) / (dim**2)
+    return probabilities, vectors
+
+
+class QutritTableau:
+    """A stabilizer state over qutrits, as a tableau over Z3.
+
+    Rows 0 to n - 1 are destabilizers and rows n to 2n - 1 stabilizers, with
+    [stabilizer i, destabilizer i] = 1 and every other pair commuting, so that
+    deterministic measurements take O(n^2) time, as in Aaronson and Gottesman.
+    Only stabilizer phases are tracked, as destabilizer phases never matter.
+    """
+
+    def __init__(self, num_qutrits: int):
+        self.num_qutrits = num_qutrits
+        self.paulis = np.zeros((2 * num_qutrits, 2 * num_qutrits), dtype=np.int64)
+        # Starting in |0...0>, stabilized by each Z3 and destabilized by each X3
+        self.paulis[:num_qutrits, :num_qutrits] = np.eye(num_qutrits, dtype=np.int64)
+        self.paulis[num_qutrits:, num_qutrits:] = np.eye(num_qutrits, dtype=np.int64)
+        self.phases = np.zeros(2 * num_qutrits, dtype=np.int64)
+
+    def apply_clifford(
+        self, symplectic: np.ndarray, phases: np.ndarray, qutrit_indices: Sequence[int]
+    ):
+        """Conjugates every row by a Clifford, given by its clifford_action on some qutrits."""
+        columns = list(qutrit_indices) + [self.num_qutrits + i for i in qutrit_indices]
+        restricted = self.paulis[:, columns]
+        self.phases = (self.phases + restricted @ phases) % 3
+        self.paulis[:, columns] = (restricted @ symplectic.T) % 3
+
+    def _multiply_rows(self, targets: np.ndarray, source: int, powers: np.ndarray):
+        """Replaces each target row by itself times the source row to the given power."""
+        left = self.paulis[targets]
+        right = powers[:, None] * self.paulis[source]
+        self.phases[targets] = (
+            self.phases[targets]
+            + powers * self.phases[source]
+            + 2 * _symplectic_products(left, right)
+        ) % 3
+        self.paulis[targets] = (left + right) % 3
+
+    def measure(self, index: int, prng: np.random.RandomState) -> int:
+        """Measures one qutrit in the computational basis, collapsing the state."""
+        n = self.num_qutrits
+        # [Z3_k, P] is the X3 exponent of P on qutrit k
+        stabilizer_shifts = self.paulis[n:, index]
+        anticommuting = np.flatnonzero(stabilizer_shifts)
+
+        if len(anticommuting) > 0:
+            pivot = n + anticommuting[0]
+            pivot_shift = self.paulis[pivot, index]
+            # Every other row is made to commute with Z3_k, using 1 / a = a mod 3
+            others = np.flatnonzero(self.paulis[:, index])
+            others = others[(others != pivot) & (others != pivot - n)]
+            self._multiply_rows(others, pivot, (-self.paulis[others, index] * pivot_shift) % 3)
+
+            self.paulis[pivot - n] = (pivot_shift * self.paulis[pivot]) % 3
+            outcome = prng.randint(3)
+            # Z3 |m> = w^m |m>, so w^-m Z3_k stabilizes the outcome
+            self.paulis[pivot] = 0
+            self.paulis[pivot, n + index] = 1
+            self.phases[pivot] = -outcome % 3
+            return outcome
+
+        # Z3_k is a product of stabilizers, with exponents read off the destabilizers
+        product = np.zeros(2 * n, dtype=np.int64)
+        phase = 0
+        for i in np.flatnonzero(self.paulis[:n, index]):
+            power = self.paulis[i, index]
+            term = power * self.paulis[n + i]
+            phase += power * self.phases[n + i] + 2 * _symplectic_products(product, term)
+            product = (product + term) % 3
+        return int(-phase % 3)
+
+
+def _compile_stabilizer_steps(
+    operations: Sequence["cirq.Operation"],
+    position_of: Dict["cirq.Qid", int],
+    twirl_non_pauli_noise: bool,
+) -> List[tuple]:
+    """Sorts operations into Cliffords, Pauli noise and measurements.
+
+    Each step is one of
+        ("clifford", positions, symplectic, phases): applied to the tableau and frames,
+        ("pauli", positions, cumulative_probabilities, vectors): sampled into the frames,
+        ("measure", positions, key): recorded from the tableau and frames.
+    """
+    actions = dict()
+    steps = []
+    for op in operations:
+        positions = [position_of[q] for q in op.qubits]
+        if cirq.is_measurement(op):
+            steps.append(("measure", positions, cirq.measurement_key_name(op)))
+            continue
+
+        gate = op.gate if op.gate is not None else op
+        action = actions.get(id(gate))
+        if action is None:
+            if cirq.has_unitary(op):
+                clifford = clifford_action(cirq.unitary(op))
+                if clifford is None:
+                    raise ValueError(f"Not a qutrit Clifford: {op!r}")
+                action = ("clifford", *clifford)
+            elif cirq.has_mixture(op) and all(
+                weyl_heisenberg_indices(u) is not None for _, u in cirq.mixture(op)
+            ):
+                probabilities, unitaries = zip(*cirq.mixture(op))
+                vectors = np.array(
+                    [np.concatenate(weyl_heisenberg_indices(u)) for u in unitaries],
+                    dtype=np.int64,
+                )
+                action = ("pauli", np.cumsum(probabilities), vectors)
+            elif twirl_non_pauli_noise and cirq.has_kraus(op):
+                probabilities, vectors = pauli_twirl(cirq.kraus(op))
+                action = ("pauli", np.cumsum(probabilities), vectors)
+            else:
+                raise ValueError(f"Not a ternary Pauli channel: {op!r}")
+            actions[id(gate)] = action
+        steps.append((action[0], positions, *action[1:]))
+    return steps
+
+
+def sample_stabilizer_measurements(
+    circuit: cirq.AbstractCircuit,
+    noise: "cirq.NOISE_MODEL_LIKE" = None,
+    repetitions: int = 1,
+    qubit_order: "cirq.QubitOrderOrList" = cirq.QubitOrder.DEFAULT,
+    seed: Optional[int] = None,
+    twirl_non_pauli_noise: bool = False,
+) -> Dict[str, np.ndarray]:
+    """Samples the measurements of a qutrit Clifford circuit under Pauli noise.
+
+    The noiseless circuit is simulated once on a stabilizer tableau, giving a
+    reference sample, and noise is sampled as Pauli frames for all repetitions at
+    once, each frame flipping the outcomes it would shift. Frames are given random
+    Z3 components wherever the state is a Z3 eigenstate, so random outcomes are
+    resampled rather than copied from the reference.
+
+    Args:
+        circuit: A circuit of qutrit Cliffords, such as QutritPlusGate, QutritSwap or
+            wrapped cirq.X, and computational basis measurements.
+        noise: The noise model to insert, whose channels must be mixtures of ternary Paulis.
+        repetitions: The number of samples to take.
+        qubit_order: Determines the ordering of qudits in the tableau.
+        seed: Seeds the reference sample and the frames, for reproducible samples.
+        twirl_non_pauli_noise: Whether to approximate any other channel, such as the
+            amplitude damping of GokhaleNoiseModelOnQutrits, by its Pauli twirl.
+            Otherwise such channels raise a ValueError.
+
+    Returns:
+        For each measurement key, the outcomes with shape (repetitions, qutrits measured).
+    """
+    qudits = cirq.QubitOrder.as_qubit_order(qubit_order).order_for(circuit.all_qubits())
+    assert all(dim == 3 for dim in cirq.qid_shape(qudits))
+    n = len(qudits)
+    position_of = {q: i for i, q in enumerate(qudits)}
+
+    noise = cirq.NoiseModel.from_noise_model_like(noise)
+    operations = list(cirq.flatten_to_ops(noise.noisy_moments(circuit, qudits)))
+    steps = _compile_stabilizer_steps(operations, position_of, twirl_non_pauli_noise)
+
+    prng = np.random.RandomState(seed)
+    tableau = QutritTableau(n)
+    frames = np.zeros((repetitions, 2 * n), dtype=np.int64)
+    frames[:, n:] = prng.randint(3, size=(repetitions, n))
+
+    measurements = dict()
+    for step in steps:
+        kind, positions = step[0], step[1]
+        columns = positions + [n + i for i in positions]
+        if kind == "clifford":
+            _, _, symplectic, phases = step
+            tableau.apply_clifford(symplectic, phases, positions)
+            frames[:, columns] = (frames[:, columns] @ symplectic.T) % 3
+        elif kind == "pauli":
+            _, _, cumulative_probabilities, vectors = step
+            choices = np.searchsorted(
+                cumulative_probabilities, prng.random_sample(repetitions), side="right"
+            )
+            choices = np.minimum(choices, len(vectors) - 1)
+            frames[:, columns] = (frames[:, columns] + vectors[choices]) % 3
+        else:
+            _, _, key = step
+            reference = np.array([tableau.measure(i, prng) for i in positions], dtype=np.int64)
+            measurements[key] = (reference + frames[:, positions]) % 3
+            frames[:, [n + i for i in positions]] = prng.randint(
+                3, size=(repetitions, len(positions))
+            )
+    return measurements
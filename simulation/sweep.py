@@ -0,0 +1,268 @@
+import itertools
+from typing import List, Optional, Sequence, Type
+
+import cirq
+import numpy as np
+
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from noise_models.hardware_aware import idle_channel
+from ops.channels import QutritMixtureChannel
+from ops.pauli_operators import single_qutrit_pauli_operators, two_qutrit_pauli_operators
+from simulation.fidelity import ideal_state_vector
+
+
+def depolarizing_error_weights(prob: float, num_qutrits: int) -> List[float]:
+    """Error weights spreading a probability evenly over every non-identity Pauli."""
+    num_errors = 9**num_qutrits - 1
+    return [1 - prob] + num_errors * [prob / num_errors]
+
+
+def _stacked_pauli_terms(channels: Sequence[QutritMixtureChannel]):
+    """Aligns the Pauli terms of channels with the same errors but different weights.
+
+    Returns the shifts shared by all channels, and an array of coefficients indexed
+    by (channel, shift, left..., right...), zero where a channel lacks a shift.
+    """
+    terms = [dict(channel.pauli_terms) for channel in channels]
+    shifts = sorted(set().union(*terms))
+    coefficient_shape = next(iter(terms[0].values())).shape
+    coefficients = np.zeros((len(channels), len(shifts)) + coefficient_shape, dtype=np.complex128)
+    for i, channel_terms in enumerate(terms):
+        for j, shift in enumerate(shifts):
+            if shift in channel_terms:
+                coefficients[i, j] = channel_terms[shift]
+    return tuple(shifts), coefficients
+
+
+# Gokhale idle channels decay |1> and |2> directly to |0>, as (row, col) of each jump
+_decay_transitions = ((0, 1), (0, 2))
+
+
+def _stacked_decay_structures(channels):
+    """Stacks the damping matrices and jump rates of amplitude dampening channels.
+
+    Rates are aligned on the shared transitions, zero where a channel lacks a jump,
+    as with no decay the jump operators vanish and are classified as diagonal.
+    """
+    damping = np.stack([channel.decay_structure[0] for channel in channels])
+    rates = np.zeros((len(channels), len(_decay_transitions)))
+    column_of = {transition: j for j, transition in enumerate(_decay_transitions)}
+    for i, channel in enumerate(channels):
+        for row, col, rate in channel.decay_structure[1]:
+            assert (row, col) in column_of, f"Unexpected decay from {col} to {row}"
+            rates[i, column_of[row, col]] += rate
+    return damping, _decay_transitions, rates
+
+
+def _apply_batched_pauli_mixture(tensor, out, buffer, axes, shifts, coefficients):
+    """Applies one Pauli mixture per batch entry, with the batch along axis 0.
+
+    Args:
+        axes: The left axes followed by the right axes of the target qutrits.
+        coefficients: Indexed by (batch, shift, left..., right...).
+    """
+    axis_order = np.argsort(axes)
+    broadcast_shape = [len(coefficients)] + [1] * (tensor.ndim - 1)
+    for axis in axes:
+        broadcast_shape[axis] = 3
+    for term_index, shift in enumerate(shifts):
+        term = coefficients[:, term_index]
+        term = term.transpose([0] + [1 + k for k in axis_order]).reshape(broadcast_shape)
+        shifted = np.roll(tensor, shift=shift + shift, axis=axes) if any(shift) else tensor
+        if term_index == 0:
+            np.multiply(shifted, term, out=out)
+        else:
+            np.multiply(shifted, term, out=buffer)
+            out += buffer
+    return out
+
+
+def _apply_batched_decay(tensor, out, left_axis, right_axis, damping, transitions, rates):
+    """Applies one amplitude dampening channel per batch entry, with the batch along axis 0."""
+    broadcast_shape = [len(damping)] + [1] * (tensor.ndim - 1)
+    broadcast_shape[left_axis] = 3
+    broadcast_shape[right_axis] = 3
+    if left_axis > right_axis:
+        damping = damping.transpose(0, 2, 1)
+    np.multiply(tensor, damping.reshape(broadcast_shape), out=out)
+
+    rate_shape = [len(rates)] + [1] * (tensor.ndim - 3)
+    for (row, col), rate in zip(transitions, rates.T):
+        source = [slice(None)] * tensor.ndim
+        source[left_axis] = col
+        source[right_axis] = col
+        target = [slice(None)] * tensor.ndim
+        target[left_axis] = row
+        target[right_axis] = row
+        out[tuple(target)] += rate.reshape(rate_shape) * tensor[tuple(source)]
+    return out
+
+
+def _compile_sweep_steps(
+    circuit: cirq.AbstractCircuit, qudits: Sequence["cirq.Qid"]
+) -> List[tuple]:
+    """Inserts noise once, with placeholder channels marking where swept noise goes.
+
+    Each step is one of
+        ("fixed", operation, left_axes, right_axes): the same for every parameter point,
+        (kind, left_axes, right_axes): a swept channel, with kind one of
+            "single_qutrit_gate_error", "two_qutrit_gate_error", "idle_short" or "idle_long",
+    with axes offset by the leading batch axis.
+    """
+    template = GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=depolarizing_error_weights(0, 1),
+        two_qutrit_error_weights=depolarizing_error_weights(0, 2),
+    )
+    swept_channels = {
+        id(template.single_qutrit_gate_error): "single_qutrit_gate_error",
+        id(template.two_qutrit_gate_error): "two_qutrit_gate_error",
+        id(template.idle_short): "idle_short",
+        id(template.idle_long): "idle_long",
+    }
+
+    num_qudits = len(qudits)
+    axis_of = {q: i for i, q in enumerate(qudits)}
+    steps = []
+    for op in cirq.flatten_to_ops(template.noisy_moments(circuit, qudits)):
+        left_axes = tuple(1 + axis_of[q] for q in op.qubits)
+        right_axes = tuple(axis + num_qudits for axis in left_axes)
+        kind = swept_channels.get(id(op.gate))
+        if kind is None:
+            steps.append(("fixed", op, left_axes, right_axes))
+        else:
+            steps.append((kind, left_axes, right_axes))
+    return steps
+
+
+def sweep_gokhale_noise(
+    circuit: cirq.AbstractCircuit,
+    single_qutrit_error_weights: Sequence[Sequence[float]],
+    two_qutrit_error_weights: Sequence[Sequence[float]],
+    lambda_short: Sequence[float],
+    lambda_long: Optional[Sequence[float]] = None,
+    qubit_order: "cirq.QubitOrderOrList" = cirq.QubitOrder.DEFAULT,
+    batch_size: Optional[int] = None,
+    dtype: Type[np.complexfloating] = np.complex128,
+) -> np.ndarray:
+    """Computes the fidelity of a circuit under GokhaleNoiseModelOnQutrits over a grid of parameters.
+
+    The ideal state is simulated once and noise is inserted once. Since the swept
+    parameters only change channel coefficients, grid points are then stacked along
+    a batch axis of the density matrix and evolved together.
+
+    Args:
+        circuit: The noiseless circuit to simulate.
+        single_qutrit_error_weights: The values of single_qutrit_error_weights to sweep,
+            see depolarizing_error_weights to sweep a probability p_1.
+        two_qutrit_error_weights: The values of two_qutrit_error_weights to sweep.
+        lambda_short: The values of lambda_short to sweep.
+        lambda_long: The values of lambda_long to sweep.
+            If not given, lambda_long is 3 * lambda_short at every point.
+        qubit_order: Determines the ordering of qudits in the simulation.
+        batch_size: The most grid points to evolve at once, bounding memory
+            to 4 density matrices per point. Defaults to the whole grid.
+        dtype: The precision of the density matrices.
+
+    Returns:
+        An array of fidelities indexed by (single_qutrit_error_weights,
+        two_qutrit_error_weights, lambda_short, lambda_long), without the
+        last axis if lambda_long is not given.
+    """
+    qudits = cirq.QubitOrder.as_qubit_order(qubit_order).order_for(circuit.all_qubits())
+    qid_shape = cirq.qid_shape(qudits)
+    dim = int(np.prod(qid_shape, dtype=np.int64))
+    ideal_state = ideal_state_vector(circuit, qudits).astype(dtype)
+    steps = _compile_sweep_steps(circuit, qudits)
+
+    # Channels are built once per swept value, not once per grid point.
+    # Idle channels are the same amplitude dampening as GokhaleNoiseModelOnQutrits builds
+    single_shifts, single_coefficients = _stacked_pauli_terms(
+        [
+            QutritMixtureChannel(w, single_qutrit_pauli_operators)
+            for w in single_qutrit_error_weights
+        ]
+    )
+    two_shifts, two_coefficients = _stacked_pauli_terms(
+        [QutritMixtureChannel(w, two_qutrit_pauli_operators) for w in two_qutrit_error_weights]
+    )
+    short_decay = _stacked_decay_structures([idle_channel(ratio) for ratio in lambda_short])
+    if lambda_long is None:
+        long_decay = _stacked_decay_structures([idle_channel(3 * ratio) for ratio in lambda_short])
+    else:
+        long_decay = _stacked_decay_structures([idle_channel(ratio) for ratio in lambda_long])
+
+    grid_shape = (
+        len(single_qutrit_error_weights),
+        len(two_qutrit_error_weights),
+        len(lambda_short),
+    ) + (() if lambda_long is None else (len(lambda_long),))
+    grid = np.array(list(itertools.product(*(range(n) for n in grid_shape))), dtype=np.int64)
+    long_index = 2 if lambda_long is None else 3
+
+    fidelities = np.empty(len(grid))
+    if batch_size is None:
+        batch_size = max(len(grid), 1)
+    for start in range(0, len(grid), batch_size):
+        points = grid[start : start + batch_size]
+        batch = len(points)
+        tensor = np.zeros((batch,) + qid_shape * 2, dtype=dtype)
+        tensor[(slice(None),) + (0,) * (2 * len(qid_shape))] = 1
+        out = np.empty_like(tensor)
+        buffer0 = np.empty_like(tensor)
+        buffer1 = np.empty_like(tensor)
+
+        coefficients = {
+            "single_qutrit_gate_error": (
+                single_shifts,
+                single_coefficients[points[:, 0]].astype(dtype),
+            ),
+            "two_qutrit_gate_error": (two_shifts, two_coefficients[points[:, 1]].astype(dtype)),
+        }
+        decay = dict()
+        for kind, (damping, transitions, rates), index in [
+            ("idle_short", short_decay, points[:, 2]),
+            ("idle_long", long_decay, points[:, long_index]),
+        ]:
+            decay[kind] = (damping[index].astype(dtype), transitions, rates[index])
+
+        for step in steps:
+            kind = step[0]
+            if kind == "fixed":
+                _, op, left_axes, right_axes = step
+                result = cirq.apply_channel(
+                    op,
+                    cirq.ApplyChannelArgs(
+                        target_tensor=tensor,
+                        out_buffer=out,
+                        auxiliary_buffer0=buffer0,
+                        auxiliary_buffer1=buffer1,
+                        left_axes=left_axes,
+                        right_axes=right_axes,
+                    ),
+                )
+            elif kind in coefficients:
+                _, left_axes, right_axes = step
+                shifts, kind_coefficients = coefficients[kind]
+                result = _apply_batched_pauli_mixture(
+                    tensor, out, buffer0, left_axes + right_axes, shifts, kind_coefficients
+                )
+            else:
+                _, (left_axis,), (right_axis,) = step
+                result = _apply_batched_decay(tensor, out, left_axis, right_axis, *decay[kind])
+
+            # Keep the result as the tensor, recycling whichever array held the input
+            if result is not tensor:
+                if result is out:
+                    tensor, out = out, tensor
+                elif result is buffer0:
+                    tensor, buffer0 = buffer0, tensor
+                elif result is buffer1:
+                    tensor, buffer1 = buffer1, tensor
+                else:
+                    tensor[...] = result
+
+        density_matrices = tensor.reshape(batch, dim, dim)
+        fidelities[start : start + batch] = np.real(
+            np.einsum("i,bij,j->b", ideal_state.conj(), density_matrices, ideal_state)
+        )
+    return fidelities.reshape(grid_shape)
@@ -0,0 +1,186 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import List, Optional, Sequence, Tuple, Type
+
+import cirq
+import numpy as np
+
+
+@dataclass
+class TrajectoryResult:
+    """Fidelity estimated from Monte Carlo trajectories against an ideal pure state.
+
+    Attributes:
+        fidelity: The mean of |<ideal|trajectory>|^2 over all trajectories,
+            an unbiased estimate of <ideal|rho|ideal>.
+        standard_error: The standard error of that mean.
+        confidence_interval: The (lower, upper) bounds of the normal confidence interval.
+        trajectory_fidelities: The fidelity of each individual trajectory.
+    """
+
+    fidelity: float
+    standard_error: float
+    confidence_interval: Tuple[float, float]
+    trajectory_fidelities: np.ndarray
+
+
+def compile_trajectory_steps(
+    circuit: cirq.AbstractCircuit,
+    qudits: Sequence["cirq.Qid"],
+    noise: Optional["cirq.NoiseModel"] = None,
+    dtype: Type[np.complexfloating] = np.complex128,
+) -> List[tuple]:
+    """Flattens a circuit, with noise inserted, into the steps taken by each trajectory.
+
+    Each step is one of
+        ("unitary", operation, axes): applied deterministically,
+        ("mixture", cumulative_probabilities, unitaries, axes): one unitary sampled,
+        ("kraus", operators, axes): one operator sampled by the norm of its result,
+    with operators already reshaped into tensors of the given precision
+    for targeted multiplication.
+    """
+    axis_of = {q: i for i, q in enumerate(qudits)}
+    moments = circuit if noise is None else noise.noisy_moments(circuit, qudits)
+
+    steps = []
+    for op in cirq.flatten_to_ops(moments):
+        axes = tuple(axis_of[q] for q in op.qubits)
+        tensor_shape = cirq.qid_shape(op) * 2
+        if cirq.has_unitary(op):
+            steps.append(("unitary", op, axes))
+        elif cirq.has_mixture(op):
+            probabilities, unitaries = zip(*cirq.mixture(op))
+            # Identities are kept as None, so sampling them costs nothing
+            unitaries = tuple(
+                None if np.allclose(u, np.eye(len(u))) else u.reshape(tensor_shape).astype(dtype)
+                for u in unitaries
+            )
+            steps.append(("mixture", np.cumsum(probabilities), unitaries, axes))
+        elif cirq.has_kraus(op):
+            operators = tuple(k.reshape(tensor_shape).astype(dtype) for k in cirq.kraus(op))
+            steps.append(("kraus", operators, axes))
+        else:
+            raise TypeError(f"Cannot simulate trajectories through operation: {op!r}")
+    return steps
+
+
+def run_trajectory(
+    steps: Sequence[tuple],
+    qid_shape: Tuple[int, ...],
+    prng: np.random.RandomState,
+    dtype: Type[np.complexfloating] = np.complex128,
+) -> np.ndarray:
+    """Samples one trajectory through compiled steps, starting from |0...0>."""
+    state = np.zeros(qid_shape, dtype=dtype)
+    state[(0,) * len(qid_shape)] = 1
+    buffer = np.empty_like(state)
+
+    for step in steps:
+        kind = step[0]
+        if kind == "unitary":
+            _, op, axes = step
+            result = cirq.apply_unitary(op, cirq.ApplyUnitaryArgs(state, buffer, axes))
+            if result is buffer:
+                state, buffer = buffer, state
+            elif result is not state:
+                state[...] = result
+        elif kind == "mixture":
+            _, cumulative_probabilities, unitaries, axes = step
+            choice = np.searchsorted(cumulative_probabilities, prng.random_sample(), side="right")
+            unitary = unitaries[min(choice, len(unitaries) - 1)]
+            if unitary is not None:
+                cirq.targeted_left_multiply(unitary, state, axes, out=buffer)
+                state, buffer = buffer, state
+        else:
+            _, operators, axes = step
+            # Quantum jump: each operator is chosen with probability ||K psi||^2
+            threshold = prng.random_sample()
+            for k, operator in enumerate(operators):
+                cirq.targeted_left_multiply(operator, state, axes, out=buffer)
+                probability = np.vdot(buffer, buffer).real
+                threshold -= probability
+                if threshold < 0 or k == len(operators) - 1:
+                    break
+            buffer /= np.sqrt(probability)
+            state, buffer = buffer, state
+    return state
+
+
+def _run_trajectory_batch(steps, qid_shape, ideal_state, seed, repetitions):
+    prng = np.random.RandomState(seed)
+    fidelities = np.empty(repetitions)
+    for i in range(repetitions):
+        final_state = run_trajectory(steps, qid_shape, prng, ideal_state.dtype)
+        fidelities[i] = np.abs(np.vdot(ideal_state, final_state)) ** 2
+    return fidelities
+
+
+def simulate_trajectories(
+    circuit: cirq.AbstractCircuit,
+    noise: "cirq.NoiseModel",
+    repetitions: int = 1000,
+    qubit_order: "cirq.QubitOrderOrList" = cirq.QubitOrder.DEFAULT,
+    processes: Optional[int] = None,
+    seed: Optional[int] = None,
+    confidence: float = 0.95,
+    dtype: Type[np.complexfloating] = np.complex128,
+) -> TrajectoryResult:
+    """Estimates the fidelity of a noisy circuit against its ideal pure state,
+    by sampling noise branches on state vectors instead of evolving a density matrix.
+
+    Args:
+        circuit: The noiseless circuit to simulate.
+        noise: The noise model to insert, such as GokhaleNoiseModelOnQutrits
+            or HardwareAwareSymmetricNoise.
+        repetitions: The number of trajectories to sample.
+        qubit_order: Determines the ordering of qudits in the state vector.
+        processes: The number of worker processes to spread trajectories over.
+            Defaults to the number of CPUs, and runs in-process if 1.
+        seed: Seeds the trajectories, for reproducible estimates.
+        confidence: The confidence level of the returned interval.
+        dtype: The precision of each trajectory's state vector.
+    """
+    qudits = cirq.QubitOrder.as_qubit_order(qubit_order).order_for(circuit.all_qubits())
+    qid_shape = cirq.qid_shape(qudits)
+
+    ideal_steps = compile_trajectory_steps(circuit, qudits, dtype=dtype)
+    ideal_state = run_trajectory(ideal_steps, qid_shape, np.random.RandomState(0), dtype)
+    steps = compile_trajectory_steps(circuit, qudits, noise, dtype)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, repetitions))
+    batch_sizes = [len(batch) for batch in np.array_split(np.arange(repetitions), processes)]
+    batch_seeds = [
+        s.generate_state(1)[0] for s in np.random.SeedSequence(seed).spawn(len(batch_sizes))
+    ]
+
+    if processes == 1:
+        batches = [
+            _run_trajectory_batch(steps, qid_shape, ideal_state, batch_seed, batch_size)
+            for batch_seed, batch_size in zip(batch_seeds, batch_sizes)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(
+                    _run_trajectory_batch, steps, qid_shape, ideal_state, batch_seed, batch_size
+                )
+                for batch_seed, batch_size in zip(batch_seeds, batch_sizes)
+            ]
+            batches = [future.result() for future in futures]
+
+    fidelities = np.concatenate(batches)
+    fidelity = float(np.mean(fidelities))
+    standard_error = (
+        float(np.std(fidelities, ddof=1) / np.sqrt(repetitions)) if repetitions > 1 else 0.0
+    )
+    margin = NormalDist().inv_cdf(0.5 + confidence / 2) * standard_error
+    return TrajectoryResult(
+        fidelity=fidelity,
+        standard_error=standard_error,
+        confidence_interval=(fidelity - margin, fidelity + margin),
+        trajectory_fidelities=fidelities,
+    )
@@ -0,0 +1,84 @@
+import json
+import cirq
+import numpy as np
+from noise_models.calibration import HardwareCalibration
+from noise_models.hardware_aware import HardwareAwareSymmetricNoise
+import pytest
+
+
+@pytest.fixture
+def calibration():
+    single = np.array([0.001, 0.002, 0.003])
+    two = np.full((3, 3), np.nan)
+    two[0, 1] = 0.01
+    two[1, 2] = 0.02
+    two[2, 1] = 0.03  # asymmetric edge
+    return HardwareCalibration(single, two, t1=np.array([100.0, 200.0, 300.0]))
+
+
+def test_missing_edge_directions_are_symmetric(calibration):
+    assert calibration.two_qutrit_error_rate(1, 0) == 0.01
+    assert calibration.two_qutrit_error_rate(2, 1) == 0.03
+    with pytest.raises(KeyError):
+        calibration.two_qutrit_error_rate(0, 2)
+
+
+def test_snapshot_formats_round_trip(calibration, tmp_path):
+    json_path = tmp_path / "snapshot.json"
+    with open(json_path, "w") as f:
+        json.dump(
+            {
+                "single_qutrit_error_rates": [0.001, 0.002, 0.003],
+                "two_qutrit_error_rates": [[0, 1, 0.01], [1, 2, 0.02], [2, 1, 0.03]],
+                "t1": [100.0, 200.0, 300.0],
+            },
+            f,
+        )
+    csv_path = tmp_path / "snapshot.csv"
+    with open(csv_path, "w") as f:
+        f.write("kind,a,b,value\n")
+        f.write("single,0,,0.001\nsingle,1,,0.002\nsingle,2,,0.003\n")
+        f.write("two,0,1,0.01\ntwo,1,2,0.02\ntwo,2,1,0.03\n")
+        f.write("t1,0,,100\nt1,1,,200\nt1,2,,300\n")
+    calibration.save_npz(tmp_path / "snapshot.npz")
+    calibration.save_npy_directory(tmp_path / "snapshot")
+
+    for name in ("snapshot.json", "snapshot.csv", "snapshot.npz", "snapshot"):
+        loaded = HardwareCalibration.load(str(tmp_path / name))
+        np.testing.assert_array_equal(
+            loaded.single_qutrit_error_rates, calibration.single_qutrit_error_rates
+        )
+        np.testing.assert_array_equal(
+            loaded.two_qutrit_error_rates, calibration.two_qutrit_error_rates
+        )
+        np.testing.assert_array_equal(loaded.t1, calibration.t1)
+    assert isinstance(
+        HardwareCalibration.load(str(tmp_path / "snapshot")).two_qutrit_error_rates, np.memmap
+    )
+
+
+def test_noise_model_from_calibration(calibration):
+    qutrits = calibration.qutrits
+    noise_model = HardwareAwareSymmetricNoise(
+        calibration=calibration, single_qutrit_gate_duration=1.0
+    )
+    assert noise_model.two_qutrit_channel(1, 0).prob == 0.01
+
+    circuit = cirq.Circuit(cirq.IdentityGate(qid_shape=(3,)).on(qutrits[0]))
+    idle_moment = noise_model.noisy_moment(circuit[0], qutrits)[2]
+    # Qutrits with shorter T1 decay faster
+    decay_rates = [cirq.kraus(op)[1][0, 1] for op in idle_moment.operations]
+    assert decay_rates[0] > decay_rates[1] > decay_rates[2]
+
+
+def test_missing_t1_rejected_on_load(tmp_path):
+    csv_path = tmp_path / "snapshot.csv"
+    with open(csv_path, "w") as f:
+        f.write("kind,a,b,value\n")
+        f.write("single,0,,0.001\nsingle,1,,0.002\n")
+        f.write("two,0,1,0.01\n")
+        f.write("t1,0,,100\n")  # No T1 for qutrit 1
+    with pytest.raises(ValueError, match=r"\[1\]"):
+        HardwareCalibration.load(str(csv_path))
+    with pytest.raises(ValueError, match=r"\[0\]"):
+        HardwareCalibration(np.array([0.001]), np.full((1, 1), np.nan), t1=np.array([np.nan]))
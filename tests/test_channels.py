@@ -0,0 +1,174 @@
+import cirq
+import numpy as np
+from ops.channels import (
+    QutritMixtureChannel,
+    SingleQutritDepolarizingChannel,
+    TwoQutritDepolarizingChannel,
+)
+from ops.pauli_operators import single_qutrit_pauli_operators, two_qutrit_pauli_operators
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from noise_models.hardware_aware import HardwareAwareSymmetricNoise
+import pytest
+
+
+def test_channel_value_equality():
+    p = 0.001
+    assert SingleQutritDepolarizingChannel(p) == SingleQutritDepolarizingChannel(p)
+    assert hash(TwoQutritDepolarizingChannel(p)) == hash(TwoQutritDepolarizingChannel(p))
+    assert SingleQutritDepolarizingChannel(p) != SingleQutritDepolarizingChannel(2 * p)
+    assert SingleQutritDepolarizingChannel(p) == QutritMixtureChannel(
+        error_weights=[1 - p] + 8 * [p / 8], errors=single_qutrit_pauli_operators
+    )
+
+
+def test_hardware_channels_built_once():
+    qutrits = cirq.LineQid.range(3, dimension=3)
+    noise_model = HardwareAwareSymmetricNoise(
+        single_qutrit_hardware_error_rates={q: 0.001 for q in qutrits},
+        two_qutrit_hardware_error_rates={
+            qutrits[0]: {qutrits[1]: 0.01},
+            qutrits[1]: {qutrits[2]: 0.02},
+            qutrits[2]: dict(),
+        },
+    )
+    assert noise_model.single_qutrit_channel(0) is noise_model.single_qutrit_channel(2)
+    assert noise_model.two_qutrit_channel(1, 0).prob == 0.01
+    assert noise_model.two_qutrit_channel(2, 1).prob == 0.02
+
+    circuit = cirq.Circuit(cirq.IdentityGate(qid_shape=(3, 3)).on(qutrits[0], qutrits[1]))
+    noisy_moments = noise_model.noisy_moment(circuit[0], qutrits)
+    assert noisy_moments[1].operations[0].gate is noise_model.two_qutrit_channel(0, 1)
+
+
+class _KrausOnly:
+    """Exposes only the Kraus operators of a channel, forcing generic application."""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def _qid_shape_(self):
+        return cirq.qid_shape(self.channel)
+
+    def _kraus_(self):
+        return cirq.kraus(self.channel)
+
+
+def apply_to_random_state(val, targets):
+    rho = cirq.testing.random_density_matrix(27, random_state=1234).reshape((3,) * 6)
+    return cirq.apply_channel(
+        val,
+        cirq.ApplyChannelArgs(
+            target_tensor=rho,
+            out_buffer=np.empty_like(rho),
+            auxiliary_buffer0=np.empty_like(rho),
+            auxiliary_buffer1=np.empty_like(rho),
+            left_axes=targets,
+            right_axes=[t + 3 for t in targets],
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "channel, targets",
+    [
+        (SingleQutritDepolarizingChannel(0.3), [1]),
+        (TwoQutritDepolarizingChannel(0.2), [2, 0]),
+    ],
+)
+def test_depolarizing_closed_form_matches_mixture(channel, targets):
+    np.testing.assert_allclose(
+        apply_to_random_state(channel, targets),
+        apply_to_random_state(_KrausOnly(channel), targets),
+        atol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("num_qutrits, targets", [(1, [2]), (2, [2, 0])])
+def test_weighted_pauli_mixture_matches_kraus(num_qutrits, targets):
+    errors = single_qutrit_pauli_operators if num_qutrits == 1 else two_qutrit_pauli_operators
+    weights = np.random.RandomState(5).uniform(size=len(errors))
+    channel = QutritMixtureChannel(error_weights=weights / sum(weights), errors=errors)
+    assert channel.pauli_terms is not None
+    np.testing.assert_allclose(
+        apply_to_random_state(channel, targets),
+        apply_to_random_state(_KrausOnly(channel), targets),
+        atol=1e-12,
+    )
+
+
+def test_non_pauli_mixture_falls_back():
+    swap_01 = np.array([[0, 1, 0], [1, 0, 0], [0, 0, 1]], dtype=np.complex128)
+    channel = QutritMixtureChannel(
+        error_weights=[0.5, 0.5] + 7 * [0.0], errors=[np.eye(3), swap_01] + 7 * [np.eye(3)]
+    )
+    assert channel.pauli_terms is None
+    np.testing.assert_allclose(
+        apply_to_random_state(channel, [1]),
+        apply_to_random_state(_KrausOnly(channel), [1]),
+        atol=1e-12,
+    )
+
+
+def test_amplitude_damping_matches_kraus():
+    noise_model = GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=[1.0] + 8 * [0.0],
+        two_qutrit_error_weights=[1.0] + 80 * [0.0],
+        lambda_short=0.05,
+    )
+    for channel in (noise_model.idle_short, noise_model.idle_long):
+        assert channel.decay_structure is not None
+        np.testing.assert_allclose(
+            apply_to_random_state(channel, [1]),
+            apply_to_random_state(_KrausOnly(channel), [1]),
+            atol=1e-12,
+        )
+
+
+@pytest.mark.parametrize(
+    "channel",
+    [
+        SingleQutritDepolarizingChannel(0.3),
+        TwoQutritDepolarizingChannel(0.2),
+        QutritMixtureChannel(
+            error_weights=np.arange(1, 10) / 45, errors=single_qutrit_pauli_operators
+        ),
+        GokhaleNoiseModelOnQutrits(
+            single_qutrit_error_weights=[1.0] + 8 * [0.0],
+            two_qutrit_error_weights=[1.0] + 80 * [0.0],
+            lambda_short=0.05,
+        ).idle_short,
+    ],
+)
+def test_density_matrix_simulator_calls_apply_channel(monkeypatch, channel):
+    calls = []
+    apply_channel = type(channel)._apply_channel_
+
+    def spy(self, args):
+        calls.append(self)
+        return apply_channel(self, args)
+
+    monkeypatch.setattr(type(channel), "_apply_channel_", spy)
+
+    qutrits = cirq.LineQid.range(2, dimension=3)
+    targets = qutrits[: len(cirq.qid_shape(channel))]
+    unitary = cirq.testing.random_unitary(9, random_state=7)
+    circuit = cirq.Circuit(
+        cirq.MatrixGate(unitary, qid_shape=(3, 3)).on(*qutrits), channel.on(*targets)
+    )
+    rho = cirq.DensityMatrixSimulator(dtype=np.complex128).simulate(circuit).final_density_matrix
+    assert calls == [channel]
+
+    psi = unitary[:, 0]
+    expected = np.outer(psi, np.conj(psi)).reshape((3,) * 4)
+    expected = cirq.apply_channel(
+        _KrausOnly(channel),
+        cirq.ApplyChannelArgs(
+            target_tensor=expected,
+            out_buffer=np.empty_like(expected),
+            auxiliary_buffer0=np.empty_like(expected),
+            auxiliary_buffer1=np.empty_like(expected),
+            left_axes=list(range(len(targets))),
+            right_axes=[2 + t for t in range(len(targets))],
+        ),
+    )
+    np.testing.assert_allclose(rho, expected.reshape(9, 9), atol=1e-8)
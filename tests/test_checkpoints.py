@@ -0,0 +1,46 @@
+import cirq
+import numpy as np
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from ops.ternary_gates import QutritPlusGate
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from simulation.checkpoints import CheckpointStore, simulate_with_checkpoints
+import pytest
+
+
+def test_checkpoints_resume_shared_prefix(tmp_path):
+    qutrits = cirq.LineQid.range(3, dimension=3)
+    prefix = cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[0], qutrits[1]),
+        QutritPlusGate(qutrits[2]),
+    )
+    tail = cirq.Circuit(TwoQubitGateToQutritGate(cirq.ISWAP)(qutrits[1], qutrits[2]))
+    circuit = prefix + tail
+    noise_model = GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=[0.99] + 8 * [0.01 / 8],
+        two_qutrit_error_weights=[0.95] + 80 * [0.05 / 80],
+    )
+    expected = (
+        cirq.DensityMatrixSimulator(noise=noise_model)
+        .simulate(circuit, qubit_order=qutrits)
+        .final_density_matrix
+    )
+
+    store = CheckpointStore(str(tmp_path))
+    rho = simulate_with_checkpoints(
+        circuit, noise_model, store, qutrits, checkpoint_moments=[len(prefix) - 1]
+    )
+    assert np.allclose(rho, expected, atol=1e-6)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # A different tail resumes from the prefix, which is checked by corrupting it
+    checkpoint_path = next(tmp_path.iterdir())
+    corrupted = np.load(checkpoint_path)
+    np.save(checkpoint_path, np.zeros_like(corrupted))
+    other_tail = prefix + cirq.Circuit(SingleQubitGateToQutritGate(cirq.X)(qutrits[1]))
+    assert np.allclose(simulate_with_checkpoints(other_tail, noise_model, store, qutrits), 0)
+
+    # A different noise model shares no prefix
+    other_noise = GokhaleNoiseModelOnQutrits([1] + 8 * [0], [1] + 80 * [0])
+    rho = simulate_with_checkpoints(circuit, other_noise, store, qutrits)
+    assert np.isclose(np.trace(rho), 1)
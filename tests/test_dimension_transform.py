@@ -1,4 +1,6 @@
 import cirq
+from ops.ternary_gates import OneControlledPlusGate, QutritPlusGate
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate
 from transformations.dimension_transform import qubit_to_qutrit, qutrit_to_qubit
 import pytest
 
@@ -14,3 +16,21 @@ def test_dimension_transform():
     circtrit = qubit_to_qutrit(circuit)
     revcirc = qutrit_to_qubit(circtrit)
     assert circuit == revcirc
+
+
+def test_qutrit_gates_round_trip():
+    qutrits = [cirq.GridQid(0, 0, dimension=3), cirq.GridQid(0, 1, dimension=3)]
+    circuit = cirq.Circuit(
+        QutritPlusGate(qutrits[0]),
+        OneControlledPlusGate(qutrits[0], qutrits[1]),
+        cirq.Moment(),
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[1]),
+    )
+    circbit = qutrit_to_qubit(circuit)
+    assert circbit.all_qubits() == {cirq.GridQubit(0, 0), cirq.GridQubit(0, 1)}
+    assert qubit_to_qutrit(circbit) == circuit
+
+
+def test_unsupported_qids():
+    with pytest.raises(TypeError):
+        qubit_to_qutrit(cirq.Circuit(cirq.X(cirq.NamedQid("a", dimension=2))))
@@ -0,0 +1,62 @@
+import multiprocessing
+
+import cirq
+import numpy as np
+from experiments.result_store import ResultStore
+from experiments.runner import ExperimentSpec, run_experiment, run_experiments
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from ops.ternary_gates import QutritPlusGate
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+import pytest
+
+
+def small_spec(seeds):
+    return ExperimentSpec(
+        num_qutrits=3,
+        circuit_depth=3,
+        op_density=0.5,
+        gate_domain={
+            SingleQubitGateToQutritGate(cirq.H): 1,
+            TwoQubitGateToQutritGate(cirq.CNOT): 2,
+            QutritPlusGate: 1,
+        },
+        noise_model=GokhaleNoiseModelOnQutrits(
+            single_qutrit_error_weights=[0.99] + 8 * [0.01 / 8],
+            two_qutrit_error_weights=[0.95] + 80 * [0.05 / 80],
+        ),
+        seeds=seeds,
+    )
+
+
+def test_run_experiments_resumes_from_store(tmp_path):
+    store = ResultStore(str(tmp_path))
+    partial = run_experiments(small_spec(range(3)), store, processes=1, records_per_shard=2)
+    assert list(partial["seed"]) == [0, 1, 2]
+
+    # Rerunning with more seeds only runs the new ones
+    records = run_experiments(small_spec(range(6)), store, processes=2)
+    assert list(records["seed"]) == list(range(6))
+    assert len(store._shard_paths()) == 3
+    assert np.all((0 < records["fidelity"]) & (records["fidelity"] <= 1))
+
+    expected = run_experiment(small_spec([4]), 4)
+    assert np.isclose(records["fidelity"][4], expected["fidelity"])
+
+
+def test_routed_campaign_runs_in_spawned_workers(tmp_path):
+    pytest.importorskip("pytket")
+    from pytket.architecture import SquareGrid
+
+    # Spawned workers receive their spec pickled, which pytket architectures cannot be
+    spec = small_spec(range(2))
+    spec.architecture = SquareGrid(2, 2)
+    records = run_experiments(
+        spec,
+        ResultStore(str(tmp_path)),
+        processes=2,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+    assert list(records["seed"]) == [0, 1]
+    for seed, fidelity in zip(records["seed"], records["fidelity"]):
+        assert np.isclose(fidelity, run_experiment(spec, int(seed))["fidelity"])
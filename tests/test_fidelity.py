@@ -0,0 +1,50 @@
+import cirq
+import numpy as np
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from simulation.fidelity import fidelity_against_ideal
+import pytest
+
+
+def test_pure_ideal_matches_density_matrix_fidelity():
+    qutrits = cirq.LineQid.range(3, dimension=3)
+    circuit = cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[0], qutrits[1]),
+        SingleQubitGateToQutritGate(cirq.T)(qutrits[1]),
+    )
+    # The noisy circuit acts on an extra qutrit, as routed circuits may
+    routed_circuit = circuit + cirq.Circuit(
+        TwoQubitGateToQutritGate(cirq.SWAP)(qutrits[2], cirq.LineQid(3, dimension=3))
+    )
+    p_1 = 0.01
+    p_2 = 0.05
+    noise_model = GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=[1 - p_1] + 8 * [p_1 / 8],
+        two_qutrit_error_weights=[1 - p_2] + 80 * [p_2 / 80],
+    )
+
+    pure = fidelity_against_ideal(circuit, routed_circuit, noise_model)
+    mixed = fidelity_against_ideal(circuit, routed_circuit, noise_model, pure_ideal=False)
+    assert pure < 1
+    assert np.isclose(pure, mixed, atol=1e-3)
+
+
+def test_single_precision_matches_double_precision():
+    qutrits = cirq.LineQid.range(3, dimension=3)
+    circuit = cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[0], qutrits[1]),
+        SingleQubitGateToQutritGate(cirq.T)(qutrits[1]),
+        TwoQubitGateToQutritGate(cirq.ISWAP)(qutrits[1], qutrits[2]),
+    )
+    fidelities = []
+    for dtype in (np.complex64, np.complex128):
+        noise_model = GokhaleNoiseModelOnQutrits(
+            single_qutrit_error_weights=[0.99] + 8 * [0.01 / 8],
+            two_qutrit_error_weights=[0.95] + 80 * [0.05 / 80],
+            dtype=dtype,
+        )
+        assert noise_model.idle_short.kraus_operators[0].dtype == dtype
+        fidelities.append(fidelity_against_ideal(circuit, circuit, noise_model, dtype=dtype))
+    assert np.isclose(fidelities[0], fidelities[1], atol=1e-5)
@@ -0,0 +1,51 @@
+import cirq
+import numpy as np
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from ops.ternary_gates import QutritPlusGate
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from simulation.fidelity import fidelity_against_ideal
+from simulation.mixed_dimension import never_leaked_qudits, simulate_mixed_dimension
+import pytest
+
+
+def dephasing_noise_model():
+    # Only Z3 errors, which never move population into |2>
+    single_qutrit_error_weights = [0.98, 0.01, 0.01] + 6 * [0]
+    two_qutrit_error_weights = [0.97, 0.01] + 8 * [0] + [0.01] + 9 * [0] + [0.01] + 60 * [0]
+    return GokhaleNoiseModelOnQutrits(single_qutrit_error_weights, two_qutrit_error_weights)
+
+
+def leaky_circuit(qutrits):
+    return cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[0], qutrits[1]),
+        QutritPlusGate(qutrits[2]),
+        TwoQubitGateToQutritGate(cirq.CZ)(qutrits[2], qutrits[3]),
+        SingleQubitGateToQutritGate(cirq.X)(qutrits[1]),
+    )
+
+
+def test_never_leaked_qudits():
+    qutrits = cirq.LineQid.range(4, dimension=3)
+    circuit = leaky_circuit(qutrits)
+    noise_model = dephasing_noise_model()
+    assert never_leaked_qudits(circuit, noise_model) == {qutrits[0], qutrits[1], qutrits[3]}
+
+    # Depolarizing gate errors include X3 terms, so every gate-touched qutrit may leak
+    depolarizing = GokhaleNoiseModelOnQutrits([0.99] + 8 * [0.01 / 8], [0.95] + 80 * [0.05 / 80])
+    assert never_leaked_qudits(circuit, depolarizing) == frozenset()
+
+
+def test_mixed_dimension_matches_full_simulation():
+    qutrits = cirq.LineQid.range(4, dimension=3)
+    circuit = leaky_circuit(qutrits)
+    noise_model = dephasing_noise_model()
+
+    result, qid_map = simulate_mixed_dimension(circuit, noise_model, qutrits)
+    assert [qid_map[q].dimension for q in qutrits] == [2, 2, 3, 2]
+    assert result.final_density_matrix.shape == (24, 24)
+
+    full = fidelity_against_ideal(circuit, circuit, noise_model)
+    demoted = fidelity_against_ideal(circuit, circuit, noise_model, demote_never_leaked=True)
+    assert full < 1
+    assert np.isclose(full, demoted, atol=1e-5)
@@ -0,0 +1,64 @@
+import cirq
+import numpy as np
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from ops.channels import SingleQutritDepolarizingChannel
+from ops.ternary_gates import OneControlledPlusGate, QutritPlusGate
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from simulation.fidelity import fidelity_against_ideal
+from simulation.mpo import mpo_fidelity_against_ideal
+
+
+def test_mpo_fidelity_matches_density_matrix():
+    qutrits = cirq.LineQid.range(4, dimension=3)
+    circuit = cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[0], qutrits[3]),
+        QutritPlusGate(qutrits[2]),
+        OneControlledPlusGate(qutrits[1], qutrits[2]),
+        TwoQubitGateToQutritGate(cirq.ISWAP)(qutrits[3], qutrits[1]),
+    )
+    noise_model = GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=[0.99] + 8 * [0.01 / 8],
+        two_qutrit_error_weights=[0.95] + 80 * [0.05 / 80],
+    )
+    expected = fidelity_against_ideal(
+        circuit, circuit, noise_model, qubit_order=qutrits, dtype=np.complex128
+    )
+
+    result = mpo_fidelity_against_ideal(circuit, circuit, noise_model, qutrits)
+    assert np.isclose(result.fidelity, expected, atol=1e-9)
+    assert result.truncation_error < 1e-12
+
+    truncated = mpo_fidelity_against_ideal(
+        circuit, circuit, noise_model, qutrits, max_bond_dimension=2
+    )
+    assert truncated.max_bond_dimension == 2
+    assert truncated.truncation_error > 1e-6
+
+
+def test_mpo_fidelity_on_mixed_dimensions():
+    qudits = [
+        cirq.LineQid(0, dimension=3),
+        cirq.LineQid(1, dimension=2),
+        cirq.LineQid(2, dimension=3),
+    ]
+    first = cirq.MatrixGate(cirq.testing.random_unitary(9, random_state=1), qid_shape=(3, 3))
+    second = cirq.MatrixGate(cirq.testing.random_unitary(9, random_state=2), qid_shape=(3, 3))
+    ideal_circuit = cirq.Circuit(
+        cirq.H(qudits[1]),
+        first(qudits[0], qudits[2]),
+        second(qudits[2], qudits[0]),
+        cirq.CNOT(qudits[1], cirq.LineQubit(3)),
+    )
+    # Noise is given as explicit channels, so the chain holds both qutrits and qubits
+    noisy_circuit = ideal_circuit + cirq.Circuit(
+        SingleQutritDepolarizingChannel(0.05).on(qudits[0]),
+        cirq.amplitude_damp(0.1).on(qudits[1]),
+    )
+    qubit_order = qudits + [cirq.LineQubit(3)]
+    expected = fidelity_against_ideal(
+        ideal_circuit, noisy_circuit, cirq.NO_NOISE, qubit_order=qubit_order, dtype=np.complex128
+    )
+    result = mpo_fidelity_against_ideal(ideal_circuit, noisy_circuit, cirq.NO_NOISE, qubit_order)
+    assert np.isclose(result.fidelity, expected, atol=1e-9)
+    assert expected < 0.99
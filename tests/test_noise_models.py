@@ -0,0 +1,42 @@
+import cirq
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+import pytest
+
+
+@pytest.fixture
+def args():
+    qutrits = cirq.LineQid.range(3, dimension=3)
+    X3 = SingleQubitGateToQutritGate(cirq.X)
+    CNOT3 = TwoQubitGateToQutritGate(cirq.CNOT)
+    noise_model = GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=[1.0] + 8 * [0.0],
+        two_qutrit_error_weights=[1.0] + 80 * [0.0],
+    )
+    return qutrits, cirq.Circuit(X3(qutrits[0]), CNOT3(qutrits[0], qutrits[1])), noise_model
+
+
+def test_noisy_moments_matches_noisy_moment(args):
+    qutrits, circtrit, noise_model = args
+    noisy_moments = noise_model.noisy_moments(circtrit, qutrits)
+    assert noisy_moments == [noise_model.noisy_moment(moment, qutrits) for moment in circtrit]
+    # The first moment holds one gate error, then idles every qutrit
+    assert len(noisy_moments[0][1]) == 1 and len(noisy_moments[0][2]) == len(qutrits)
+
+
+def test_idle_moments_built_on_first_use(args, monkeypatch):
+    qutrits, circtrit, noise_model = args
+    durations = []
+    idle_moment = noise_model._idle_moment
+
+    def spy(duration, system_qubits):
+        durations.append(duration)
+        return idle_moment(duration, system_qubits)
+
+    monkeypatch.setattr(noise_model, "_idle_moment", spy)
+    noise_model.noisy_moment(circtrit[0], qutrits)
+    assert durations == [1]
+
+    durations.clear()
+    noise_model.noisy_moments(circtrit + circtrit, qutrits)
+    assert durations == [1, 2]
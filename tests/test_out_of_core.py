@@ -0,0 +1,35 @@
+import cirq
+import numpy as np
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from ops.ternary_gates import OneControlledPlusGate, QutritPlusGate
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from simulation.out_of_core import simulate_out_of_core
+import pytest
+
+
+@pytest.mark.parametrize("chunk_bytes", [2**30, 2**12])
+def test_out_of_core_matches_in_memory(tmp_path, chunk_bytes):
+    qutrits = cirq.LineQid.range(4, dimension=3)
+    circuit = cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[0], qutrits[3]),
+        QutritPlusGate(qutrits[2]),
+        OneControlledPlusGate(qutrits[1], qutrits[2]),
+        TwoQubitGateToQutritGate(cirq.ISWAP)(qutrits[3], qutrits[1]),
+    )
+    noise_model = GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=[0.99] + 8 * [0.01 / 8],
+        two_qutrit_error_weights=[0.95] + 80 * [0.05 / 80],
+    )
+    expected = (
+        cirq.DensityMatrixSimulator(noise=noise_model)
+        .simulate(circuit, qubit_order=qutrits)
+        .final_density_matrix
+    )
+
+    path = str(tmp_path / "rho.npy")
+    rho = simulate_out_of_core(
+        circuit, noise_model, path, qutrits, chunk_bytes=chunk_bytes, max_fused_qudits=2
+    )
+    assert np.allclose(rho, expected, atol=1e-6)
+    assert np.allclose(np.load(path).reshape(rho.shape), expected, atol=1e-6)
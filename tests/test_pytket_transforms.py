@@ -0,0 +1,130 @@
+import cirq
+import numpy as np
+from ops.ternary_gates import OneControlledPlusGate, QutritMinusGate, QutritPlusGate, QutritSwap
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+import pytest
+
+pytest.importorskip("pytket")
+
+from pytket.architecture import SquareGrid
+from pytket.circuit import Circuit, OpType
+from pytket_cirq_extension.tket_to_cirq import tk_to_cirq
+from transformations.dimension_transform import qubit_to_qutrit
+from transformations.pytket_transforms import (
+    CompilationContext,
+    _restore_custom_gates,
+    place_and_route,
+    place_and_route_with_maps,
+)
+
+
+def test_place_and_route_maps():
+    qutrits = [cirq.NamedQid(str(i), dimension=3) for i in range(4)]
+    circuit = cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[0], qutrits[3]),
+        OneControlledPlusGate(qutrits[1], qutrits[2]),
+        TwoQubitGateToQutritGate(cirq.CZ)(qutrits[2], qutrits[0]),
+        OneControlledPlusGate(qutrits[3], qutrits[1]),
+    )
+    placed, routed, initial_map, final_map = place_and_route_with_maps(circuit, SquareGrid(2, 2))
+
+    assert set(initial_map) == set(final_map) == set(qutrits)
+    assert placed == circuit.transform_qubits(initial_map.__getitem__)
+    assert set(initial_map.values()) <= routed.all_qubits() | placed.all_qubits()
+    assert set(final_map.values()) <= routed.all_qubits()
+    assert all(q.dimension == 3 for q in routed.all_qubits())
+    # Ternary gates survive routing
+    assert sum(op.gate == OneControlledPlusGate for op in routed.all_operations()) == 2
+
+    assert place_and_route(circuit, SquareGrid(2, 2)) == (placed, routed)
+
+
+def _assert_routed_state_matches(circuit, routed, final_map):
+    # Routing swaps states between device qutrits, so the ideal circuit is laid out
+    # where each state ends up
+    ideal = circuit.transform_qubits(final_map.__getitem__)
+    order = sorted(routed.all_qubits() | ideal.all_qubits())
+    ideal_state = cirq.final_state_vector(ideal, qubit_order=order, dtype=np.complex128)
+    routed_state = cirq.final_state_vector(routed, qubit_order=order, dtype=np.complex128)
+    assert abs(np.vdot(ideal_state, routed_state)) ** 2 == pytest.approx(1)
+
+
+def test_place_and_route_single_qutrit_ternary_gates():
+    # Every pair interacts, which no planar device can host without swaps
+    qutrits = cirq.LineQid.range(5, dimension=3)
+    circuit = cirq.Circuit(
+        [QutritPlusGate(q) for q in qutrits],
+        [
+            TwoQubitGateToQutritGate(cirq.CNOT)(a, b)
+            for i, a in enumerate(qutrits)
+            for b in qutrits[i + 1 :]
+        ],
+    )
+    _, routed, _, final_map = place_and_route_with_maps(circuit, SquareGrid(2, 3))
+
+    assert sum(op.gate == QutritPlusGate for op in routed.all_operations()) == len(qutrits)
+    _assert_routed_state_matches(circuit, routed, final_map)
+
+
+def test_routing_swaps_move_whole_qutrit_states():
+    # Controlled increments between every pair leave |2> on qutrits that routing
+    # must swap, while the input's own SWAPs still act on the qubit subspace
+    qutrits = cirq.LineQid.range(4, dimension=3)
+    circuit = cirq.Circuit(
+        [SingleQubitGateToQutritGate(cirq.X)(q) for q in qutrits],
+        [OneControlledPlusGate(a, b) for i, a in enumerate(qutrits) for b in qutrits[i + 1 :]],
+        TwoQubitGateToQutritGate(cirq.SWAP)(qutrits[0], qutrits[3]),
+    )
+    _, routed, _, final_map = place_and_route_with_maps(circuit, SquareGrid(2, 2))
+
+    assert any(op.gate == QutritSwap() for op in routed.all_operations())
+    _assert_routed_state_matches(circuit, routed, final_map)
+
+
+def test_bridges_keep_the_middle_qutrit_state():
+    tk_circuit = Circuit(3)
+    tk_circuit.add_gate(OpType.BRIDGE, [0, 1, 2])
+    bridge = qubit_to_qutrit(tk_to_cirq(_restore_custom_gates(tk_circuit, dict())))
+
+    control, middle, target = sorted(bridge.all_qubits())
+    prepare = cirq.Circuit(SingleQubitGateToQutritGate(cirq.X)(control), QutritMinusGate(middle))
+    expected = cirq.Circuit(TwoQubitGateToQutritGate(cirq.CNOT)(control, target))
+    order = [control, middle, target]
+    np.testing.assert_allclose(
+        cirq.final_state_vector(prepare + bridge, qubit_order=order, dtype=np.complex128),
+        cirq.final_state_vector(prepare + expected, qubit_order=order, dtype=np.complex128),
+        atol=1e-12,
+    )
+
+
+def test_place_and_route_many_matches_single_calls():
+    qutrits = cirq.LineQid.range(4, dimension=3)
+    circuits = [
+        cirq.testing.random_circuit(
+            qubits=qutrits,
+            n_moments=4,
+            op_density=0.5,
+            gate_domain={
+                SingleQubitGateToQutritGate(cirq.H): 1,
+                TwoQubitGateToQutritGate(cirq.CNOT): 2,
+            },
+            random_state=seed,
+        )
+        for seed in range(3)
+    ]
+    context = CompilationContext(SquareGrid(2, 2))
+    # Worker processes rebuild the architecture rather than sharing this context
+    results = list(context.place_and_route_many(circuits, processes=2))
+
+    assert results == [context.place_and_route_with_maps(circuit) for circuit in circuits]
+    neighbours = {
+        frozenset((context.qutrit_of_node[a], context.qutrit_of_node[b]))
+        for a, b in context.architecture.coupling
+    }
+    for circuit, (placed, routed, initial_map, final_map) in zip(circuits, results):
+        assert placed == circuit.transform_qubits(initial_map.__getitem__)
+        # Every routed two-qutrit gate acts on neighbouring device qutrits
+        for op in routed.all_operations():
+            if len(op.qubits) == 2:
+                assert frozenset(op.qubits) in neighbours
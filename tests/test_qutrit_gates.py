@@ -1,6 +1,19 @@
+import gc
+import pickle
+import weakref
+
 import cirq
 import numpy as np
 from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from ops.ternary_gates import (
+    QutritPlusGate,
+    OneControlledPlusGate,
+    TwoControlledPlusGate,
+    QutritMinusGate,
+    OneControlledMinusGate,
+    TwoControlledMinusGate,
+    QutritSwap,
+)
 from noise_models.hardware_aware import HardwareAwareSymmetricNoise
 from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
 import pytest
@@ -80,3 +93,59 @@ def test_parameterized_noise(args):
     print(
         "Resulting fidelity:", cirq.qis.fidelity(ideal_matrix, noisy_result, (len(ideal_matrix),))
     )
+
+
+@pytest.mark.parametrize(
+    "gate",
+    [
+        SingleQubitGateToQutritGate(cirq.H),
+        SingleQubitGateToQutritGate(cirq.T),
+        TwoQubitGateToQutritGate(cirq.CNOT),
+        TwoQubitGateToQutritGate(cirq.ISWAP),
+        TwoQubitGateToQutritGate(cirq.CZ**0.3),
+    ],
+)
+def test_wrapped_apply_unitary_is_consistent(gate):
+    cirq.testing.assert_has_consistent_apply_unitary(gate)
+
+
+def test_interned_wrappers_are_shared_and_equal():
+    cnot = TwoQubitGateToQutritGate.interned(cirq.CNOT)
+    assert cnot is TwoQubitGateToQutritGate.interned(cirq.CNOT)
+    assert cnot == TwoQubitGateToQutritGate(cirq.CNOT)
+    assert hash(cnot) == hash(TwoQubitGateToQutritGate(cirq.CNOT))
+    assert cnot != TwoQubitGateToQutritGate(cirq.CZ)
+    assert not cnot.qt_unitary.flags.writeable
+
+    qutrits = cirq.LineQid.range(2, dimension=3)
+    assert cirq.Circuit(cnot(*qutrits)) == cirq.Circuit(
+        TwoQubitGateToQutritGate(cirq.CNOT)(*qutrits)
+    )
+
+    # Wrappers no circuit holds any more are released
+    released = weakref.ref(SingleQubitGateToQutritGate.interned(cirq.rx(0.123)))
+    gc.collect()
+    assert released() is None
+
+
+@pytest.mark.parametrize(
+    "gate",
+    [
+        QutritPlusGate,
+        QutritMinusGate,
+        OneControlledPlusGate,
+        TwoControlledPlusGate,
+        OneControlledMinusGate,
+        TwoControlledMinusGate,
+        QutritSwap(),
+    ],
+)
+def test_ternary_permutations_are_consistent(gate):
+    cirq.testing.assert_has_consistent_apply_unitary(gate)
+
+
+def test_ternary_gates_equal_after_pickling():
+    # Worker processes send circuits back pickled, with fresh gate instances
+    for gate in [QutritPlusGate, OneControlledMinusGate, QutritSwap()]:
+        assert pickle.loads(pickle.dumps(gate)) == gate
+    assert QutritPlusGate != QutritMinusGate
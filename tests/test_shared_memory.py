@@ -0,0 +1,48 @@
+import cirq
+import numpy as np
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from ops.ternary_gates import OneControlledPlusGate, QutritPlusGate
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from simulation.shared_memory import _plan_phases, simulate_shared_memory
+import pytest
+
+
+@pytest.mark.parametrize("processes", [1, 4])
+def test_shared_memory_matches_density_matrix_simulator(processes):
+    qutrits = cirq.LineQid.range(4, dimension=3)
+    circuit = cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[0], qutrits[3]),
+        QutritPlusGate(qutrits[2]),
+        OneControlledPlusGate(qutrits[1], qutrits[2]),
+        TwoQubitGateToQutritGate(cirq.ISWAP)(qutrits[3], qutrits[1]),
+    )
+    noise_model = GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=[0.99] + 8 * [0.01 / 8],
+        two_qutrit_error_weights=[0.95] + 80 * [0.05 / 80],
+    )
+    expected = (
+        cirq.DensityMatrixSimulator(noise=noise_model)
+        .simulate(circuit, qubit_order=qutrits)
+        .final_density_matrix
+    )
+
+    # Operations on the leading qutrits are sharded along later ones
+    rho = simulate_shared_memory(
+        circuit, noise_model, qutrits, processes=processes, max_fused_qudits=2
+    )
+    assert np.allclose(rho, expected, atol=1e-6)
+
+
+def test_phases_share_shards_until_they_run_out():
+    qutrits = cirq.LineQid.range(4, dimension=3)
+    qudit_axes = {q: (i, i + 4) for i, q in enumerate(qutrits)}
+    groups = [
+        [QutritPlusGate(qutrits[2])],
+        [OneControlledPlusGate(qutrits[2], qutrits[3])],
+        [OneControlledPlusGate(qutrits[0], qutrits[1])],
+    ]
+    phases = _plan_phases(groups, qudit_axes, (3,) * 8, processes=4)
+    # The first two groups leave the leading qutrits to shard over, but the third acts on them
+    assert [phase[0] for phase in phases] == [groups[:2], groups[2:]]
+    assert phases[0][1] == [0, 1] and phases[1][1] == [2, 3]
@@ -0,0 +1,79 @@
+import cirq
+import numpy as np
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from ops.ternary_gates import OneControlledPlusGate, QutritMinusGate, QutritPlusGate, QutritSwap
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate
+from simulation.stabilizer import clifford_action, sample_stabilizer_measurements
+import pytest
+
+_omega = np.exp(-2j * np.pi / 3)
+_fourier = cirq.MatrixGate(
+    np.array([[_omega ** (j * k) for k in range(3)] for j in range(3)]) / np.sqrt(3),
+    qid_shape=(3,),
+)
+_csum_unitary = np.zeros((9, 9))
+for control in range(3):
+    for target in range(3):
+        _csum_unitary[3 * control + (target + control) % 3, 3 * control + target] = 1
+_csum = cirq.MatrixGate(_csum_unitary, qid_shape=(3, 3))
+
+
+def test_deterministic_and_random_outcomes():
+    qutrits = cirq.LineQid.range(5, dimension=3)
+    circuit = cirq.Circuit(
+        QutritPlusGate(qutrits[0]),
+        _csum(qutrits[0], qutrits[1]),
+        QutritMinusGate(qutrits[2]),
+        QutritSwap()(qutrits[1], qutrits[2]),
+        SingleQubitGateToQutritGate(cirq.X)(qutrits[0]),
+        # The Fourier gate squared maps |j> to |-j>
+        _fourier(qutrits[1]),
+        _fourier(qutrits[1]),
+        _fourier(qutrits[3]),
+        _csum(qutrits[3], qutrits[4]),
+        cirq.measure(*qutrits[:3], key="m"),
+        cirq.measure(qutrits[3], key="random"),
+        cirq.measure(qutrits[4], key="copy"),
+    )
+    measurements = sample_stabilizer_measurements(circuit, repetitions=300, seed=3)
+    np.testing.assert_array_equal(measurements["m"], np.tile([0, 1, 1], (300, 1)))
+    assert set(measurements["random"][:, 0]) == {0, 1, 2}
+    np.testing.assert_array_equal(measurements["copy"], measurements["random"])
+
+
+def test_pauli_noise_matches_density_matrix():
+    qutrits = cirq.LineQid.range(3, dimension=3)
+    circuit = cirq.Circuit(
+        _fourier(qutrits[0]),
+        _csum(qutrits[0], qutrits[1]),
+        QutritPlusGate(qutrits[2]),
+        _csum(qutrits[1], qutrits[2]),
+        cirq.measure(*qutrits, key="m"),
+    )
+    noise_model = GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=[0.9] + 8 * [0.1 / 8],
+        two_qutrit_error_weights=[0.8] + 80 * [0.2 / 80],
+        lambda_short=0,
+    )
+    density_matrix = (
+        cirq.DensityMatrixSimulator(noise=noise_model, dtype=np.complex128)
+        .simulate(circuit[:-1], qubit_order=qutrits)
+        .final_density_matrix
+    )
+    expected = np.real(np.diag(density_matrix))
+
+    outcomes = sample_stabilizer_measurements(
+        circuit, noise_model, repetitions=20000, seed=5, twirl_non_pauli_noise=True
+    )["m"]
+    frequencies = np.bincount(np.ravel_multi_index(outcomes.T, (3, 3, 3)), minlength=27)
+    assert np.sum(np.abs(frequencies / len(outcomes) - expected)) < 0.05
+
+
+def test_non_cliffords_are_rejected():
+    assert clifford_action(cirq.unitary(OneControlledPlusGate)) is None
+    assert clifford_action(cirq.unitary(SingleQubitGateToQutritGate(cirq.H))) is None
+
+    qutrits = cirq.LineQid.range(2, dimension=3)
+    circuit = cirq.Circuit(OneControlledPlusGate(*qutrits))
+    with pytest.raises(ValueError):
+        sample_stabilizer_measurements(circuit)
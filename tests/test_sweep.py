@@ -0,0 +1,55 @@
+import cirq
+import numpy as np
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from ops.ternary_gates import OneControlledPlusGate, QutritPlusGate
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from simulation.fidelity import fidelity_against_ideal
+from simulation.sweep import depolarizing_error_weights, sweep_gokhale_noise
+import pytest
+
+
+def test_sweep_matches_pointwise_fidelity():
+    qutrits = cirq.LineQid.range(3, dimension=3)
+    circuit = cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[0], qutrits[1]),
+        QutritPlusGate(qutrits[2]),
+        OneControlledPlusGate(qutrits[1], qutrits[2]),
+    )
+    single_qutrit_error_weights = [depolarizing_error_weights(p, 1) for p in [0.001, 0.01]]
+    two_qutrit_error_weights = [depolarizing_error_weights(p, 2) for p in [0.01, 0.05]]
+    # Weights concentrated on a few Paulis give a different set of shifts
+    two_qutrit_error_weights.append([0.9, 0.05] + 78 * [0] + [0.05])
+    # Without decay, the jump operators vanish and only damping is left
+    lambda_short = [0.01, 0.02, 0.0]
+    lambda_long = [0.03, 0.1, 0.0]
+
+    fidelities = sweep_gokhale_noise(
+        circuit,
+        single_qutrit_error_weights,
+        two_qutrit_error_weights,
+        lambda_short,
+        lambda_long,
+        qubit_order=qutrits,
+        batch_size=5,
+        dtype=np.complex128,
+    )
+    assert fidelities.shape == (2, 3, 3, 3)
+    for index in np.ndindex(*fidelities.shape):
+        noise_model = GokhaleNoiseModelOnQutrits(
+            single_qutrit_error_weights[index[0]],
+            two_qutrit_error_weights[index[1]],
+            lambda_short[index[2]],
+            lambda_long[index[3]],
+        )
+        expected = fidelity_against_ideal(
+            circuit, circuit, noise_model, qubit_order=qutrits, dtype=np.complex128
+        )
+        assert np.isclose(fidelities[index], expected)
+
+    # Without lambda_long, it is tied to 3 * lambda_short
+    tied = sweep_gokhale_noise(
+        circuit, single_qutrit_error_weights, two_qutrit_error_weights, [0.01], qubit_order=qutrits
+    )
+    assert tied.shape == (2, 3, 1)
+    assert np.allclose(tied[..., 0], fidelities[:, :, 0, 0], atol=1e-5)
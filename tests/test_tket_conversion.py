@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+
+import cirq
+from ops.ternary_gates import OneControlledPlusGate, QutritMinusGate, TwoControlledPlusGate
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from transformations.dimension_transform import qubit_to_qutrit, qutrit_to_qubit
+import pytest
+
+pytest.importorskip("pytket")
+
+from pytket.circuit import Circuit, CustomGateDef, OpType
+from pytket_cirq_extension.cirq_to_tket import cirq_to_tk
+from pytket_cirq_extension.tket_to_cirq import tk_to_cirq
+
+
+def test_ternary_gates_round_trip():
+    qutrits = cirq.LineQid.range(3, dimension=3)
+    circuit = cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        OneControlledPlusGate(qutrits[0], qutrits[1]),
+        TwoControlledPlusGate(qutrits[1], qutrits[2]),
+        QutritMinusGate(qutrits[0]),
+        OneControlledPlusGate(qutrits[2], qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[1], qutrits[2]),
+    )
+    tk_circuit = cirq_to_tk(qutrit_to_qubit(circuit))
+
+    # Each distinct ternary gate is defined once, however often it is used
+    custom_gate_names = {
+        command.op.gate.name for command in tk_circuit if command.op.type == OpType.CustomGate
+    }
+    assert len(custom_gate_names) == 3
+
+    assert qubit_to_qutrit(tk_to_cirq(tk_circuit)) == circuit
+
+
+def test_custom_gate_names_stable_across_processes():
+    qutrits = cirq.LineQid.range(2, dimension=3)
+    circuit = qutrit_to_qubit(cirq.Circuit(OneControlledPlusGate(qutrits[0], qutrits[1])))
+    names = [command.op.gate.name for command in cirq_to_tk(circuit)]
+
+    script = (
+        "import cirq\n"
+        "from ops.ternary_gates import OneControlledPlusGate\n"
+        "from pytket_cirq_extension.cirq_to_tket import cirq_to_tk\n"
+        "from transformations.dimension_transform import qutrit_to_qubit\n"
+        "qutrits = cirq.LineQid.range(2, dimension=3)\n"
+        "circuit = qutrit_to_qubit(cirq.Circuit(OneControlledPlusGate(*qutrits)))\n"
+        "print([command.op.gate.name for command in cirq_to_tk(circuit)])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert output.strip() == str(names)
+
+
+def test_unregistered_custom_gate_rejected():
+    gate_def = CustomGateDef.define("unknown_gate", Circuit(1), [])
+    tk_circuit = Circuit(1)
+    tk_circuit.add_custom_gate(gate_def, [], [0])
+    with pytest.raises(NotImplementedError, match="unknown_gate"):
+        tk_to_cirq(tk_circuit)
+
+
+def test_moments_round_trip():
+    qubits = cirq.LineQubit.range(4)
+    circuit = cirq.Circuit(
+        cirq.H(qubits[0]),
+        cirq.CNOT(qubits[0], qubits[1]),
+        cirq.X(qubits[3]) ** 0.5,
+        cirq.CZ(qubits[1], qubits[2]),
+        cirq.ParallelGate(cirq.T, 2)(qubits[0], qubits[3]),
+        cirq.SWAP(qubits[2], qubits[3]),
+    )
+    assert tk_to_cirq(cirq_to_tk(circuit)) == cirq.Circuit(
+        cirq.H(qubits[0]),
+        cirq.CNOT(qubits[0], qubits[1]),
+        cirq.X(qubits[3]) ** 0.5,
+        cirq.CZ(qubits[1], qubits[2]),
+        cirq.T(qubits[0]),
+        cirq.T(qubits[3]),
+        cirq.SWAP(qubits[2], qubits[3]),
+    )
@@ -0,0 +1,44 @@
+import cirq
+import numpy as np
+from noise_models.gokhale_qutrit import GokhaleNoiseModelOnQutrits
+from ops.ternary_gates import OneControlledPlusGate, QutritMinusGate
+from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
+from simulation.trajectories import simulate_trajectories
+import pytest
+
+
+@pytest.fixture
+def circuit():
+    qutrits = cirq.LineQid.range(3, dimension=3)
+    return cirq.Circuit(
+        SingleQubitGateToQutritGate(cirq.H)(qutrits[0]),
+        TwoQubitGateToQutritGate(cirq.CNOT)(qutrits[0], qutrits[1]),
+        OneControlledPlusGate(qutrits[1], qutrits[2]),
+        QutritMinusGate(qutrits[0]),
+    )
+
+
+def test_trajectories_match_density_matrix(circuit):
+    p_1 = 0.05
+    p_2 = 0.1
+    noise_model = GokhaleNoiseModelOnQutrits(
+        single_qutrit_error_weights=[1 - p_1] + 8 * [p_1 / 8],
+        two_qutrit_error_weights=[1 - p_2] + 80 * [p_2 / 80],
+        lambda_short=0.05,
+    )
+    ideal_state = cirq.final_state_vector(circuit, dtype=np.complex128)
+    noisy_density_matrix = (
+        cirq.DensityMatrixSimulator(noise=noise_model, dtype=np.complex128)
+        .simulate(circuit)
+        .final_density_matrix
+    )
+    exact_fidelity = np.vdot(ideal_state, noisy_density_matrix @ ideal_state).real
+
+    result = simulate_trajectories(circuit, noise_model, repetitions=1000, processes=1, seed=7)
+    assert abs(result.fidelity - exact_fidelity) < 5 * result.standard_error
+    assert result.confidence_interval[0] < result.fidelity < result.confidence_interval[1]
+
+
+def test_noiseless_trajectories_are_exact(circuit):
+    result = simulate_trajectories(circuit, cirq.NO_NOISE, repetitions=4, processes=2, seed=7)
+    np.testing.assert_allclose(result.trajectory_fidelities, 1.0)
@@ -1,75 +1,114 @@
+from typing import Callable, Dict
+
 import cirq
 from ops.to_qutrit_wrappers import SingleQubitGateToQutritGate, TwoQubitGateToQutritGate
 from ops.to_qubit_wrappers import SingleQutritGateToQubitGate, TwoQutritGateToQubitGate
 
 
+def to_qutrit_qid(qubit: "cirq.Qid") -> "cirq.Qid":
+    """Returns the qutrit that qubit_to_qutrit exchanges a qubit for.
+
+    Args:
+        qubit: A LineQubit, NamedQubit or GridQubit.
+    """
+    q_type = type(qubit)
+    if q_type is cirq.LineQubit:
+        return cirq.LineQid(qubit.x, dimension=3)
+    if q_type is cirq.NamedQubit:
+        return cirq.NamedQid(qubit.name, dimension=3)
+    if q_type is cirq.GridQubit:
+        return cirq.GridQid(qubit.row, qubit.col, dimension=3)
+    raise TypeError(f"Unsupported qubit type: {qubit!r}")
+
+
+def to_qubit_qid(qutrit: "cirq.Qid") -> "cirq.Qid":
+    """Returns the qubit that qutrit_to_qubit exchanges a qutrit for.
+
+    Args:
+        qutrit: A LineQid, NamedQid or GridQid.
+    """
+    q_type = type(qutrit)
+    if q_type is cirq.LineQid:
+        return cirq.LineQubit(qutrit.x)
+    if q_type is cirq.NamedQid:
+        return cirq.NamedQubit(qutrit.name)
+    if q_type is cirq.GridQid:
+        return cirq.GridQubit(qutrit.row, qutrit.col)
+    raise TypeError(f"Unsupported qutrit type: {qutrit!r}")
+
+
+def _transform_moments(
+    circuit: cirq.AbstractCircuit,
+    new_gate_of: Callable[["cirq.Gate", int], "cirq.Gate"],
+    new_qid_of: Callable[["cirq.Qid"], "cirq.Qid"],
+) -> cirq.Circuit:
+    """Rebuilds a circuit moment by moment, with every gate and qid exchanged.
+
+    Circuits repeat the same few gates on the same few qids, so new operations are
+    looked up by the identity of the gate and qid objects, which the circuit keeps
+    alive, rather than constructed and validated once per operation. Both lookups
+    last only as long as the call.
+    """
+    new_operations: Dict[tuple, "cirq.Operation"] = dict()
+    new_qids: Dict["cirq.Qid", "cirq.Qid"] = dict()
+
+    def new_qid(qid):
+        exchanged = new_qids.get(qid)
+        if exchanged is None:
+            exchanged = new_qids[qid] = new_qid_of(qid)
+        return exchanged
+
+    moments = []
+    for moment in circuit:
+        operations = []
+        for op in moment:
+            gate = op.gate
+            qids = op.qubits
+            key = (id(gate),) + tuple(id(q) for q in qids)
+            new_op = new_operations.get(key)
+            if new_op is None:
+                if gate is None or len(qids) > 2:
+                    # Either not a gate operation or acts on more than 2 qids
+                    raise TypeError(f"Unsupported operation: {op!r}")
+                new_gate = new_gate_of(gate, len(qids))
+                new_op = new_operations[key] = new_gate.on(*[new_qid(q) for q in qids])
+            operations.append(new_op)
+        moments.append(cirq.Moment(operations))
+    return cirq.Circuit(moments)
+
+
+def _qutrit_gate_of(gate: "cirq.Gate", num_qubits: int) -> "cirq.Gate":
+    # Check if already was wrapped, returning to qutrit
+    if type(gate) in (SingleQutritGateToQubitGate, TwoQutritGateToQubitGate):
+        return gate.base_gate
+    if num_qubits == 1:
+        return SingleQubitGateToQutritGate.interned(gate)
+    return TwoQubitGateToQutritGate.interned(gate)
+
+
+def _qubit_gate_of(gate: "cirq.Gate", num_qutrits: int) -> "cirq.Gate":
+    # Check if already was wrapped, returning to qubit
+    if type(gate) in (SingleQubitGateToQutritGate, TwoQubitGateToQutritGate):
+        return gate.base_gate
+    # Need to wrap this in a qubit gate
+    if num_qutrits == 1:
+        return SingleQutritGateToQubitGate.interned(gate)
+    return TwoQutritGateToQubitGate.interned(gate)
+
+
 @cirq.transformer
 def qubit_to_qutrit(circuit: cirq.AbstractCircuit, *, context=None) -> cirq.Circuit:
     """Takes a circuit operating over qubits,
     exchanges qubits for equivalent qutrits,
     and wraps all qubit gates in qutrit gates.
 
+    Gates wrapped by qutrit_to_qubit are unwrapped back to the original qutrit gates.
+
     Args:
         circuit: The circuit to transform dimensions for.
         context: Transformer context. (unused, included for decorator API)
     """
-
-    def wrap_gate(op):
-        qubits = op.qubits
-        q_type = type(qubits[0])
-
-        # Variables to store the new gate and its operands
-        new_gate = None
-        qutrits = None
-
-        # Check if already was wrapped, returning to qutrit
-        if (
-            type(op.gate) == SingleQutritGateToQubitGate
-            or type(op.gate) == TwoQutritGateToQubitGate
-        ):
-            new_gate = op.gate
-
-        # Generate qutrits of the same type
-        if len(qubits) == 1:
-            new_gate = SingleQubitGateToQutritGate(op.gate)
-            if q_type is cirq.LineQubit:
-                qutrits = [cirq.LineQid(qubits[0].x, dimension=3)]
-            elif q_type is cirq.NamedQubit:
-                qutrits = [cirq.NamedQid(qubits[0].name, dimension=3)]
-            elif q_type is cirq.GridQubit:
-                qutrits = [cirq.GridQid(qubits[0].row, qubits[0].col, dimension=3)]
-
-        elif len(qubits) == 2:
-            new_gate = TwoQubitGateToQutritGate(op.gate)
-            if q_type is cirq.LineQubit:
-                qutrits = [
-                    cirq.LineQid(qubits[0].x, dimension=3),
-                    cirq.LineQid(qubits[1].x, dimension=3),
-                ]
-            elif q_type is cirq.NamedQubit:
-                qutrits = [
-                    cirq.NamedQid(qubits[0].name, dimension=3),
-                    cirq.NamedQid(qubits[1].name, dimension=3),
-                ]
-            elif q_type is cirq.GridQubit:
-                qutrits = [
-                    cirq.GridQid(qubits[0].row, qubits[0].col, dimension=3),
-                    cirq.GridQid(qubits[1].row, qubits[1].col, dimension=3),
-                ]
-
-        if new_gate is not None and qutrits is not None:
-            return new_gate.on(*qutrits)
-
-        # If reached, either gate acts on more than 2 qubits or
-        # the type of qubit used is not supported
-        raise TypeError
-
-    batch_replace = []
-    for i, op in circuit.findall_operations(lambda x: True):
-        batch_replace.append((i, op, wrap_gate(op)))
-    transformed_circuit = circuit.unfreeze(copy=True)
-    transformed_circuit.batch_replace(batch_replace)
-    return transformed_circuit
+    return _transform_moments(circuit, _qutrit_gate_of, to_qutrit_qid)
 
 
 @cirq.transformer
@@ -78,64 +117,10 @@ def qutrit_to_qubit(circuit: cirq.AbstractCircuit, *, context=None) -> cirq.Circ
     exchanges qutrits for equivalent qubits,
     and wraps all qutrit gates in qubit gates.
 
+    Gates wrapped by qubit_to_qutrit are unwrapped back to the original qubit gates.
+
     Args:
         circuit: The circuit to transform dimensions for.
         context: Transformer context. (unused, included for decorator API)
     """
-
-    def unwrap_gate(op):
-        qutrits = op.qubits
-        wrapped_gate = op.gate
-        q_type = type(qutrits[0])
-
-        # Variables to store the new gate and its operands
-        new_gate = None
-        qubits = None
-
-        # Generate qubits of the same type
-        if len(qutrits) == 1:
-            if q_type is cirq.LineQid:
-                qubits = [cirq.LineQubit(qutrits[0].x)]
-            elif q_type is cirq.NamedQid:
-                qubits = [cirq.NamedQubit(qutrits[0].name)]
-            elif q_type is cirq.GridQid:
-                qubits = [cirq.GridQubit(qutrits[0].row, qutrits[0].col)]
-        elif len(qutrits) == 2:
-            if q_type is cirq.LineQid:
-                qubits = [cirq.LineQubit(qutrits[0].x), cirq.LineQubit(qutrits[1].x)]
-            elif q_type is cirq.NamedQid:
-                qubits = [cirq.NamedQubit(qutrits[0].name), cirq.NamedQubit(qutrits[1].name)]
-            elif q_type is cirq.GridQid:
-                qubits = [
-                    cirq.GridQubit(qutrits[0].row, qutrits[0].col),
-                    cirq.GridQubit(qutrits[1].row, qutrits[1].col),
-                ]
-
-        # Check if already was wrapped, returning to qutrit
-        if (
-            type(wrapped_gate) == SingleQubitGateToQutritGate
-            or type(wrapped_gate) == TwoQubitGateToQutritGate
-        ):
-            new_gate = wrapped_gate.base_gate
-
-        else:
-            # Need to wrap this in a qubit gate
-            if len(qutrits) == 1:
-                new_gate = SingleQutritGateToQubitGate(op.gate)
-            elif len(qutrits) == 2:
-                new_gate = TwoQutritGateToQubitGate(op.gate)
-
-        if new_gate is not None and qubits is not None:
-            return new_gate.on(*qubits)
-
-        # If reached, either gate acts on more than 2 qutrits,
-        # the gate isn't actually a wrapped gate, or
-        # the type of qid used is not supported
-        raise TypeError
-
-    batch_replace = []
-    for i, op in circuit.findall_operations(lambda x: True):
-        batch_replace.append((i, op, unwrap_gate(op)))
-    transformed_circuit = circuit.unfreeze(copy=True)
-    transformed_circuit.batch_replace(batch_replace)
-    return transformed_circuit
+    return _transform_moments(circuit, _qubit_gate_of, to_qubit_qid)
@@ -1,43 +1,229 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
 import cirq
 import pytket
-from pytket_cirq_extension.cirq_to_tket import cirq_to_tk
-from pytket_cirq_extension.tket_to_cirq import tk_to_cirq
+from ops.ternary_gates import QutritSwap
+from pytket.architecture import Architecture
+from pytket.circuit import Circuit, CustomGateDef, OpType
+from pytket_cirq_extension.cirq_to_tket import cirq_to_tk, tk_qubit
+from pytket_cirq_extension.tket_to_cirq import cirq_qubit_map, tk_to_cirq
 from pytket.predicates import CompilationUnit, ConnectivityPredicate
 from pytket.passes import PlacementPass, RoutingPass
 from pytket.placement import GraphPlacement
-from pytket.transform import Transform
-from transformations.dimension_transform import qutrit_to_qubit, qubit_to_qutrit
+from transformations.dimension_transform import (
+    qutrit_to_qubit,
+    qubit_to_qutrit,
+    to_qubit_qid,
+    to_qutrit_qid,
+)
+
+PlaceAndRouteResult = Tuple[
+    cirq.Circuit, cirq.Circuit, Dict["cirq.Qid", "cirq.Qid"], Dict["cirq.Qid", "cirq.Qid"]
+]
+
+# Routing cannot map custom gates: it never returns on two-qubit ones and rejects
+# single-qubit ones. While it runs, each stands in as a gate it can map, tagged with
+# an op group naming the custom gate so it can be put back afterwards
+_stand_in_prefix = "custom:"
+_stand_ins = {1: (OpType.Rz, [0]), 2: (OpType.CZ, [])}
+
+# Swaps that routing inserts move whole qutrit states, while swaps in the input circuit
+# act on the qubit subspace only, so the input ones are tagged to tell them apart
+_input_swap = "input swap"
+
+
+def _qutrit_swap_def() -> CustomGateDef:
+    """Returns the custom tket gate that converts back to a QutritSwap."""
+    qutrits = cirq.LineQid.range(2, dimension=3)
+    swap_circ = cirq_to_tk(qutrit_to_qubit(cirq.Circuit(QutritSwap().on(*qutrits))))
+    return swap_circ.get_commands()[0].op.gate
+
+
+def _replace_custom_gates(tk_circ: Circuit) -> Tuple[Circuit, Dict[str, CustomGateDef]]:
+    """Returns a copy of the circuit with custom gates replaced by tagged
+    stand-in gates, and the custom gate definitions by tag.
+    """
+    replaced = Circuit()
+    for qubit in tk_circ.qubits:
+        replaced.add_qubit(qubit)
+    gate_defs = dict()
+    for command in tk_circ:
+        op = command.op
+        if op.type == OpType.CustomGate:
+            tag = _stand_in_prefix + op.gate.name
+            gate_defs[tag] = op.gate
+            optype, params = _stand_ins[len(command.args)]
+            replaced.add_gate(optype, params, command.args, opgroup=tag)
+        elif op.type == OpType.SWAP:
+            replaced.add_gate(OpType.SWAP, command.args, opgroup=_input_swap)
+        else:
+            replaced.add_gate(op, command.args)
+    return replaced, gate_defs
+
+
+def _restore_custom_gates(tk_circ: Circuit, gate_defs: Dict[str, CustomGateDef]) -> Circuit:
+    """Inverts _replace_custom_gates on a circuit that has since been routed,
+    turning the swaps routing inserted into qutrit swaps.
+
+    A BRIDGE is a CX across a middle qubit, so is decomposed into the CX between
+    qutrit swaps of the control with the middle qutrit, which keep whatever state
+    the middle qutrit holds.
+    """
+    swap_def = _qutrit_swap_def()
+    restored = Circuit()
+    for qubit in tk_circ.qubits:
+        restored.add_qubit(qubit)
+    for command in tk_circ:
+        op = command.op
+        if command.opgroup in gate_defs:
+            restored.add_custom_gate(gate_defs[command.opgroup], [], command.args)
+        elif op.type == OpType.SWAP and command.opgroup != _input_swap:
+            restored.add_custom_gate(swap_def, [], command.args)
+        elif op.type == OpType.BRIDGE:
+            control, middle, target = command.args
+            restored.add_custom_gate(swap_def, [], [control, middle])
+            restored.CX(middle, target)
+            restored.add_custom_gate(swap_def, [], [control, middle])
+        else:
+            restored.add_gate(op, command.args)
+    return restored
+
+
+class CompilationContext:
+    """The placement and routing machinery for one architecture,
+    built once and shared by every circuit compiled onto it.
+
+    Attributes:
+        architecture: The connectivity constraints to follow.
+        qutrit_of_node: The device qutrit each architecture node is converted to.
+    """
+
+    def __init__(self, architecture: pytket.architecture.Architecture):
+        self.architecture = architecture
+        self._predicate = ConnectivityPredicate(architecture)
+        self._place = PlacementPass(GraphPlacement(architecture))
+        self._route = RoutingPass(architecture)
+
+        self.qutrit_of_node = {
+            node: to_qutrit_qid(qubit) for node, qubit in cirq_qubit_map(architecture.nodes).items()
+        }
+
+    def place_and_route(self, circuit: cirq.Circuit) -> Tuple[cirq.Circuit, cirq.Circuit]:
+        """Places and routes one circuit, as place_and_route does."""
+        placed_circ, out_circ, _, _ = self.place_and_route_with_maps(circuit)
+        return placed_circ, out_circ
+
+    def place_and_route_with_maps(self, circuit: cirq.Circuit) -> PlaceAndRouteResult:
+        """Places and routes one circuit, as place_and_route_with_maps does."""
+        in_circ = qutrit_to_qubit(circuit)
+        tk_circ, gate_defs = _replace_custom_gates(cirq_to_tk(in_circ))
+
+        comp_unit = CompilationUnit(tk_circ, [self._predicate])
+        self._place.apply(comp_unit)
+        self._route.apply(comp_unit)
+
+        routed_tk_circ = _restore_custom_gates(comp_unit.circuit, gate_defs)
+
+        out_circ = tk_to_cirq(routed_tk_circ)
+        out_circ = qubit_to_qutrit(out_circ)
 
+        initial_map = dict()
+        final_map = dict()
+        for q in circuit.all_qubits():
+            uid = tk_qubit(to_qubit_qid(q))
+            initial_map[q] = self.qutrit_of_node[comp_unit.initial_map[uid]]
+            final_map[q] = self.qutrit_of_node[comp_unit.final_map[uid]]
 
-def place_and_route(circuit: cirq.Circuit, architecture: pytket.architecture.Architecture):
+        placed_circ = circuit.transform_qubits(initial_map.__getitem__)
+
+        return placed_circ, out_circ, initial_map, final_map
+
+    def place_and_route_many(
+        self, circuits: Iterable[cirq.Circuit], processes: Optional[int] = 1
+    ) -> Iterator[PlaceAndRouteResult]:
+        """Places and routes each circuit, yielding results in input order,
+        each with its qutrit maps as place_and_route_with_maps returns them.
+
+        In-process, each circuit is compiled as its result is requested. With worker
+        processes, every circuit is submitted up front, and each result is yielded once
+        it and all results before it are done.
+
+        Args:
+            circuits: The circuits to be compiled.
+            processes: The number of worker processes, each with its own context.
+                Defaults to the number of CPUs if None, and runs in-process if 1.
+        """
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes == 1:
+            for circuit in circuits:
+                yield self.place_and_route_with_maps(circuit)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            # Architectures cannot be pickled, so each worker rebuilds it from its
+            # serialised form, which lists nodes in the same order
+            initializer=_init_worker_context,
+            initargs=(self.architecture.to_dict(),),
+        ) as executor:
+            yield from executor.map(_place_and_route_in_worker, circuits)
+
+
+# The context each worker process compiles with
+_worker_context: Optional[CompilationContext] = None
+
+
+def _init_worker_context(architecture_dict: dict):
+    global _worker_context
+    _worker_context = CompilationContext(Architecture.from_dict(architecture_dict))
+
+
+def _place_and_route_in_worker(circuit: cirq.Circuit) -> PlaceAndRouteResult:
+    return _worker_context.place_and_route_with_maps(circuit)
+
+
+def place_and_route(
+    circuit: cirq.Circuit, architecture: pytket.architecture.Architecture
+) -> Tuple[cirq.Circuit, cirq.Circuit]:
     """Given an abstract circuit and connectivity constraints,
     place all qubits and route them to compile
     an equivalent circuit obeying those constraints.
 
+    The circuit is converted to tket and back once. The placed circuit is the input
+    circuit with its qutrits relabelled by tket's placement, rather than a conversion
+    of tket's placed circuit.
+
+    To compile many circuits onto the same architecture, build a CompilationContext
+    once and use its place_and_route or place_and_route_many instead.
+
     Args:
         circuit: The circuit to be compiled.
         architecture: A device representing the
          connectivity constraints to follow.
-    """
-    in_circ = qutrit_to_qubit(circuit)
-    tk_circ = cirq_to_tk(in_circ)
-
-    comp_unit = CompilationUnit(tk_circ, [ConnectivityPredicate(architecture)])
-    place = PlacementPass(GraphPlacement(architecture))
-    place.apply(comp_unit)
 
-    placed_circ = tk_to_cirq(comp_unit.circuit)
-    placed_circ = qubit_to_qutrit(placed_circ)
+    Returns:
+        The placed circuit and the routed circuit.
+    """
+    return CompilationContext(architecture).place_and_route(circuit)
 
-    route = RoutingPass(architecture)
-    route.apply(comp_unit)
 
-    # Some BRIDGEs are included during compilation, which must be decomposed.
-    # It is not verified whether this affects any possible ternary states in decomposition.
-    routed_tk_circ = comp_unit.circuit
-    Transform.DecomposeBRIDGE().apply(routed_tk_circ)
+def place_and_route_with_maps(
+    circuit: cirq.Circuit, architecture: pytket.architecture.Architecture
+) -> PlaceAndRouteResult:
+    """Places and routes a circuit as place_and_route does, also returning
+    where each of its qutrits is placed and where its state ends up.
 
-    out_circ = tk_to_cirq(comp_unit.circuit)
-    out_circ = qubit_to_qutrit(out_circ)
+    Args:
+        circuit: The circuit to be compiled.
+        architecture: A device representing the
+         connectivity constraints to follow.
 
-    return placed_circ, out_circ
+    Returns:
+        The placed circuit, the routed circuit, and maps from each qutrit of the input
+        circuit to the device qutrit it is placed on, and to the one its state ends up
+        on once routing has swapped it around.
+    """
+    return CompilationContext(architecture).place_and_route_with_maps(circuit)